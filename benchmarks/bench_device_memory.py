@@ -0,0 +1,148 @@
+"""Memory benchmark for the net4home device record.
+
+Builds N devices the way the integration does on startup (from the JSON
+stored in the config entry options) and reports the bytes per device for
+the previous plain class and the current slotted Net4HomeDevice.
+
+Runs without Home Assistant:
+
+    python benchmarks/bench_device_memory.py [--count 5000]
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+MODELS_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "net4home" / "models.py"
+
+
+def load_models():
+    """Import models.py directly (the package itself needs Home Assistant)."""
+    spec = importlib.util.spec_from_file_location("net4home_models", MODELS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class LegacyNet4HomeDevice:
+    """Plain class as used before the slotted record (for comparison)."""
+
+    def __init__(self, device_id, name, model, device_type, via_device=None, objadr=None,
+                 send_state_changes=False, inverted=False, detail_status="pending",
+                 detail_retry_count=0, last_detail_request=None, discovered_at=None,
+                 module_type=None, ns=None, na=None, nm=None, ng=None,
+                 powerup_status=None, min_hell=None, timer_time1=None):
+        self.device_id = device_id
+        self.name = name
+        self.model = model
+        self.device_type = device_type
+        self.via_device = via_device
+        self.objadr = objadr
+        self.send_state_changes = send_state_changes
+        self.inverted = inverted
+        self.detail_status = detail_status
+        self.detail_retry_count = detail_retry_count
+        self.last_detail_request = last_detail_request
+        self.discovered_at = discovered_at or datetime.now()
+        self.module_type = module_type
+        self.ns = ns
+        self.na = na
+        self.nm = nm
+        self.ng = ng
+        self.powerup_status = powerup_status
+        self.min_hell = min_hell
+        self.timer_time1 = timer_time1
+
+
+TYPES = [("switch", "Schaltaktor"), ("light", "Dimmer"), ("cover", "Jalousie"),
+         ("binary_sensor", "Kontakt"), ("sensor", "Temperatur"), ("climate", "UP-TLH")]
+
+
+def stored_devices(count: int) -> list[dict]:
+    """Device options as they come back from the config entry (decoded JSON)."""
+    now = datetime.now().isoformat()
+    devices = []
+    for i in range(count):
+        device_type, model = TYPES[i % len(TYPES)]
+        devices.append({
+            "device_id": f"OBJ{i + 1:05d}",
+            "name": f"{model} {i + 1}",
+            "model": model,
+            "device_type": device_type,
+            "via_device": f"MI{(i // 8) + 1:04X}",
+            "objadr": i + 1,
+            "send_state_changes": bool(i % 2),
+            "inverted": False,
+            "detail_status": "completed",
+            "detail_retry_count": 0,
+            "last_detail_request": now,
+            "module_type": 12,
+            "ns": 0,
+            "na": 8,
+            "nm": 24,
+            "ng": 32,
+        })
+    # Round trip through JSON so no string is shared between devices, like in HA
+    return json.loads(json.dumps(devices))
+
+
+def build(cls, devices: list[dict]) -> list:
+    return [
+        cls(
+            device_id=dev["device_id"],
+            name=dev["name"],
+            model=dev["model"],
+            device_type=dev["device_type"],
+            via_device=dev["via_device"],
+            objadr=dev["objadr"],
+            send_state_changes=dev["send_state_changes"],
+            inverted=dev["inverted"],
+            detail_status=dev["detail_status"],
+            detail_retry_count=dev["detail_retry_count"],
+            last_detail_request=datetime.fromisoformat(dev["last_detail_request"]),
+            module_type=dev["module_type"],
+            ns=dev["ns"],
+            na=dev["na"],
+            nm=dev["nm"],
+            ng=dev["ng"],
+        )
+        for dev in devices
+    ]
+
+
+def measure(cls, count: int) -> float:
+    """Return the bytes allocated per device (the option dicts are excluded)."""
+    devices = stored_devices(count)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build(cls, devices)
+    # The options are released after startup, only the records stay alive
+    del devices
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(records) == count
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="number of devices")
+    args = parser.parse_args()
+
+    models = load_models()
+    legacy = measure(LegacyNet4HomeDevice, args.count)
+    slotted = measure(models.Net4HomeDevice, args.count)
+
+    print(f"devices:            {args.count}")
+    print(f"plain class:        {legacy:8.1f} bytes/device")
+    print(f"slotted record:     {slotted:8.1f} bytes/device")
+    print(f"saved:              {legacy - slotted:8.1f} bytes/device ({(1 - slotted / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""Throughput benchmarks for the receive and send pipelines.
+
+Reports frames per second and allocated bytes per frame for
+decomp_section_c_exact, compress_section, n4h_parse,
+N4HPacketReceiver.receive_raw_command, the listener dispatch
+(Net4HomeApi._async_handle_payload) per opcode and
+N4HPacketSender.send_raw_command.
+
+The corpus is built with the real N4HPacketSender from a synthetic device
+population (switches, dimmers, covers, temperature sensors, contacts), or
+read from a capture (service net4home.start_capture) or a file with the
+raw received byte stream (--corpus). Recorded
+telegrams only reach the dispatch of devices that are known, pass the
+device inventory with --devices (the "devices" mapping of the config entry
+options).
+
+Needs Home Assistant installed (the integration imports it):
+
+    python benchmarks/bench_pipeline.py [--frames 10000] [--repeat 5]
+    python benchmarks/bench_pipeline.py --save base.json
+    python benchmarks/bench_pipeline.py --compare base.json [--threshold 10]
+    python benchmarks/bench_pipeline.py --against HEAD~1
+
+--against runs the suite on another revision (temporary git worktree)
+and compares the current tree with it. With --compare/--against the exit
+code is 1 if a benchmark got slower or allocates more than --threshold
+percent.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Synthetic population: device type -> (first MI, first objadr)
+POPULATION = {
+    "switch": (0x0100, 1000),
+    "light": (0x0200, 3000),
+    "cover": (0x0300, 5000),
+    "sensor": (0x0400, 7000),
+    "binary_sensor": (0x0500, 9000),
+}
+OBJADR_STEP = 16
+# Sender of the observed D0_SET telegrams (a wall switch not managed by HA)
+FOREIGN_MI = 0x0700
+FOREIGN_OBJADR = 0x2000
+# Telegrams between these modules are not managed and dropped by the address filter
+UNMANAGED_MI = 0x0800
+UNMANAGED_OBJADR = 20000
+
+# Allocated bytes above this are not reported as regression (measurement noise)
+ALLOC_NOISE_BYTES = 16
+
+
+def load_integration(root: Path):
+    """Import the net4home package of a checkout."""
+    sys.path.insert(0, str(root / "custom_components"))
+    from net4home import api, const
+    from net4home.models import Net4HomeDevice
+    try:
+        from net4home.helpers import device_from_options
+    except ImportError:
+        device_from_options = None
+    return api, const, Net4HomeDevice, device_from_options
+
+
+class _CaptureWriter:
+    """Stream writer that keeps every written frame."""
+
+    def __init__(self):
+        self.frames: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        self.frames.append(bytes(data))
+
+    async def drain(self) -> None:
+        return None
+
+    def is_closing(self) -> bool:
+        return False
+
+
+class _NullWriter(_CaptureWriter):
+    """Stream writer that discards everything."""
+
+    def write(self, data: bytes) -> None:
+        return None
+
+
+def build_devices(Net4HomeDevice, per_type: int) -> list:
+    """Return the synthetic object devices."""
+    devices = []
+    for device_type, (first_mi, first_objadr) in POPULATION.items():
+        for k in range(per_type):
+            objadr = first_objadr + k * OBJADR_STEP
+            devices.append(Net4HomeDevice(
+                device_id=f"OBJ{objadr:05d}",
+                name=f"{device_type} {k}",
+                model="bench",
+                device_type=device_type,
+                via_device=f"MI{first_mi + k:04X}",
+                objadr=objadr,
+            ))
+    return devices
+
+
+def build_telegrams(const, per_type: int, count: int) -> dict[str, list[tuple]]:
+    """Return count telegrams (type8, ipsrc, ipdest, objsrc, ddata) per case.
+
+    Values alternate per round so the duplicate filter does not drop the
+    repeated telegrams of a device.
+    """
+    def cycle(device_type, make):
+        first_mi, first_objadr = POPULATION[device_type]
+        telegrams = []
+        for i in range(count):
+            k = i % per_type
+            telegrams.append(make(first_mi + k, first_objadr + k * OBJADR_STEP, (i // per_type) % 2))
+        return telegrams
+
+    obj = const.SEND_AS_OBJ_GRP
+    broadcast = 0x7FFF
+    cases = {
+        "actor_ack_switch": cycle("switch", lambda mi, objadr, v: (
+            obj, mi, broadcast, objadr, bytes([const.D0_ACTOR_ACK, 0, v]))),
+        "actor_ack_light": cycle("light", lambda mi, objadr, v: (
+            obj, mi, broadcast, objadr, bytes([const.D0_ACTOR_ACK, 0, 0x80 | 50 if v else 0]))),
+        "actor_ack_cover": cycle("cover", lambda mi, objadr, v: (
+            obj, mi, broadcast, objadr, bytes([const.D0_ACTOR_ACK, 0, v]))),
+        "value_ack_temp": cycle("sensor", lambda mi, objadr, v: (
+            obj, mi, broadcast, objadr, bytes([const.D0_VALUE_ACK, const.IN_HW_NR_IS_TEMP, 0, 1, 0x40 + v]))),
+        "sensor_ack": cycle("binary_sensor", lambda mi, objadr, v: (
+            obj, mi, broadcast, objadr, bytes([const.D0_SENSOR_ACK, 0, v]))),
+        "status_info": cycle("switch", lambda mi, objadr, v: (
+            obj, mi, broadcast, objadr, bytes([const.D0_STATUS_INFO, 0, v, 0]))),
+        "set_passive": cycle("switch", lambda mi, objadr, v: (
+            obj, FOREIGN_MI, objadr, FOREIGN_OBJADR, bytes([const.D0_SET, 100 if v else 0]))),
+        "unmanaged": [
+            (obj, UNMANAGED_MI + i % per_type, broadcast, UNMANAGED_OBJADR + i % per_type,
+             bytes([const.D0_ACTOR_ACK, 0, (i // per_type) % 2]))
+            for i in range(count)
+        ],
+    }
+    mixed = [telegram for group in zip(*cases.values()) for telegram in group]
+    cases["mixed"] = mixed[:count]
+    return cases
+
+
+async def encode_frames(api, telegrams) -> list[bytes]:
+    """Encode telegrams with the real sender, returns the wire frames."""
+    writer = _CaptureWriter()
+    sender = api.N4HPacketSender(writer)
+    for type8, ipsrc, ipdest, objsrc, ddata in telegrams:
+        await sender.send_raw_command(ipdst=ipdest, ddata=ddata, objsource=objsrc, mi=ipsrc, type8=type8)
+    return writer.frames
+
+
+def split_stream(data: bytes) -> list[bytes]:
+    """Split a raw received byte stream into frames (4 byte length + section)."""
+    frames = []
+    pos = 0
+    while pos + 4 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], "little")
+        if length == 0 or pos + 4 + length > len(data):
+            break
+        frames.append(data[pos:pos + 4 + length])
+        pos += 4 + length
+    return frames
+
+
+def load_corpus(path: Path) -> list[bytes]:
+    """Return the frames of a capture or a recorded byte stream."""
+    try:
+        from net4home.capture import CAPTURE_MAGIC, received_stream
+    except ImportError:
+        # Revision without captures
+        CAPTURE_MAGIC = None
+    with open(path, "rb") as file:
+        is_capture = CAPTURE_MAGIC is not None and file.read(len(CAPTURE_MAGIC)) == CAPTURE_MAGIC
+    frames = split_stream(received_stream(path) if is_capture else path.read_bytes())
+    if not frames:
+        raise SystemExit(f"No frames found in {path}")
+    return frames
+
+
+def load_device_options(path: Path) -> list[dict]:
+    """Return the device dicts of a config entry "devices" mapping."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    devices = data.get("devices", data)
+    return list(devices.values())
+
+
+async def measure(fn, items, frames_per_item: float, repeat: int, alloc_items: int, is_async: bool,
+                  reset=None) -> dict:
+    """Return frames/s (best of repeat) and bytes allocated per frame.
+
+    reset is called before every pass (e.g. to clear the duplicate filter).
+    """
+    best = None
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        gc.collect()
+        started = time.perf_counter()
+        if is_async:
+            for item in items:
+                await fn(item)
+        else:
+            for item in items:
+                fn(item)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Separate pass, tracemalloc slows every allocation down
+    sample = items[:alloc_items]
+    transient = 0
+    retained = 0
+    if reset is not None:
+        reset()
+    gc.collect()
+    tracemalloc.start()
+    for item in sample:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        if is_async:
+            await fn(item)
+        else:
+            fn(item)
+        after, peak = tracemalloc.get_traced_memory()
+        transient += peak - before
+        retained += after - before
+    tracemalloc.stop()
+
+    frames = len(items) * frames_per_item
+    sample_frames = len(sample) * frames_per_item
+    return {
+        "frames": round(frames),
+        "fps": round(frames / best) if best else 0,
+        "alloc_bytes": round(transient / sample_frames, 1) if sample_frames else 0.0,
+        "retained_bytes": round(retained / sample_frames, 1) if sample_frames else 0.0,
+    }
+
+
+async def run_suite(args) -> dict:
+    """Run all benchmarks and return the results."""
+    api, const, Net4HomeDevice, device_from_options = load_integration(Path(args.root))
+    devices = build_devices(Net4HomeDevice, args.per_type)
+
+    if args.corpus:
+        corpus = {"corpus": load_corpus(Path(args.corpus))}
+        if args.devices:
+            if device_from_options is None:
+                raise SystemExit("This revision cannot load devices from options")
+            devices = [device_from_options(dev) for dev in load_device_options(Path(args.devices))]
+        sender_telegrams = None
+    else:
+        telegrams = build_telegrams(const, args.per_type, args.frames)
+        corpus = {name: await encode_frames(api, cases) for name, cases in telegrams.items()}
+        sender_telegrams = telegrams["mixed"]
+
+    all_frames = [frame for frames in corpus.values() for frame in frames][:args.frames]
+    sections = [frame[4:] for frame in all_frames]
+    payloads = [
+        api.decomp_section_c_exact(section, 0, len(section), 2048, False)[0] for section in sections
+    ]
+    payload_hex = [payload.hex().upper() for payload in payloads]
+    stream = b"".join(all_frames)
+    chunks = [stream[pos:pos + 4096] for pos in range(0, len(stream), 4096)]
+
+    results = {
+        "decomp_section_c_exact": await measure(
+            lambda s: api.decomp_section_c_exact(s, 0, len(s), 2048, False),
+            sections, 1.0, args.repeat, args.alloc_frames, False,
+        ),
+        "compress_section": await measure(
+            api.compress_section, payload_hex, 1.0, args.repeat, args.alloc_frames, False
+        ),
+        "n4h_parse": await measure(api.n4h_parse, payloads, 1.0, args.repeat, args.alloc_frames, False),
+    }
+
+    receiver = api.N4HPacketReceiver()
+    results["receive_raw_command"] = await measure(
+        receiver.receive_raw_command, chunks, len(all_frames) / len(chunks),
+        args.repeat, args.alloc_frames, False,
+    )
+
+    if sender_telegrams is not None:
+        sender = api.N4HPacketSender(_NullWriter())
+
+        async def send(telegram):
+            type8, ipsrc, ipdest, objsrc, ddata = telegram
+            await sender.send_raw_command(ipdst=ipdest, ddata=ddata, objsource=objsrc, mi=ipsrc, type8=type8)
+
+        results["send_raw_command"] = await measure(
+            send, sender_telegrams, 1.0, args.repeat, args.alloc_frames, True
+        )
+
+    if not hasattr(api.Net4HomeApi, "_async_handle_payload"):
+        print("Dispatch benchmarks skipped: Net4HomeApi._async_handle_payload not available in this revision")
+        return results
+
+    from homeassistant.core import HomeAssistant
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = api.Net4HomeApi(hass, "127.0.0.1", entry_id="bench")
+        # Confirming D0_REQ of the passive tracker and other sends go nowhere
+        client._packet_sender = api.N4HPacketSender(_NullWriter())
+        if hasattr(client, "add_devices"):
+            client.add_devices(devices)
+        else:
+            for device in devices:
+                client.devices[device.device_id] = device
+
+        for name, frames in corpus.items():
+            case_payloads = [
+                api.decomp_section_c_exact(frame[4:], 0, len(frame) - 4, 2048, False)[0] for frame in frames
+            ]
+            results[f"dispatch_{name}"] = await measure(
+                client._async_handle_payload, case_payloads, 1.0, args.repeat, args.alloc_frames, True,
+                reset=getattr(getattr(client, "duplicate_filter", None), "clear", None),
+            )
+
+        if hasattr(client, "passive_tracker"):
+            client.passive_tracker.cancel()
+        await hass.async_stop(force=True)
+
+    return results
+
+
+def revision(root: Path) -> str:
+    """Return the short git revision of a checkout (with + if modified)."""
+    try:
+        rev = subprocess.run(
+            ["git", "-C", str(root), "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "-C", str(root), "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return rev + ("+" if dirty else "")
+
+
+def print_results(report: dict) -> None:
+    print(f"Revision {report['revision']}, Python {report['python']}")
+    print(f"{'benchmark':<28}{'frames/s':>12}{'alloc B/frame':>15}{'retained B/frame':>18}")
+    for name, result in report["results"].items():
+        print(f"{name:<28}{result['fps']:>12,}{result['alloc_bytes']:>15.1f}{result['retained_bytes']:>18.1f}")
+
+
+def compare(base: dict, current: dict, threshold: float) -> bool:
+    """Print the change per benchmark, return True if something regressed."""
+    print(f"\nComparison {base['revision']} -> {current['revision']} (threshold {threshold:.0f}%)")
+    print(f"{'benchmark':<28}{'frames/s':>12}{'change':>9}{'alloc B/frame':>15}{'change':>9}")
+    regressed = False
+    for name, result in current["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            print(f"{name:<28}{result['fps']:>12,}{'new':>9}")
+            continue
+        fps_change = (result["fps"] - old["fps"]) * 100 / old["fps"] if old["fps"] else 0.0
+        alloc_change = (
+            (result["alloc_bytes"] - old["alloc_bytes"]) * 100 / old["alloc_bytes"]
+            if old["alloc_bytes"] else 0.0
+        )
+        flags = []
+        if fps_change < -threshold:
+            flags.append("slower")
+        if alloc_change > threshold and result["alloc_bytes"] - old["alloc_bytes"] > ALLOC_NOISE_BYTES:
+            flags.append("more allocations")
+        regressed = regressed or bool(flags)
+        print(
+            f"{name:<28}{result['fps']:>12,}{fps_change:>+8.1f}%"
+            f"{result['alloc_bytes']:>15.1f}{alloc_change:>+8.1f}%"
+            + (f"  REGRESSION ({', '.join(flags)})" if flags else "")
+        )
+    return regressed
+
+
+def run_against(rev: str, args) -> dict:
+    """Run the suite on another revision in a temporary worktree."""
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = Path(tmp) / "rev"
+        output = Path(tmp) / "base.json"
+        subprocess.run(["git", "-C", str(REPO_ROOT), "worktree", "add", "--detach", str(worktree), rev], check=True)
+        try:
+            # This script, not the one of the revision (it may not exist there)
+            command = [
+                sys.executable, __file__, "--root", str(worktree), "--save", str(output),
+                "--frames", str(args.frames), "--repeat", str(args.repeat),
+                "--alloc-frames", str(args.alloc_frames), "--per-type", str(args.per_type),
+            ]
+            if args.corpus:
+                command += ["--corpus", str(Path(args.corpus).resolve())]
+            if args.devices:
+                command += ["--devices", str(Path(args.devices).resolve())]
+            subprocess.run(command, check=True)
+            return json.loads(output.read_text(encoding="utf-8"))
+        finally:
+            subprocess.run(["git", "-C", str(REPO_ROOT), "worktree", "remove", "--force", str(worktree)], check=False)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=str(REPO_ROOT), help="checkout to benchmark")
+    parser.add_argument("--frames", type=int, default=10000, help="frames per benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs, the best one counts")
+    parser.add_argument("--alloc-frames", type=int, default=1000, help="frames traced for allocations")
+    parser.add_argument("--per-type", type=int, default=50, help="synthetic devices per type")
+    parser.add_argument("--corpus", help="capture or raw received byte stream instead of the synthetic corpus")
+    parser.add_argument("--devices", help="JSON with the config entry devices for --corpus")
+    parser.add_argument("--save", help="write the results to a JSON file")
+    parser.add_argument("--compare", help="compare with results saved by --save")
+    parser.add_argument("--against", help="compare with another git revision")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    base = None
+    if args.against:
+        base = run_against(args.against, args)
+    elif args.compare:
+        base = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+
+    report = {
+        "revision": revision(Path(args.root)),
+        "python": platform.python_version(),
+        "results": asyncio.run(run_suite(args)),
+    }
+    print_results(report)
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if base is not None and compare(base, report, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+"""Local net4home bus connector simulator for load and latency tests.
+
+Speaks the connector protocol over TCP (compressed frames with a 4-byte
+length prefix, password handshake, N4HIP_PT_PAKET telegrams) and simulates
+a population of modules built from module_types.MODULE_TYPES:
+
+- ENUM_ALL / GET_TYP are answered with D0_ACK_TYP (spread over a short time)
+- D0_REQ is answered with D0_ACTOR_ACK, D0_SET/D0_TOGGLE change the actor
+- D0_RD_ACTOR_DATA and D0_RD_SENSOR_DATA are answered with their ACK
+  (actor/sensor object addresses)
+- cyclic sensor traffic (D0_VALUE_ACK temperatures, actor status) at --rate
+
+All clients share one bus: a telegram written by a client is also seen by
+the others (useful for a hot-standby second connection). Every --stats
+seconds the simulator prints the telegram rates and the discovery times.
+
+Needs the integration's dependencies (const.py imports Home Assistant):
+
+    python benchmarks/bus_simulator.py [--port 3478] [--modules 20] [--rate 50]
+
+and configure the integration (or a test) with host 127.0.0.1.
+"""
+import argparse
+import asyncio
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from net4home.const import (  # noqa: E402
+    BROADCASTIP,
+    D0_ACK_TYP,
+    D0_ACTOR_ACK,
+    D0_ENUM_ALL,
+    D0_GET_TYP,
+    D0_RD_ACTOR_DATA,
+    D0_RD_ACTOR_DATA_ACK,
+    D0_RD_SENSOR_DATA,
+    D0_RD_SENSOR_DATA_ACK,
+    D0_REQ,
+    D0_SET,
+    D0_TOGGLE,
+    D0_VALUE_ACK,
+    D0_VALUE_REQ,
+    IN_HW_NR_IS_TEMP,
+    MAX_N4H_PAKET_LEN,
+    MI_ENUM_ALL,
+    N4H_IP_CLIENT_ACCEPTED,
+    N4H_IP_CLIENT_DENIED_WRONG_PASSWORD,
+    N4H_IP_PORT,
+    N4HIP_PT_PAKET,
+    N4HIP_PT_PASSWORT_REQ,
+    OUT_HW_NR_IS_DIMMER,
+    OUT_HW_NR_IS_JAL,
+    OUT_HW_NR_IS_ONOFF,
+    PLATINE_HW_IS_AD3,
+    PLATINE_HW_IS_AJ3,
+    PLATINE_HW_IS_AR6,
+    PLATINE_HW_IS_S4,
+    RESERVED1_DEFAULT,
+    SEND_AS_IP,
+    SEND_AS_OBJ_GRP,
+    STANDARD_PAYLOAD_LEN,
+    TRAILER_SIZE,
+)
+from net4home.module_types import MODULE_TYPES  # noqa: E402
+from net4home.n4htools import compress_section, decomp_section_c_exact  # noqa: E402
+
+# Module mix of the default population (switch, dimmer, jalousie, sensor)
+DEFAULT_TYPES = (PLATINE_HW_IS_AR6, PLATINE_HW_IS_AD3, PLATINE_HW_IS_AJ3, PLATINE_HW_IS_S4)
+ACTOR_KIND = {PLATINE_HW_IS_AD3: OUT_HW_NR_IS_DIMMER, PLATINE_HW_IS_AJ3: OUT_HW_NR_IS_JAL}
+
+FIRST_MI = 0x0100
+FIRST_OBJADR = 1000
+OBJADR_STEP = 16
+
+
+def encode_frame(ptype: int, body: bytes) -> bytes:
+    """Frame a connector packet: IP header, compression, length prefix."""
+    header = struct.pack('<HHI', ptype, RESERVED1_DEFAULT, len(body))
+    return bytes.fromhex(compress_section((header + body).hex().upper()))
+
+
+def encode_paket(type8: int, ipsrc: int, ipdest: int, objsrc: int, ddata: bytes) -> bytes:
+    """Frame a bus telegram the way N4HPacketSender does."""
+    body = (
+        bytes([type8, 0])
+        + struct.pack('<HHH', ipsrc, ipdest, objsrc)
+        + bytes([len(ddata)])
+        + ddata.ljust(MAX_N4H_PAKET_LEN, b"\x00")
+        + bytes(TRAILER_SIZE)
+    )
+    assert len(body) == STANDARD_PAYLOAD_LEN
+    return encode_frame(N4HIP_PT_PAKET, body)
+
+
+def decode_frames(buffer: bytearray):
+    """Yield the decompressed packets of all complete frames and remove them from buffer."""
+    while len(buffer) >= 4:
+        length = int.from_bytes(buffer[:4], 'little')
+        if len(buffer) < length + 4:
+            return
+        frame = bytes(buffer[4:length + 4])
+        del buffer[:length + 4]
+        payload, _ = decomp_section_c_exact(frame, 0, len(frame), 2048, False)
+        yield payload
+
+
+class SimModule:
+    """One simulated module: MI address, object addresses and actor states."""
+
+    def __init__(self, mi: int, typ: int, objadr: int):
+        self.mi = mi
+        self.info = MODULE_TYPES[typ]
+        self.objadr = objadr
+        self.actor_kind = ACTOR_KIND.get(typ, OUT_HW_NR_IS_ONOFF)
+        # sensors use objadr .. objadr+ns-1, actors follow
+        self.states = [0] * self.info.na
+        self.temperature = random.uniform(18.0, 23.0)
+
+    def sensor_objadr(self, channel: int) -> int:
+        return self.objadr + channel
+
+    def actor_objadr(self, channel: int) -> int:
+        return self.objadr + self.info.ns + channel
+
+    def ack_typ(self) -> bytes:
+        info = self.info
+        return bytes([
+            D0_ACK_TYP, info.typ, info.ns, info.na, 0, info.swIPK2, 0,
+            info.sw1, info.sw2, info.swIPK1, 0, 0, info.ng & 0xFF, info.nm & 0xFF,
+        ])
+
+    def actor_ack(self, channel: int) -> bytes:
+        return bytes([D0_ACTOR_ACK, 0, self.states[channel]])
+
+    def apply(self, channel: int, ddata: bytes) -> None:
+        """Apply D0_SET/D0_TOGGLE to an actor channel."""
+        state = self.states[channel]
+        if self.actor_kind == OUT_HW_NR_IS_DIMMER:
+            if ddata[0] == D0_TOGGLE:
+                self.states[channel] = 0 if state & 0x80 else 0x80 | 100
+            else:
+                level = min(ddata[1], 100)
+                self.states[channel] = 0x80 | level if level else 0
+        elif self.actor_kind == OUT_HW_NR_IS_JAL:
+            # 3 = open (reported as 1), 1 = close, 0 = stop
+            if ddata[0] == D0_TOGGLE:
+                self.states[channel] = 2 if state == 1 else 1
+            elif len(ddata) > 1 and ddata[1] in (1, 3):
+                self.states[channel] = 1 if ddata[1] == 3 else 2
+        else:
+            if ddata[0] == D0_TOGGLE:
+                self.states[channel] = 0 if state else 1
+            else:
+                self.states[channel] = 1 if ddata[1] else 0
+
+    def rd_actor_data_ack(self, channel: int) -> bytes:
+        objadr = self.actor_objadr(channel)
+        return bytes([D0_RD_ACTOR_DATA_ACK, channel, self.actor_kind, 0, 0, 0, 0, 1,
+                      objadr >> 8, objadr & 0xFF, 0, 0, 0])
+
+    def rd_sensor_data_ack(self, channel: int) -> bytes:
+        objadr = self.sensor_objadr(channel)
+        ddata = bytearray(22)
+        ddata[0] = D0_RD_SENSOR_DATA_ACK
+        ddata[1] = channel
+        ddata[13] = objadr >> 8
+        ddata[14] = objadr & 0xFF
+        return bytes(ddata)
+
+    def value_ack(self) -> bytes:
+        self.temperature += random.uniform(-0.1, 0.1)
+        raw = int(round(self.temperature * 16)) & 0xFFFF
+        return bytes([D0_VALUE_ACK, IN_HW_NR_IS_TEMP, 0, raw >> 8, raw & 0xFF])
+
+
+class BusSimulator:
+    """TCP server with the simulated bus behind it."""
+
+    def __init__(self, modules, rate: float, password_hash: str = None, password_ack: bool = True,
+                 enum_spread: float = 0.3):
+        self.modules = modules
+        self.by_mi = {module.mi: module for module in modules}
+        self.by_objadr = {}
+        for module in modules:
+            for channel in range(module.info.na):
+                self.by_objadr[module.actor_objadr(channel)] = (module, channel)
+        self.rate = rate
+        self.password_hash = password_hash
+        self.password_ack = password_ack
+        self.enum_spread = enum_spread
+        self.clients: set = set()
+        self.stats = {"rx": 0, "tx": 0, "cyclic": 0, "answers": 0, "logins": 0, "denied": 0}
+        self._enum_started = None
+        self._enum_done = None
+        self._last_config_read = None
+
+    # === Bus side
+
+    def broadcast(self, frame: bytes, exclude=None) -> None:
+        """Put a frame on the bus: every logged-in client receives it."""
+        for writer in self.clients:
+            if writer is not exclude:
+                writer.write(frame)
+                self.stats["tx"] += 1
+
+    def send(self, module: SimModule, ipdest: int, objsrc: int, ddata: bytes, type8: int = SEND_AS_OBJ_GRP) -> None:
+        self.stats["answers"] += 1
+        self.broadcast(encode_paket(type8, module.mi, ipdest, objsrc, ddata))
+
+    async def _answer_enum(self, module: SimModule, ipdest: int) -> None:
+        await asyncio.sleep(random.uniform(0, self.enum_spread))
+        self.send(module, ipdest, module.objadr, module.ack_typ(), SEND_AS_IP)
+        self._enum_done = time.monotonic()
+
+    def handle_telegram(self, payload: bytes, writer) -> None:
+        """React to a telegram written by a client."""
+        self.stats["rx"] += 1
+        # Other clients on the same bus see it as well
+        self.broadcast(encode_frame(N4HIP_PT_PAKET, payload[8:]), exclude=writer)
+
+        body = payload[8:]
+        ipsrc, ipdest, objsrc = struct.unpack('<HHH', body[2:8])
+        ddata = body[9:9 + body[8]]
+        if not ddata:
+            return
+        opcode = ddata[0]
+
+        if opcode in (D0_ENUM_ALL, D0_GET_TYP):
+            targets = self.modules if ipdest == MI_ENUM_ALL else [self.by_mi.get(ipdest)]
+            if ipdest == MI_ENUM_ALL and self._enum_started is None:
+                self._enum_started = time.monotonic()
+            for module in targets:
+                if module is not None:
+                    asyncio.create_task(self._answer_enum(module, ipsrc))
+            return
+
+        if opcode in (D0_RD_ACTOR_DATA, D0_RD_SENSOR_DATA):
+            module = self.by_mi.get(ipdest)
+            if module is None or len(ddata) < 2:
+                return
+            self._last_config_read = time.monotonic()
+            channel = ddata[1]
+            if opcode == D0_RD_ACTOR_DATA and channel < module.info.na:
+                self.send(module, ipsrc, 0, module.rd_actor_data_ack(channel), SEND_AS_IP)
+            elif opcode == D0_RD_SENSOR_DATA and channel < module.info.ns:
+                self.send(module, ipsrc, 0, module.rd_sensor_data_ack(channel), SEND_AS_IP)
+            return
+
+        target = self.by_objadr.get(ipdest)
+        if target is None:
+            return
+        module, channel = target
+        if opcode in (D0_SET, D0_TOGGLE):
+            module.apply(channel, ddata)
+        elif opcode not in (D0_REQ, D0_VALUE_REQ):
+            return
+        self.send(module, BROADCASTIP, ipdest, module.actor_ack(channel))
+
+    async def async_cyclic(self) -> None:
+        """Generate spontaneous bus traffic at the configured rate."""
+        if self.rate <= 0 or not self.modules:
+            return
+        interval = 0.01
+        budget = 0.0
+        while True:
+            await asyncio.sleep(interval)
+            if not self.clients:
+                continue
+            budget += self.rate * interval
+            while budget >= 1:
+                budget -= 1
+                module = random.choice(self.modules)
+                if module.info.ns:
+                    channel = random.randrange(module.info.ns)
+                    objsrc = module.sensor_objadr(channel)
+                    ddata = module.value_ack()
+                else:
+                    channel = random.randrange(module.info.na)
+                    objsrc = module.actor_objadr(channel)
+                    ddata = module.actor_ack(channel)
+                self.stats["cyclic"] += 1
+                self.send(module, BROADCASTIP, objsrc, ddata)
+            await asyncio.gather(*(writer.drain() for writer in list(self.clients)), return_exceptions=True)
+
+    async def async_report(self, interval: float) -> None:
+        last = dict(self.stats)
+        while True:
+            await asyncio.sleep(interval)
+            rates = {key: (self.stats[key] - last[key]) / interval for key in ("rx", "tx", "cyclic")}
+            last = dict(self.stats)
+            discovery = ""
+            if self._enum_started is not None:
+                if self._enum_done is not None:
+                    discovery += f", enum answered in {self._enum_done - self._enum_started:.2f}s"
+                if self._last_config_read is not None:
+                    discovery += f", last config read after {self._last_config_read - self._enum_started:.1f}s"
+            print(
+                f"clients={len(self.clients)} rx={rates['rx']:.0f}/s tx={rates['tx']:.0f}/s "
+                f"cyclic={rates['cyclic']:.0f}/s total rx={self.stats['rx']} tx={self.stats['tx']}{discovery}",
+                flush=True,
+            )
+
+    # === Connector side
+
+    def _login(self, payload: bytes, writer) -> bool:
+        """Check the login packet and answer it; False if the password is wrong."""
+        hash_len = payload[20] if len(payload) > 20 else 0
+        client_hash = payload[21:21 + hash_len].decode("ascii", "replace")
+        accepted = self.password_hash is None or client_hash.upper() == self.password_hash.upper()
+        result = N4H_IP_CLIENT_ACCEPTED if accepted else N4H_IP_CLIENT_DENIED_WRONG_PASSWORD
+        if self.password_ack or not accepted:
+            writer.write(encode_frame(N4HIP_PT_PASSWORT_REQ, struct.pack('<i', result)))
+        self.stats["logins" if accepted else "denied"] += 1
+        return accepted
+
+    async def async_handle_client(self, reader, writer) -> None:
+        peer = writer.get_extra_info("peername")
+        print(f"client {peer} connected", flush=True)
+        buffer = bytearray()
+        logged_in = False
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                buffer.extend(data)
+                for payload in decode_frames(buffer):
+                    ptype = struct.unpack('<h', payload[:2])[0]
+                    if not logged_in:
+                        if ptype != N4HIP_PT_PASSWORT_REQ:
+                            continue
+                        if not self._login(payload, writer):
+                            print(f"client {peer}: wrong password", flush=True)
+                            await writer.drain()
+                            return
+                        logged_in = True
+                        self.clients.add(writer)
+                    elif ptype == N4HIP_PT_PAKET:
+                        self.handle_telegram(payload, writer)
+                await writer.drain()
+        except (ConnectionResetError, OSError) as e:
+            print(f"client {peer}: {e}", flush=True)
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+            print(f"client {peer} disconnected", flush=True)
+
+
+def build_population(count: int, types) -> list:
+    """Create count modules, cycling through the module types."""
+    modules = []
+    for index in range(count):
+        typ = types[index % len(types)]
+        modules.append(SimModule(FIRST_MI + index, typ, FIRST_OBJADR + index * OBJADR_STEP))
+    return modules
+
+
+async def async_main(args) -> None:
+    types = [int(typ) for typ in args.types.split(",")] if args.types else list(DEFAULT_TYPES)
+    unknown = [typ for typ in types if typ not in MODULE_TYPES]
+    if unknown:
+        raise SystemExit(f"unknown module types: {unknown}")
+    simulator = BusSimulator(
+        build_population(args.modules, types),
+        rate=args.rate,
+        password_hash=args.password_hash,
+        password_ack=not args.no_password_ack,
+        enum_spread=args.enum_spread,
+    )
+    server = await asyncio.start_server(simulator.async_handle_client, args.host, args.port)
+    print(f"simulating {args.modules} modules on {args.host}:{args.port}, {args.rate:.0f} telegrams/s", flush=True)
+    async with server:
+        await asyncio.gather(
+            server.serve_forever(),
+            simulator.async_cyclic(),
+            simulator.async_report(args.stats),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=N4H_IP_PORT)
+    parser.add_argument("--modules", type=int, default=20, help="number of simulated modules")
+    parser.add_argument("--types", help="comma separated PLATINE_HW_IS_* numbers (default: AR6,AD3,AJ3,S4)")
+    parser.add_argument("--rate", type=float, default=10.0, help="cyclic telegrams per second (0 = off)")
+    parser.add_argument("--enum-spread", type=float, default=0.3, help="max. delay of the D0_ACK_TYP answers (s)")
+    parser.add_argument("--password-hash", help="accept only logins with this password hash (32 hex characters)")
+    parser.add_argument("--no-password-ack", action="store_true",
+                        help="do not acknowledge the login (older connectors)")
+    parser.add_argument("--stats", type=float, default=5.0, help="seconds between statistics lines")
+    args = parser.parse_args()
+    random.seed(1)
+    try:
+        asyncio.run(async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
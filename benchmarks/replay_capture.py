@@ -0,0 +1,101 @@
+"""Replay a traffic capture through Net4HomeApi.
+
+Feeds the data received on the primary link of a capture (service
+net4home.start_capture, rotated files included) to the real listener and
+dispatch of a Net4HomeApi, at the recorded pace or as fast as possible
+(--speed 0), and prints the receiver, filter and dispatch counters.
+Recorded telegrams only reach the dispatch of known devices, pass the
+device inventory with --devices (the "devices" mapping of the config
+entry options). --list prints the records instead.
+
+Time-dependent behaviour (duplicate filter, handshake) only matches the
+live run at the recorded pace.
+
+Needs Home Assistant installed (the integration imports it):
+
+    python benchmarks/replay_capture.py CAPTURE [--speed 1] [--devices devices.json] [--states]
+    python benchmarks/replay_capture.py CAPTURE --list
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+
+def list_records(path: Path) -> None:
+    """Print every record of a capture."""
+    from net4home.capture import RECORD_STANDBY, RECORD_TX, capture_files, read_capture
+
+    for file in capture_files(path) or [path]:
+        print(f"# {file}")
+        for flags, micros, data in read_capture(file):
+            direction = "TX" if flags & RECORD_TX else "RX"
+            link = "standby" if flags & RECORD_STANDBY else "primary"
+            print(f"{micros / 1_000_000:12.6f} {direction} {link:<7} {len(data):5d} {data.hex()}")
+
+
+async def replay(args) -> None:
+    """Run the capture through a Net4HomeApi."""
+    from homeassistant.core import HomeAssistant
+
+    from net4home.api import Net4HomeApi
+    from net4home.capture import Net4HomeCaptureTransport
+    from net4home.helpers import device_from_options
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # The link is closed at the end, the listener leaves instead of reconnecting
+        transport = Net4HomeCaptureTransport(args.capture, speed=args.speed, keep_open=False)
+        api = Net4HomeApi(hass, "replay", transport=transport)
+        api._reconnect_enabled = False
+        if args.devices:
+            data = json.loads(Path(args.devices).read_text(encoding="utf-8"))
+            api.add_devices(map(device_from_options, data.get("devices", data).values()))
+
+        started = time.monotonic()
+        await api.async_connect()
+        await api.async_listen()
+        elapsed = time.monotonic() - started
+
+        frames = api._packet_receiver.stats["frames"]
+        print(f"Replayed {args.capture} in {elapsed:.2f}s ({frames / elapsed if elapsed else 0:,.0f} frames/s)")
+        print(f"receiver:         {api._packet_receiver.stats}")
+        print(f"address filter:   {api.address_filter.stats}")
+        print(f"duplicate filter: {api.duplicate_filter.stats}")
+        print(f"passive tracking: {dict(api.passive_tracker.stats)}")
+        print(f"devices with state: {len(api.last_states)} of {len(api.devices)}")
+        if args.states:
+            print(json.dumps(api.last_states, indent=2, sort_keys=True, default=str))
+
+        await api.async_disconnect()
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path, help="capture file (the newest one of a rotated capture)")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, 0 = as fast as possible")
+    parser.add_argument("--devices", help="JSON with the config entry devices")
+    parser.add_argument("--states", action="store_true", help="print the decoded states at the end")
+    parser.add_argument("--list", action="store_true", help="print the records and exit")
+    parser.add_argument("--debug", action="store_true", help="debug logging of the integration")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.debug:
+        logging.getLogger("net4home").setLevel(logging.DEBUG)
+
+    if args.list:
+        list_records(args.capture)
+    else:
+        asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
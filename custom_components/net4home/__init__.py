@@ -1,15 +1,34 @@
 """Support for net4home integration."""
 import asyncio
 import logging
+import time
+from datetime import timedelta
 
 from homeassistant.core import HomeAssistant
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-
-from .models import Net4HomeDevice
-from .const import DOMAIN
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN,
+    SNAPSHOT_SAVE_INTERVAL,
+    CONF_DEDUP_WINDOW,
+    DEFAULT_DEDUP_WINDOW,
+    CONF_KEEPALIVE_INTERVAL,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    CONF_STANDBY_HOST,
+    CONF_STANDBY_PORT,
+    N4H_IP_PORT,
+    CAPTURE_DIR,
+    CAPTURE_MAX_BYTES,
+    CAPTURE_MAX_FILES,
+    METRICS_INTERVAL,
+)
 from .api import Net4HomeApi
+from .helpers import device_from_options, register_modules_in_registry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,73 +53,70 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
             objadr=entry.options.get("OBJADR", entry.data.get("OBJADR")),
             entry_id=entry.entry_id,
             entry=entry,
+            dedup_window=entry.options.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW),
+            keepalive_interval=entry.options.get(CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL),
+            standby_host=entry.options.get(CONF_STANDBY_HOST, ""),
+            standby_port=entry.options.get(CONF_STANDBY_PORT, N4H_IP_PORT),
         )
 
+        setup_started = time.monotonic()
+        timings = api.startup_timings
+
+        # Materialise the whole device inventory in one pass
+        phase_started = time.monotonic()
         stored_devices = entry.options.get("devices", {})
-        from homeassistant.helpers import device_registry as dr
-        
-        for dev in stored_devices.values():
-            # Load detail_status from config
-            detail_status = dev.get("detail_status", "pending")
-            detail_retry_count = dev.get("detail_retry_count", 0)
-            last_detail_request_str = dev.get("last_detail_request")
-            last_detail_request = None
-            if last_detail_request_str:
-                try:
-                    from datetime import datetime
-                    last_detail_request = datetime.fromisoformat(last_detail_request_str)
-                except (ValueError, TypeError):
-                    pass
-            
-            # Load sw_version, hw_version, module_type, ns, na, nm, ng from config
-            sw_version = dev.get("sw_version", "")
-            hw_version = dev.get("hw_version", "")
-            module_type = dev.get("module_type")
-            ns = dev.get("ns")
-            na = dev.get("na")
-            nm = dev.get("nm")
-            ng = dev.get("ng")
-            
-            device = Net4HomeDevice(
-                device_id=dev["device_id"],
-                name=dev["name"],
-                model=dev["model"],
-                device_type=dev["device_type"],
-                via_device=dev.get("via_device"),
-                objadr=dev.get("objadr", int(dev["device_id"][3:]) if dev["device_id"].startswith("OBJ") else None),
-                send_state_changes=dev.get("send_state_changes", False),
-                detail_status=detail_status,
-                detail_retry_count=detail_retry_count,
-                last_detail_request=last_detail_request,
-                module_type=module_type,
-                ns=ns,
-                na=na,
-                nm=nm,
-                ng=ng,
-            )
-            api.devices[device.device_id] = device
-            _LOGGER.debug(f"Loaded device from config: {device.device_id} ({device.device_type}, detail_status: {detail_status})")
-            
-            # Register only modules in Device Registry on startup
-            if device.device_type == "module":
-                device_registry = dr.async_get(hass)
-                device_registry.async_get_or_create(
-                    config_entry_id=entry.entry_id,
-                    identifiers={(DOMAIN, device.device_id.upper())},
-                    manufacturer="net4home",
-                    name=device.name,
-                    model=device.model,
-                    sw_version=sw_version,
-                    hw_version=hw_version,
-                    connections=set(),
-                    via_device=None,
-                )
-                _LOGGER.debug(f"Registered module device {device.device_id} in device registry on startup (sw_version={sw_version}, hw_version={hw_version})")
+        api.add_devices(map(device_from_options, stored_devices.values()))
+        timings["load_devices"] = time.monotonic() - phase_started
+
+        # Register only modules in Device Registry on startup
+        phase_started = time.monotonic()
+        module_count = register_modules_in_registry(hass, entry.entry_id, stored_devices)
+        timings["register_modules"] = time.monotonic() - phase_started
+        _LOGGER.debug(f"Registered {module_count} module devices in device registry on startup")
 
         hass.data[DOMAIN][entry.entry_id] = api
-        _LOGGER.info(f"Loaded {len(api.devices)} devices from config before platform setup: {[d.device_id for d in api.devices.values()]}")
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-        _LOGGER.info(f"Platform setup completed. Devices in API: {len(api.devices)}")
+        _LOGGER.info(f"Loaded {len(api.devices)} devices from config before platform setup")
+
+        # Restore last known states before the entities are created
+        phase_started = time.monotonic()
+        await api.async_load_snapshot()
+        timings["load_snapshot"] = time.monotonic() - phase_started
+        entry.async_on_unload(
+            async_track_time_interval(hass, api.async_save_snapshot, timedelta(seconds=SNAPSHOT_SAVE_INTERVAL))
+        )
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, api.async_save_snapshot)
+        )
+        # Telegram rates and the metrics sensors
+        entry.async_on_unload(
+            async_track_time_interval(hass, api.metrics.sample, timedelta(seconds=METRICS_INTERVAL))
+        )
+
+        async def setup_platforms():
+            """Create the entities (only platforms that have devices, others are loaded on demand)."""
+            started = time.monotonic()
+            required = api.required_platforms()
+            platforms = [platform for platform in PLATFORMS if platform in required]
+            api.loaded_platforms.update(platforms)
+            await hass.config_entries.async_forward_entry_setups(entry, platforms)
+            timings["platforms"] = time.monotonic() - started
+            _LOGGER.info(f"Platform setup completed for {platforms}. Devices in API: {len(api.devices)}")
+
+        async def connect_and_listen():
+            """Connect to the bus connector and start the listener (handshake runs in the listener)."""
+            started = time.monotonic()
+            await api.async_connect()
+            # Start listener task and store reference for proper cleanup
+            api._listen_task = asyncio.create_task(api.async_listen())
+            timings["connect"] = time.monotonic() - started
+
+        # Connect to the bus while the platforms create their entities
+        startup_tasks = [asyncio.create_task(setup_platforms()), asyncio.create_task(connect_and_listen())]
+        try:
+            await asyncio.gather(*startup_tasks)
+        except Exception as e:
+            await _async_abort_startup(hass, entry, api, startup_tasks)
+            raise ConfigEntryNotReady(f"net4home startup failed: {e}") from e
 
         # Diagnostics function is automatically detected by Home Assistant
         # when named async_get_config_entry_diagnostics and defined in __init__.py
@@ -142,13 +158,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
 
         _LOGGER.debug(f"List of loaded devices: {list(api.devices.keys())}")
 
-        await api.async_connect()
-        # Start listener task and store reference for proper cleanup
-        api._listen_task = asyncio.create_task(api.async_listen())
-        
         # Start detail queue manager for load-balanced detail queries
         await api.async_start_detail_retrieval()
 
+        # Re-read restored states slowly in the background
+        api.async_start_snapshot_resync()
+
+        # Keep objects without state change messages up to date
+        api.poller.start()
+
+        # Detect half-open connections and measure the round-trip time
+        api.keepalive.start()
+
+        # Second connector, takes over when the primary connection fails
+        if api.standby is not None:
+            api.standby.start()
+
+        timings["total"] = time.monotonic() - setup_started
+        _LOGGER.info(
+            "Startup timings: "
+            + ", ".join(f"{phase}={duration:.3f}s" for phase, duration in timings.items())
+        )
+
         # Debug service
         async def handle_debug_devices(call):
             target_entry_id = call.data.get("entry_id", entry.entry_id)
@@ -191,13 +222,110 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
 
         hass.services.async_register(DOMAIN, "enum_all", handle_enum_all)
 
+        # Bulk status resync
+        async def handle_resync(call):
+            """Handle resync service call."""
+            target_entry_id = call.data.get("entry_id", entry.entry_id)
+            api = hass.data[DOMAIN].get(target_entry_id)
+            if not api:
+                _LOGGER.warning(f"[net4home] No API object for entry_id {target_entry_id}")
+                return
+
+            kwargs = {}
+            if call.data.get("device_type"):
+                kwargs["device_types"] = call.data["device_type"]
+            if call.data.get("device_id"):
+                kwargs["device_ids"] = [device_id.upper() for device_id in call.data["device_id"]]
+            if call.data.get("rate"):
+                kwargs["rate"] = float(call.data["rate"])
+            api.resync.async_start(**kwargs)
+            _LOGGER.info(f"[net4home] Resync started (entry_id {target_entry_id})")
+
+        hass.services.async_register(DOMAIN, "resync", handle_resync)
+
+        # Group memberships for the group index
+        async def handle_set_group(call):
+            """Handle set_group service call."""
+            target_entry_id = call.data.get("entry_id", entry.entry_id)
+            api = hass.data[DOMAIN].get(target_entry_id)
+            if not api:
+                _LOGGER.warning(f"[net4home] No API object for entry_id {target_entry_id}")
+                return
+
+            module = str(call.data["module"]).upper()
+            try:
+                mi = int(module[2:] if module.startswith("MI") else module, 16)
+                group = int(call.data["group"])
+                mask = 0
+                for channel in call.data.get("channels") or []:
+                    # Channels are numbered from 1 like the actor objects
+                    mask |= 1 << (int(channel) - 1)
+                api.group_index.set_entry(mi, group, mask)
+            except ValueError as e:
+                _LOGGER.error(f"[net4home] Invalid group entry {call.data}: {e}")
+                return
+            await api.group_index.async_save()
+            _LOGGER.info(f"[net4home] Group {group} on MI{mi:04X}: channel mask 0x{mask:04X} (entry_id {target_entry_id})")
+
+        hass.services.async_register(DOMAIN, "set_group", handle_set_group)
+
+        # Raw traffic capture
+        async def handle_start_capture(call):
+            """Handle start_capture service call."""
+            target_entry_id = call.data.get("entry_id", entry.entry_id)
+            api = hass.data[DOMAIN].get(target_entry_id)
+            if not api:
+                _LOGGER.warning(f"[net4home] No API object for entry_id {target_entry_id}")
+                return
+
+            path = hass.config.path(CAPTURE_DIR, f"{target_entry_id}.n4hcap")
+            max_bytes = int(float(call.data.get("max_size", CAPTURE_MAX_BYTES / 1048576)) * 1048576)
+            duration = float(call.data["duration"]) if call.data.get("duration") else None
+            await api.async_start_capture(path, max_bytes, int(call.data.get("max_files", CAPTURE_MAX_FILES)), duration)
+            _LOGGER.info(f"[net4home] Capture started: {path} (entry_id {target_entry_id})")
+
+        hass.services.async_register(DOMAIN, "start_capture", handle_start_capture)
+
+        async def handle_stop_capture(call):
+            """Handle stop_capture service call."""
+            target_entry_id = call.data.get("entry_id", entry.entry_id)
+            api = hass.data[DOMAIN].get(target_entry_id)
+            if not api:
+                _LOGGER.warning(f"[net4home] No API object for entry_id {target_entry_id}")
+                return
+            await api.async_stop_capture()
+
+        hass.services.async_register(DOMAIN, "stop_capture", handle_stop_capture)
+
         return True
 
+    except ConfigEntryNotReady:
+        raise
     except Exception as e:
         _LOGGER.exception("Error in async_setup_entry: %s", e)
         return False
 
 
+async def _async_abort_startup(hass: HomeAssistant, entry: config_entries.ConfigEntry, api: Net4HomeApi, tasks) -> None:
+    """Undo a failed parallel startup so Home Assistant can retry the entry."""
+    for task in tasks:
+        task.cancel()
+    # Wait until the cancelled sibling has really stopped
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    if api.loaded_platforms:
+        platforms = [platform for platform in PLATFORMS if platform in api.loaded_platforms]
+        try:
+            await hass.config_entries.async_unload_platforms(entry, platforms)
+        except Exception as e:
+            # Platforms whose forwarding was cancelled were never set up
+            _LOGGER.debug(f"Unloading platforms after failed startup: {e}")
+        api.loaded_platforms.clear()
+
+    await api.async_disconnect()
+    hass.data[DOMAIN].pop(entry.entry_id, None)
+
+
 async def options_update_listener1(hass: HomeAssistant, config_entry: config_entries.ConfigEntry) -> None:
     """Reload net4home config entry due to options change."""
     _LOGGER.debug("Reload net4home config entry due to options change")
@@ -212,15 +340,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: config_entries.ConfigEn
     api = hass.data.get(DOMAIN, {}).get(entry.entry_id)
     if api:
         await api.async_stop_detail_retrieval()
+        await api.async_stop_snapshot_resync()
+        await api.poller.async_stop()
+        await api.resync.async_stop()
+        await api.keepalive.async_stop()
+        if api.standby is not None:
+            await api.standby.async_stop()
+        await api.async_stop_capture()
+        await api.async_save_snapshot()
     
-    unload_ok = all(
-        await asyncio.gather(
-            *[
-                hass.config_entries.async_forward_entry_unload(entry, platform)
-                for platform in PLATFORMS
-            ]
-        )
-    )
+    # Only platforms that were forwarded for this entry
+    platforms = [platform for platform in PLATFORMS if api and platform in api.loaded_platforms]
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
 
     if unload_ok:
         skip_disconnect = hass.data[DOMAIN].pop("skip_disconnect", False)
@@ -238,3 +369,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: config_entries.ConfigEn
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: config_entries.ConfigEntry) -> None:
+    """Remove the stored state snapshot and group index when the config entry is deleted."""
+    from .group_index import Net4HomeGroupIndex
+    from .snapshot import Net4HomeStateSnapshot
+
+    await Net4HomeStateSnapshot(hass, entry.entry_id).async_remove()
+    await Net4HomeGroupIndex(hass, entry.entry_id).async_remove()
@@ -0,0 +1,124 @@
+"""Early reject of bus telegrams that concern no managed address."""
+import logging
+
+from .const import (
+    D0_ACK_TYP,
+    D0_ACTOR_ACK,
+    D0_RD_ACTOR_DATA_ACK,
+    D0_RD_MODULSPEC_DATA_ACK,
+    D0_RD_SENSOR_DATA_ACK,
+    sa2_ADR_GRUPPE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Discovery answers are needed before the module is known
+ALWAYS_INTERESTING = frozenset((
+    D0_ACK_TYP,
+    D0_RD_ACTOR_DATA_ACK,
+    D0_RD_MODULSPEC_DATA_ACK,
+    D0_RD_SENSOR_DATA_ACK,
+))
+
+# Offsets in the decompressed payload (8 byte IP header, see n4h_parse)
+_OFS_IPSRC = 10
+_OFS_IPDEST = 12
+_OFS_OBJSRC = 14
+_OFS_DDATALEN = 16
+_OFS_D0 = 17
+
+# Objects above the base address a device answers from (e.g. climate setpoint +1/+2)
+_OBJECT_SPAN = 3
+
+
+class Net4HomeAddressFilter:
+    """65536-bit bitmap of the addresses Home Assistant manages.
+
+    A telegram is kept if its first data byte is a discovery opcode, or if
+    its sender module (ipsrc), sender object (objsrc) or target (ipdest) is
+    marked, or if it is sent to a group with known members. A D0_ACTOR_ACK
+    of an unknown module is kept until the listener has sent it an ENUM
+    (auto-discovery). Everything else is dropped after reading the header
+    bytes, before n4h_parse.
+    """
+
+    def __init__(self, group_index=None):
+        """Initialize an empty bitmap."""
+        self._bits = bytearray(0x10000 >> 3)
+        # Modules that were asked to identify themselves after an unknown D0_ACTOR_ACK
+        self._discovery_sent = bytearray(0x10000 >> 3)
+        self._group_index = group_index
+        self.stats = {"accepted": 0, "rejected": 0}
+
+    def add(self, address: int) -> None:
+        """Mark an address as interesting."""
+        address &= 0xFFFF
+        self._bits[address >> 3] |= 1 << (address & 7)
+
+    def contains(self, address: int) -> bool:
+        """Return True if an address is marked."""
+        return bool(self._bits[address >> 3] & (1 << (address & 7)))
+
+    def set_discovery_sent(self, mi: int, sent: bool = True) -> None:
+        """Stop (or resume) passing D0_ACTOR_ACK of an unknown module for auto-discovery."""
+        mi &= 0xFFFF
+        if sent:
+            self._discovery_sent[mi >> 3] |= 1 << (mi & 7)
+        else:
+            self._discovery_sent[mi >> 3] &= ~(1 << (mi & 7)) & 0xFF
+
+    def add_device(self, device) -> None:
+        """Mark the module and object addresses of a device."""
+        device_id = device.device_id
+        if device_id.startswith("MI"):
+            self.add(int(device_id[2:], 16))
+        if device.via_device and device.via_device.startswith("MI"):
+            self.add(int(device.via_device[2:], 16))
+        if device.objadr is not None:
+            for offset in range(_OBJECT_SPAN):
+                self.add(device.objadr + offset)
+
+    def rebuild(self, devices, own_addresses=()) -> None:
+        """Recreate the bitmap from all devices and the connector's own addresses."""
+        self._bits = bytearray(0x10000 >> 3)
+        for address in own_addresses:
+            if address is not None:
+                self.add(address)
+        for device in devices:
+            self.add_device(device)
+
+    def accepts(self, payload: bytes) -> bool:
+        """Return True if a raw payload has to be parsed and dispatched."""
+        if len(payload) <= _OFS_D0:
+            # Broken or empty telegram, let n4h_parse report it
+            return True
+        bits = self._bits
+        if (
+            (payload[_OFS_DDATALEN] and payload[_OFS_D0] in ALWAYS_INTERESTING)
+            or bits[payload[_OFS_IPSRC + 1] << 5 | payload[_OFS_IPSRC] >> 3] & (1 << (payload[_OFS_IPSRC] & 7))
+            or bits[payload[_OFS_OBJSRC + 1] << 5 | payload[_OFS_OBJSRC] >> 3] & (1 << (payload[_OFS_OBJSRC] & 7))
+            or bits[payload[_OFS_IPDEST + 1] << 5 | payload[_OFS_IPDEST] >> 3] & (1 << (payload[_OFS_IPDEST] & 7))
+        ):
+            self.stats["accepted"] += 1
+            return True
+
+        if (
+            payload[_OFS_DDATALEN] and payload[_OFS_D0] == D0_ACTOR_ACK
+            and not self._discovery_sent[payload[_OFS_IPSRC + 1] << 5 | payload[_OFS_IPSRC] >> 3]
+            & (1 << (payload[_OFS_IPSRC] & 7))
+        ):
+            # Unknown module, the listener sends it an ENUM
+            self.stats["accepted"] += 1
+            return True
+
+        ipdest = payload[_OFS_IPDEST] | payload[_OFS_IPDEST + 1] << 8
+        if ipdest & sa2_ADR_GRUPPE and self._group_index is not None and self._group_index.members(ipdest):
+            self.stats["accepted"] += 1
+            return True
+
+        self.stats["rejected"] += 1
+        return False
+
+    def marked(self) -> int:
+        """Return the number of marked addresses."""
+        return sum(bin(byte).count("1") for byte in self._bits)
@@ -42,7 +42,7 @@ async def async_setup_entry(
         
         _LOGGER.info(f"[Alarm] Setup called with {len(api.devices)} devices in API")
         _LOGGER.debug(f"[Alarm] All devices: {[(d.device_id, d.device_type, d.model) for d in api.devices.values()]}")
-        alarm_devices = [d for d in api.devices.values() if d.device_type == "alarm_control_panel"]
+        alarm_devices = api.devices_of_type("alarm_control_panel")
         _LOGGER.info(f"[Alarm] Found {len(alarm_devices)} alarm devices: {[(d.device_id, d.model, d.objadr) for d in alarm_devices]}")
     except Exception as e:
         _LOGGER.error(f"[Alarm] Error during setup: {e}", exc_info=True)
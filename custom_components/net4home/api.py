@@ -4,21 +4,56 @@ import struct
 import logging
 import binascii
 import time
-from typing import Tuple, Optional
+from typing import Optional
 from datetime import datetime
 
 
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.util import slugify
 
-from .helpers import register_device_in_registry
+from .helpers import register_device_in_registry, platforms_for_device
 from .models import Net4HomeDevice  
-from .n4htools import compress_section, decode_d2b, n4h_parse, platine_typ_to_name_a, get_function_and_address_count
+from .snapshot import Net4HomeStateSnapshot
+from .state_store import Net4HomeStateStore
+from .passive_tracker import Net4HomePassiveTracker
+from .poller import Net4HomePollScheduler
+from .resync import Net4HomeBulkResync
+from .coalescer import Net4HomeCommandCoalescer
+from .dedup import Net4HomeDuplicateFilter
+from .address_filter import Net4HomeAddressFilter
+from .outbound import Net4HomeOutboundQueue, traffic_class_for
+from .reconnect import Net4HomeReconnectSupervisor
+from .keepalive import Net4HomeKeepalive
+from .standby import Net4HomeStandbyLink, LINK_PRIMARY
+from .transport import Net4HomeTransport, Net4HomeTcpTransport
+from .capture import Net4HomeCapture, wrap_link
+from .metrics import Net4HomeMetrics
+from .connection import (
+    Net4HomeConnection,
+    Net4HomeConnectionError,
+    SENDABLE_STATES,
+    STATE_AUTHENTICATING,
+    STATE_CLOSED,
+)
+from .group_index import Net4HomeGroupIndex
+from .confirmation import Net4HomeConfirmationTracker
+from .n4htools import (
+    DecompressionError,
+    compress_section,
+    decomp_section_c_exact,
+    decode_d2b,
+    n4h_parse,
+    platine_typ_to_name_a,
+    get_function_and_address_count,
+)
 
 from .const import (
     N4H_IP_PORT,
     DEFAULT_MI,
     DEFAULT_OBJADR,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    RX_MAX_FRAME_LEN,
     N4HIP_PT_PAKET,
     N4HIP_PT_PASSWORT_REQ,
     N4HIP_PT_OOB_DATA_RAW,
@@ -57,6 +92,7 @@ from .const import (
     D0_WR_MODULSPEC_DATA,
     D0_ENABLE_CONFIGURATION,
     D1_ENABLE_CONFIGURATION_OK_BYTE,
+    SNAPSHOT_RESYNC_WINDOW,
     OUT_HW_NR_IS_ONOFF,
     OUT_HW_NR_IS_TIMER,
     OUT_HW_NR_IS_JAL,
@@ -87,9 +123,42 @@ _LOGGER = logging.getLogger(__name__)
 class N4HPacketReceiver:
     """Receive and parse packets from the bus connector."""
     
-    def __init__(self):
+    def __init__(self, max_frame_len: int = RX_MAX_FRAME_LEN, on_decode_error=None):
         """Initialize the packet receiver."""
         self._buffer = bytearray()
+        self._max_frame_len = max_frame_len
+        self.stats = {"frames": 0, "dropped_frames": 0, "dropped_bytes": 0, "resyncs": 0}
+        # Called when the connector acknowledges the password
+        self.on_password_ack = None
+        # Called with the DecompressionError code (None for other errors) of a broken frame
+        self.on_decode_error = on_decode_error
+
+    def _plausible(self, pos: int) -> bool:
+        """Check the frame header at pos: sane length and a valid first compression block."""
+        payload_len = int.from_bytes(self._buffer[pos:pos + 4], 'little')
+        if not 0 < payload_len <= self._max_frame_len:
+            return False
+        # Block types 0x00 (literal) and 0x40 (run) can start a section, 0x80 is invalid
+        return len(self._buffer) <= pos + 4 or (self._buffer[pos + 4] & 0x80) == 0
+
+    def _resync(self):
+        """Drop bytes up to the next plausible frame header."""
+        self.stats["resyncs"] += 1
+        pos = 1
+        while pos + 4 <= len(self._buffer) and not self._plausible(pos):
+            pos += 1
+        # Keep an incomplete header at the end, it may become plausible with the next read
+        pos = min(pos, max(1, len(self._buffer) - 3))
+        self.stats["dropped_bytes"] += pos
+        _LOGGER.debug(f"Receive buffer resync: dropped {pos} bytes")
+        del self._buffer[:pos]
+
+    def reset(self):
+        """Discard buffered data (after a reconnect the stream restarts at a frame boundary)."""
+        if self._buffer:
+            self.stats["dropped_bytes"] += len(self._buffer)
+            _LOGGER.debug(f"Receive buffer reset, {len(self._buffer)} bytes discarded")
+        self._buffer.clear()
 
     def receive_raw_command(self, data: bytes):
         """Receive raw command data and parse into packets."""
@@ -100,6 +169,11 @@ class N4HPacketReceiver:
             if len(self._buffer) < 4:
                 break  # Not enough data for length header
 
+            if not self._plausible(0):
+                # Corrupt or misaligned length prefix, do not wait for a huge payload
+                self._resync()
+                continue
+
             payload_len = int.from_bytes(self._buffer[:4], 'little')
 
             if len(self._buffer) < payload_len + 4:
@@ -127,6 +201,8 @@ class N4HPacketReceiver:
                         
                     elif ptype == N4HIP_PT_PASSWORT_REQ:
                         _LOGGER.debug(f"Password ACK empfangen")
+                        if self.on_password_ack is not None:
+                            self.on_password_ack()
                     else:
                         _LOGGER.debug(f"Ignored packet type: {ptype}")
 
@@ -135,95 +211,33 @@ class N4HPacketReceiver:
 
             except Exception as e:
                 _LOGGER.error(f"Dekomprimierung fehlgeschlagen: {e}")
-
+                if self.on_decode_error is not None:
+                    self.on_decode_error(e.code if isinstance(e, DecompressionError) else None)
+                # Header looked plausible but the frame is broken: search the next header inside it
+                self.stats["dropped_frames"] += 1
+                self._resync()
+                continue
+
+            self.stats["frames"] += 1
             del self._buffer[:payload_len + 4]
 
         return packets
 
 
-
-class DecompressionError(Exception):
-    """Exception raised when decompression fails."""
-    
-    def __init__(self, code: int, detail: int):
-        """Initialize decompression error."""
-        super().__init__(f"Decompression error {code}, detail: {detail}")
-        self.code = code
-        self.detail = detail
-
-def decomp_section_c_exact(data: bytes, offset: int, length: int, max_out_len: int, use_cs: bool) -> Tuple[bytes, int]:
-    """Decompress a section using the C exact algorithm."""
-    result = bytearray()
-    cs_calc = 0
-    i = offset
-    g_pout_pos = 0
-    ende = False
-    err = False
-
-    while i < length and g_pout_pos < max_out_len and not ende and not err:
-        b = data[i]
-
-        if (b & 0xC0) == 0xC0:
-            if i + 4 >= length:
-                raise DecompressionError(-98, i)
-            cs_rx = (
-                (data[i + 1] << 24)
-                | (data[i + 2] << 16)
-                | (data[i + 3] << 8)
-                | data[i + 4]
-            )
-            i += 5
-            ende = True
-            if use_cs and cs_rx != cs_calc:
-                raise DecompressionError(-100, cs_rx - cs_calc)
-
-        elif (b & 0xC0) == 0x00:
-            if i + 1 >= length:
-                raise DecompressionError(-97, i)
-            cclen = ((data[i] << 8) | data[i + 1]) & 0x3FFF
-            i += 2
-            for j in range(cclen):
-                if i < length:
-                    val = data[i]
-                    result.append(val)
-                    cs_calc += val
-                    g_pout_pos += 1
-                    i += 1
-                else:
-                    raise DecompressionError(-11, i)
-
-        elif (b & 0xC0) == 0x40:
-            if i + 2 >= length:
-                raise DecompressionError(-95, i)
-            cclen = ((data[i] << 8) | data[i + 1]) & 0x3FFF
-            val = data[i + 2]
-            i += 3
-            for _ in range(cclen):
-                result.append(val)
-                cs_calc += val
-                g_pout_pos += 1
-
-        elif (b & 0xC0) == 0x80:
-            raise DecompressionError(-2, i)
-
-        else:
-            raise DecompressionError(-5, i)
-
-    if not err and ende and len(result) <= max_out_len:
-        return bytes(result), len(result)
-
-    raise DecompressionError(-220, i)
-
-
 # Send data to Bus connector
 class N4HPacketSender:
     """Send packets to the bus connector."""
     
-    def __init__(self, writer: asyncio.StreamWriter):
-        """Initialize the packet sender with a stream writer."""
+    def __init__(self, writer: asyncio.StreamWriter, queue: Optional[Net4HomeOutboundQueue] = None,
+                 connection: Optional[Net4HomeConnection] = None, metrics: Optional[Net4HomeMetrics] = None):
+        """Initialize the packet sender with a stream writer (and the outbound queue in front of it)."""
         self._writer = writer
+        self._queue = queue
+        self._connection = connection
+        self._metrics = metrics
 
-    async def send_raw_command(self, ipdst: int, ddata: bytes, objsource: int = 0, mi: int = 65281, type8: int = SEND_AS_OBJ_GRP):
+    async def send_raw_command(self, ipdst: int, ddata: bytes, objsource: int = 0, mi: int = 65281, type8: int = SEND_AS_OBJ_GRP,
+                               traffic_class: Optional[str] = None):
         """
         Send a command to the bus.
         
@@ -235,7 +249,18 @@ class N4HPacketSender:
         - mi: MI address of sender (always MI address, < 0x8000)
         - objsource: OBJ address of sender (can be 0 for module commands)
         - type8: Address type (SEND_AS_IP=1 for MI addresses, 0 for OBJ addresses)
+        - traffic_class: command/poll/discovery (queue policy), derived from ddata[0] if not given
+
+        Returns False if the outbound queue dropped or rejected the frame.
+        Raises Net4HomeConnectionError if the connection is closed.
         """
+        if self._connection is not None:
+            if self._connection.state == STATE_CLOSED:
+                raise Net4HomeConnectionError("Connection to the net4home bus connector is closed")
+            if self._connection.state == STATE_AUTHENTICATING:
+                # Handshake in progress: wait for it, otherwise the queue holds the frame for the replay
+                await self._connection.async_wait_ready(self._connection.handshake_timeout)
+
         _LOGGER.debug(
             f"[IP] Sending command: "
             f"ipsrc=0x{mi:04X}, ipdst=0x{ipdst:04X}, objsrc={objsource}, "
@@ -282,18 +307,30 @@ class N4HPacketSender:
                 f"final_bytes={compressed}"
             )
             # _LOGGER.debug(log_line)
-            
+
             # === Senden
+            if self._queue is not None:
+                return await self._queue.async_put(
+                    final_bytes,
+                    traffic_class or traffic_class_for(ddata),
+                    key=(ipdst, ddata[0]) if ddata else None,
+                )
+
             _LOGGER.debug(
                 f"[IP] Writing {len(final_bytes)} bytes to connection "
                 f"(compressed hex: {final_bytes[:32].hex() if len(final_bytes) >= 32 else final_bytes.hex()})"
             )
             self._writer.write(final_bytes)
             await self._writer.drain()
+            # With a queue the outbound writer counts the frame when it is written
+            if self._metrics is not None and ddata:
+                self._metrics.on_tx(ddata[0])
             _LOGGER.debug(f"[IP] Data sent successfully ({len(final_bytes)} bytes)")
+            return True
 
         except Exception as e:
             _LOGGER.error(f"[IP] Error sending data (raw): {e}", exc_info=True)
+            return False
     
     
 class Net4HomeApi:
@@ -309,9 +346,16 @@ class Net4HomeApi:
         objadr: int = DEFAULT_OBJADR,
         entry_id: Optional[str] = None,
         entry=None,
+        dedup_window: float = DEFAULT_DEDUP_WINDOW,
+        keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL,
+        standby_host: str = "",
+        standby_port: int = N4H_IP_PORT,
+        transport: Optional[Net4HomeTransport] = None,
     ):
         """Initialize the net4home API."""
         self._hass = hass
+        # TCP to the connector; in-memory or file transports for benchmarks and replay
+        self._transport = transport or Net4HomeTcpTransport()
         self._entry_id = entry_id
         self._host = host
         self._port = port
@@ -320,9 +364,15 @@ class Net4HomeApi:
         self._objadr = objadr
         self._reader = None
         self._writer = None
-        self._packet_receiver = N4HPacketReceiver()
+        # Traffic counters, always on
+        self.metrics = Net4HomeMetrics(self)
+        self._packet_receiver = N4HPacketReceiver(on_decode_error=self.metrics.on_decode_error)
         self._packet_sender: Optional[N4HPacketSender] = None
         self.devices: dict[str, Net4HomeDevice] = {}
+        self._devices_by_type: dict[str, dict[str, Net4HomeDevice]] = {}
+        # Platforms forwarded for this entry (only those with devices)
+        self.loaded_platforms: set[str] = set()
+        self._platform_lock = asyncio.Lock()
         self._reconnect_enabled = True      
         self._entry = entry
         
@@ -344,74 +394,176 @@ class Net4HomeApi:
         # Listener task management
         self._listen_task: Optional[asyncio.Task] = None
 
+        # Duration of the startup phases in seconds (shown in diagnostics)
+        self.startup_timings: dict[str, float] = {}
+
+        # Live state of all bus objects, indexed by objadr
+        self.state_store = Net4HomeStateStore()
+        self.passive_tracker = Net4HomePassiveTracker(self)
+        self.group_index = Net4HomeGroupIndex(hass, entry_id)
+        self.address_filter = Net4HomeAddressFilter(self.group_index)
+        self.address_filter.rebuild((), (mi, objadr))
+        self.confirmations = Net4HomeConfirmationTracker(self)
+        self.poller = Net4HomePollScheduler(self)
+        self.resync = Net4HomeBulkResync(self)
+        self.coalescer = Net4HomeCommandCoalescer(self)
+        self.duplicate_filter = Net4HomeDuplicateFilter(dedup_window, (mi, objadr))
+        # All frames after the login go through this queue (kept across reconnects)
+        self.outbound = Net4HomeOutboundQueue(metrics=self.metrics)
+        self.connection = Net4HomeConnection()
+        self.connection.add_listener(self._on_connection_state)
+        self._packet_receiver.on_password_ack = lambda: self.connection.confirmed("password ack")
+        self.reconnect_supervisor = Net4HomeReconnectSupervisor(self)
+        self.keepalive = Net4HomeKeepalive(self, keepalive_interval)
+        # Optional second connector on the same bus, takes over on failure
+        self.standby: Optional[Net4HomeStandbyLink] = (
+            Net4HomeStandbyLink(
+                self, standby_host, standby_port, N4HPacketReceiver(on_decode_error=self.metrics.on_decode_error)
+            )
+            if standby_host else None
+        )
+        # Raw traffic capture (services start_capture/stop_capture)
+        self.capture: Optional[Net4HomeCapture] = None
+        # Stops the running capture after its duration
+        self._capture_stop_timer: Optional[asyncio.TimerHandle] = None
+
+        # Last decoded state per device (persisted across restarts)
+        self.last_states: dict[str, object] = {}
+        self._snapshot: Optional[Net4HomeStateSnapshot] = (
+            Net4HomeStateSnapshot(hass, entry_id) if entry_id else None
+        )
+        self._resync_task: Optional[asyncio.Task] = None
+
     async def async_connect(self):
         """Connect to the net4home bus connector."""
         await self._async_connect_ip()
 
     async def _async_connect_ip(self):
         """Connect via IP/TCP."""
-        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
-        _LOGGER.info(f"Connect with net4home Bus connector at {self._host}:{self._port}")
-        
+        self.connection.connecting()
+        # Data left from the previous connection would misalign the new stream
+        self._packet_receiver.reset()
+
+        self._reader, self._writer = await self._async_open_link(self._host, self._port)
+        _LOGGER.debug("Credentials to Bus connector sent. Waiting for approval...")
+
+        self.outbound.set_writer(self._writer)
+        self._packet_sender = N4HPacketSender(self._writer, self.outbound, self.connection, self.metrics)
+        # Ready after the password acknowledgement, see _on_connection_state
+        self.connection.authenticating()
+
+    async def _async_open_link(self, host: str, port: int):
+        """Open a TCP connection to a bus connector and send the credentials."""
+        reader, writer = await self._transport.async_open(host, port)
+        _LOGGER.info(f"Connect with net4home Bus connector at {host}:{port}")
+
         # "420000000008ac0f0000cd564c77400c000021203732363343423543464343333646323630364344423338443945363135394535401b0000080700000087000000c000000aac"
 
         packet_bytes = binascii.unhexlify(
             "420000000008ac0f0000cd564c77400c000021203732363343423543464343333646323630364344423338443945363135394535401b0000080700000087000000c000000aac"
         )
 
-        self._writer.write(packet_bytes)
-        await self._writer.drain()
-        _LOGGER.debug("Credentials to Bus connector sent. Waiting for approval...")
+        writer.write(packet_bytes)
+        await writer.drain()
+        # Everything after the login goes to the capture while one is running
+        return wrap_link(reader, writer, self)
 
-        self._packet_sender = N4HPacketSender(self._writer)
+    async def _async_failover(self) -> bool:
+        """Continue on the standby connection; the old primary becomes the standby."""
+        reader, writer, receiver, (host, port) = await self.standby.async_take_over(
+            self._host, self._port, self._packet_receiver
+        )
+        receiver.on_password_ack = lambda: self.connection.confirmed("password ack")
+        self._packet_receiver = receiver
+        self._reader, self._writer = reader, writer
+        self._host, self._port = host, port
+
+        self.outbound.set_writer(self._writer)
+        self._packet_sender = N4HPacketSender(self._writer, self.outbound, self.connection, self.metrics)
+        # The standby connection is logged in already
+        self.connection.authenticating()
+        self.connection.confirmed("standby takeover")
+        return True
+
+    async def async_set_standby(self, host: str, port: int = N4H_IP_PORT):
+        """Use another (or no) standby connector."""
+        if self.standby is not None:
+            await self.standby.async_stop()
+            self.standby = None
+        if host:
+            self.standby = Net4HomeStandbyLink(
+                self, host, port, N4HPacketReceiver(on_decode_error=self.metrics.on_decode_error)
+            )
+            self.standby.start()
 
-    async def async_reconnect(self, max_attempts: int = 5, base_delay: float = 5.0) -> None:
-        """Attempt to reconnect to the bus connector."""
-        _LOGGER.debug(f"[IP] Starting reconnect process (max {max_attempts} attempts)")
-        
-        for attempt in range(1, max_attempts + 1):
-            delay = base_delay * attempt
-            _LOGGER.warning(f"[IP] Try to reconnect - attempt {attempt}/{max_attempts} in {delay:.1f}s...")
+    async def async_start_capture(self, path, max_bytes: int, max_files: int, duration: Optional[float] = None):
+        """Capture the raw traffic of the connector links to path (replaces a running capture).
 
-            await asyncio.sleep(delay)
+        With a duration (seconds) the capture stops by itself.
+        """
+        await self.async_stop_capture()
+        capture = Net4HomeCapture(path, max_bytes, max_files)
+        await capture.async_start()
+        self.capture = capture
+        if duration:
+            self._capture_stop_timer = asyncio.get_running_loop().call_later(
+                duration, lambda: asyncio.create_task(self.async_stop_capture())
+            )
+
+    async def async_stop_capture(self):
+        """Stop a running capture and close its file."""
+        if self._capture_stop_timer is not None:
+            self._capture_stop_timer.cancel()
+            self._capture_stop_timer = None
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            await capture.async_stop()
+
+    def abort_connection(self, reason: str):
+        """Abort the TCP connection; the listener notices it and reconnects."""
+        _LOGGER.warning(f"[IP] Aborting connection: {reason}")
+        transport = getattr(self._writer, "transport", None) if self._writer else None
+        if transport is not None:
+            transport.abort()
+
+    def _on_connection_state(self, old: str, new: str):
+        """Open the outbound queue when the session is usable, hold frames otherwise."""
+        if new in SENDABLE_STATES:
+            # Frames held during an outage are sent first
+            self.outbound.mark_connected()
+        else:
+            self.outbound.mark_disconnected()
 
+    async def async_reconnect(self) -> None:
+        """Reconnect to the bus connector, retrying until it is reachable again."""
+        # Commands sent while reconnecting are held and replayed afterwards
+        self.connection.connecting()
+        await self.reconnect_supervisor.async_run()
+
+        # Runs in the background, the listener has to read the answers
+        self.resync.async_start()
+
+    async def async_reopen(self) -> bool:
+        """Close the current connection and open a new one; return True if it is open."""
+        if self._writer:
+            _LOGGER.debug(f"[IP] Closing existing connection before reconnect")
             try:
-                # Close existing connection if any
-                if self._writer:
-                    _LOGGER.debug(f"[IP] Closing existing connection before reconnect")
-                    try:
-                        if hasattr(self._writer, 'is_closing') and not self._writer.is_closing():
-                            self._writer.close()
-                            if hasattr(self._writer, 'wait_closed'):
-                                await self._writer.wait_closed()
-                            _LOGGER.debug(f"[IP] Existing connection closed")
-                    except Exception as e:
-                        _LOGGER.warning(f"[IP] Error closing existing connection: {e}")
-                
-                _LOGGER.debug(f"[IP] Attempting to establish new connection (attempt {attempt})")
-                await self.async_connect()
-                
-                # Check connection status
-                is_connected = self._writer is not None and not self._writer.is_closing()
-                _LOGGER.debug(f"[IP] Connection check: writer={self._writer is not None}, is_closing={self._writer.is_closing() if self._writer else 'N/A'}")
-                
-                if is_connected:
-                    _LOGGER.info(f"[IP] Reconnect successful on attempt {attempt}")
-
-                    _LOGGER.debug(f"[IP] Requesting status for {len(self.devices)} devices")
-                    for device in self.devices.values():
-                        if device.device_type == "switch":
-                            await self.async_request_status(device.device_id)
-                        if device.device_type == "light":
-                            await self.async_request_status(device.device_id)
-                    _LOGGER.debug(f"[IP] Status requests completed")
-                    return
-                else:
-                    _LOGGER.warning(f"[IP] Connection established but status check failed")
+                if hasattr(self._writer, 'is_closing') and not self._writer.is_closing():
+                    self._writer.close()
+                    if hasattr(self._writer, 'wait_closed'):
+                        await asyncio.wait_for(self._writer.wait_closed(), timeout=2.0)
+                    _LOGGER.debug(f"[IP] Existing connection closed")
             except Exception as e:
-                _LOGGER.error(f"[IP] Reconnect failed (Try {attempt}): {e}", exc_info=True)
+                _LOGGER.warning(f"[IP] Error closing existing connection: {e}")
+
+        if self.standby is not None and self.standby.is_up:
+            return await self._async_failover()
 
-        _LOGGER.error(f"[IP] Maximale Reconnect-Versuche erreicht. Keine Verbindung zum Bus möglich.")
+        await self.async_connect()
+
+        is_connected = self._writer is not None and not self._writer.is_closing()
+        _LOGGER.debug(f"[IP] Connection check: writer={self._writer is not None}, is_closing={self._writer.is_closing() if self._writer else 'N/A'}")
+        return is_connected
 
 
     async def async_disconnect(self):
@@ -421,6 +573,7 @@ class Net4HomeApi:
         # Stop reconnect to prevent reconnection attempts
         self._reconnect_enabled = False
         _LOGGER.debug("[IP] Reconnect disabled")
+        self.connection.closed()
         
         # Cancel ENUM_ALL timeout if active
         if self._enum_timeout_task:
@@ -432,6 +585,12 @@ class Net4HomeApi:
                 pass
             self._enum_timeout_task = None
         self._enum_state = 0
+
+        # Drop scheduled confirming status requests and pending command confirmations
+        self.passive_tracker.cancel()
+        self.confirmations.cancel()
+        self.coalescer.cancel()
+        await self.outbound.async_stop()
         
         # Cancel and wait for listener task to finish
         if self._listen_task and not self._listen_task.done():
@@ -511,6 +670,7 @@ class Net4HomeApi:
                             break
                     else:
                         no_data_count = 0  # Reset counter on successful read
+                        self.keepalive.on_data()
                         packet_count += 1
                         _LOGGER.info(
                             f"[IP] Received {len(data)} bytes "
@@ -519,1214 +679,23 @@ class Net4HomeApi:
                         
                         # Process the received data
                         packets = self._packet_receiver.receive_raw_command(data)
+                        if packets and self.connection.state == STATE_AUTHENTICATING:
+                            # Connector forwards bus traffic, the login was accepted
+                            self.connection.confirmed("bus traffic")
                         _LOGGER.debug(
                             f"[IP] Packet receiver processed data: "
                             f"{len(packets)} packets extracted from {len(data)} bytes"
                         )
                         
+                        metrics = self.metrics
                         for ptype, payload in packets:
-                            try:
-                                ret, paket = n4h_parse(payload)
-                            except Exception as e:
-                                _LOGGER.error(f"[IP] Parsing error: {e}", exc_info=True)
-                                continue
-
-                            if paket is None:
-                                _LOGGER.warning(
-                                    f"[IP] Unable to parse a legit bus packet - {ret} - "
-                                    f"{payload[:32].hex() if len(payload) >= 32 else payload.hex()}"
-                                )
-                                continue
-
-                            if paket.ddatalen != 0:
-                                # Identify the action what we have to do
-                                b0 = paket.ddata[0]
-                                
-                                # Discovered a module, maybe we know it (enum all or enum for a single module)
-                                if b0 == D0_ACK_TYP:
-                                    # Reset ENUM_ALL timeout if enumeration is active
-                                    if self._enum_state > 0 and self._enum_timeout_task:
-                                        self._enum_timeout_task.cancel()
-                                        self._enum_timeout_task = asyncio.create_task(
-                                            self._wait_for_timeout()
-                                        )
-                                        _LOGGER.debug(f"[ENUM_ALL] Timer reset due to D0_ACK_TYP (round {self._enum_state})")
-                                    
-                                    #  b0 -> D0_ACK_TYP
-                                    #  b1 -> Modultyp
-                                    #  b2 -> ns 
-                                    #  b3 -> na (number of channels)
-                                    #  b4 ->
-                                    #  b5 -> IPK Version (lo)
-                                    #  b6 ->
-                                    #  b7 -> Version (hi)
-                                    #  b8 -> Version (lo)
-                                    #  b9 -> IPK Version (hi)
-                                    # b10 ->  Config Status 
-
-                                    b10 = paket.ddata[10] 
-                                    
-                                    device_id = f"MI{paket.ipsrc:04X}"
-                                    objadr = None 
-                                    model = platine_typ_to_name_a(paket.ddata[1])
-                                    sw_version = ""
-                                    name = device_id
-                                    device_type="module"
-                                
-                                    major = paket.ddata[9]
-                                    subsystem = paket.ddata[5]
-                                    minor_raw1 = paket.ddata[7]
-                                    minor_raw = paket.ddata[8]
-                                    sw_version = f"{major}.{'%02d' % subsystem}/{minor_raw1}.{minor_raw:02d}"                            
-                                    
-                                    if b10 & D10_CONFIG_ENABLE_BIT:
-                                        mode = "config"
-                                    elif b10 & D10_FCONFIG_ENABLE_BIT:    
-                                        mode = "factory"
-                                    else:    
-                                        mode = "normal"
-                                    
-                                    # UP-TLH is a module with entities
-                                    if model == "UP-TLH":
-                                        device_type="climate"
-                                        # IMPORTANT: objadr will be set later from the 0xF1 packet (D0_RD_MODULSPEC_DATA_ACK)
-                                        # Initially set to None so sensors are not created with wrong objadr
-                                        objadr=None
-                                    
-                                    # UP-RF is an RF-Key reader module
-                                    elif model in ("UP-RF", "UP-RF-S4AR1"):
-                                        device_type="rf_reader"
-                                        objadr=paket.objsrc
-                                    
-                                    # HS-Safety is an alarm control panel module
-                                    elif model == "HS-Safety":
-                                        device_type="alarm_control_panel"
-                                        objadr=paket.objsrc
-                                    
-                                    # HS-Time is a time control module with sunrise/sunset sensors
-                                    elif model == "HS-Time":
-                                        device_type="sensor"  # Treated as sensor module
-                                        # objadr will be set later from the 0xFF packet (D0_RD_MODULSPEC_DATA_ACK)
-                                        objadr=None
-                                        
-                                    # _LOGGER.debug(f"ACK_TYP received for device: {device_id} ({device_type}) ({model}) ({objadr}) ({sw_version})")
-
-                                    # Extract module type information from D0_ACK_TYP before registration
-                                    module_type = None
-                                    ns = None
-                                    na = None
-                                    nm = None
-                                    ng = None
-                                    
-                                    # Check if we can access index 9 (IPK version) for 16-bit nm calculation
-                                    svwIPK = 0
-                                    if len(paket.ddata) > 9:
-                                        svwIPK = paket.ddata[9]  # IPK version (hi)
-                                    
-                                    if len(paket.ddata) > 1:
-                                        module_type = paket.ddata[1]  # Module type
-                                    if len(paket.ddata) > 2:
-                                        ns = paket.ddata[2]  # Number of sensors
-                                    if len(paket.ddata) > 3:
-                                        na = paket.ddata[3]  # Number of actuators
-                                    if len(paket.ddata) > 12:
-                                        ng = paket.ddata[12]  # Group table length
-                                    if len(paket.ddata) > 13:
-                                        nm = paket.ddata[13]  # ModuleSpec table length
-                                        # Consider 16-bit flag for ModulSpec (from NET3)
-                                        if svwIPK >= 3:  # from NET3
-                                            if len(paket.ddata) > 11 and (paket.ddata[11] & 0x01):  # D11_ACK_TYP_MS16BIT
-                                                nm = nm * 4
-                                    
-                                    try:
-                                        await register_device_in_registry(
-                                            hass=self._hass,
-                                            entry=self._entry,
-                                            device_id=device_id,
-                                            name=name,
-                                            model=model,
-                                            sw_version=sw_version,
-                                            hw_version="",
-                                            device_type=device_type, 
-                                            via_device="",
-                                            api=self,
-                                            objadr=objadr,
-                                            module_type=module_type,
-                                            ns=ns,
-                                            na=na,
-                                            nm=nm,
-                                            ng=ng,
-                                        )
-                                        
-                                        # Module type information is already stored during registration
-                                        # Just verify it was set correctly and log
-                                        device = self.devices.get(device_id)
-                                        if device:
-                                            # Update if not already set (shouldn't happen, but safety check)
-                                            if device.module_type is None and module_type is not None:
-                                                device.module_type = module_type
-                                            if device.ns is None and ns is not None:
-                                                device.ns = ns
-                                            if device.na is None and na is not None:
-                                                device.na = na
-                                            if device.nm is None and nm is not None:
-                                                device.nm = nm
-                                            if device.ng is None and ng is not None:
-                                                device.ng = ng
-                                            
-                                            if len(paket.ddata) < 14:
-                                                _LOGGER.debug(
-                                                    f"D0_ACK_TYP packet shorter than expected for {device_id}: "
-                                                    f"{len(paket.ddata)} bytes (expected 14+), using defaults for missing fields"
-                                                )
-                                            
-                                            _LOGGER.debug(
-                                                f"Stored module info for {device_id}: "
-                                                f"type={device.module_type}, ns={device.ns}, na={device.na}, "
-                                                f"ng={device.ng}, nm={device.nm}, packet_len={len(paket.ddata)}"
-                                            )
-                                        
-                                        # Request sensor data for UP-RF devices to discover sensor object addresses
-                                        # (These requests are fast and can be done immediately)
-                                        if device_type == "rf_reader":
-                                            # Request sensor data for channels 0 and 1 (command 1 and command 2)
-                                            await self.async_request_sensor_data(device_id, channel=0)
-                                            await self.async_request_sensor_data(device_id, channel=1)
-                                        
-                                        # Add device to detail queue (for further detail queries)
-                                        await self.async_queue_device_for_details(device_id)
-                                            
-                                    except Exception as e:
-                                        _LOGGER.error(f"Error during registration of device (module) {device_id}: {e}")
-
-                                elif b0 == D0_ACTOR_ACK:
-                                    # For UP-TLH/UP-T: D0_ACTOR_ACK comes from OBJ addresses (objadr, objadr+1, objadr+2)
-                                    # But sensors are created on the MI device, so we need to find the MI device
-                                    device_id = f"MI{paket.ipsrc:04X}"
-                                    device = self.get_known_device(device_id)
-
-                                    if not device:
-                                        # Fallback: Versuche OBJ-Device
-                                        device_id = f"OBJ{paket.objsrc:05d}"
-                                        device = self.get_known_device(device_id)
-                                        if not device:
-                                            # Unknown MI device: Try to discover it by sending ENUM command
-                                            # This can happen if a module sends D0_ACTOR_ACK before being discovered by ENUM_ALL
-                                            mi_address = paket.ipsrc
-                                            
-                                            # Rate limit: Only send ENUM once per MI address
-                                            if mi_address not in self._enum_sent_to:
-                                                self._enum_sent_to.add(mi_address)
-                                                _LOGGER.info(f"D0_ACTOR_ACK from unknown MI device {device_id}, sending ENUM to discover it")
-                                                try:
-                                                    # Send ENUM command to this specific module
-                                                    await self._packet_sender.send_raw_command(
-                                                        ipdst=mi_address,
-                                                        ddata=bytes([D0_ENUM_ALL]),
-                                                        objsource=0,
-                                                        mi=self._mi,
-                                                        type8=SEND_AS_IP,
-                                                    )
-                                                    _LOGGER.debug(f"Sent ENUM command to {device_id} (MI address 0x{mi_address:04X})")
-                                                except Exception as e:
-                                                    _LOGGER.error(f"Error sending ENUM to {device_id}: {e}")
-                                                    # Remove from set on error so we can retry later
-                                                    self._enum_sent_to.discard(mi_address)
-                                            else:
-                                                _LOGGER.debug(f"D0_ACTOR_ACK from unknown MI device {device_id}, ENUM already sent, waiting for D0_ACK_TYP")
-                                            continue
-
-                                    # _LOGGER.debug(f"D0_ACTOR_ACK for *** {device_id}: {device.device_type} - obj {device.objadr} - {paket.objsrc}")
-
-                                    if device.device_type == 'climate':
-                                        # For UP-TLH/UP-T: Determine sensor type based on objadr relationship
-                                        # According to documentation: objadr + 0 = setpoint (targettemp), objadr + 1 = day value (presetday), objadr + 2 = night value (presetnight)
-                                        # paket.objsrc is the object address from which the packet comes
-                                        sensor_key = None
-                                        if device.objadr is not None:
-                                            if paket.objsrc == device.objadr:
-                                                sensor_key = "targettemp"
-                                            elif paket.objsrc == device.objadr + 1:
-                                                sensor_key = "presetday"
-                                            elif paket.objsrc == device.objadr + 2:
-                                                sensor_key = "presetnight"
-
-                                        if sensor_key:
-                                            # According to documentation: Setpoint_Temperature = (ddata[1] + ddata[2] * 256) / 10.0 (Little Endian)
-                                            # ddata[1] = Setpoint Low, ddata[2] = Setpoint High
-                                            # BUT: In practice the byte order seems to be swapped
-                                            # Test: 20°C = 200 = 0x00C8 (Little Endian: lo=0xC8, hi=0x00)
-                                            # But we see 5,120.0°C = 51,200 = 0xC800 (hi=0xC8, lo=0x00)
-                                            # This means: ddata[1] contains the High Byte, ddata[2] contains the Low Byte
-                                            # Correct calculation: (ddata[2] + ddata[1] * 256) / 10.0
-                                            if len(paket.ddata) >= 4:
-                                                # The bytes are actually swapped compared to the documentation
-                                                # ddata[1] = High Byte, ddata[2] = Low Byte
-                                                hi = paket.ddata[1]  # Actually High Byte
-                                                lo = paket.ddata[2]  # Actually Low Byte
-                                                # Calculation: (Low Byte + High Byte * 256) / 10.0
-                                                temp = (lo + hi * 256) / 10.0
-                                                
-                                                # ddata[3] contains status bits: Bit 0 = heating controller, Bit 1 = cooling controller
-                                                status_byte = paket.ddata[3]
-                                                heat_active = (status_byte & 0x01) != 0  # Bit 0
-                                                cool_active = (status_byte & 0x02) != 0  # Bit 1
-                                                
-                                                # Determine HVAC Mode based on status bits
-                                                if heat_active and cool_active:
-                                                    hvac_mode = "heat_cool"
-                                                elif heat_active:
-                                                    hvac_mode = "heat"
-                                                elif cool_active:
-                                                    hvac_mode = "cool"
-                                                else:
-                                                    hvac_mode = "off"
-                                                
-                                                _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {sensor_key} = {temp}°C, status=0x{status_byte:02X} (heat={heat_active}, cool={cool_active}, mode={hvac_mode})")
-                                                
-                                                # Send updates to the MI device (where sensors were created)
-                                                update_data = {
-                                                    sensor_key: temp,
-                                                    "hvac_mode": hvac_mode,
-                                                    "heat_active": heat_active,
-                                                    "cool_active": cool_active
-                                                }
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id}", update_data)
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id}_{sensor_key}", temp)
-                                            else:
-                                                _LOGGER.warning(f"D0_ACTOR_ACK packet too short for climate: {len(paket.ddata)} bytes, expected at least 4")
-                                        else:
-                                            _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: No matching sensor type (objadr={device.objadr}, paket.objsrc={paket.objsrc})")
-
-                                    else:
-                                        # Check if packet has enough data (need at least 3 bytes)
-                                        if len(paket.ddata) < 3:
-                                            _LOGGER.warning(f"D0_ACTOR_ACK packet too short: {len(paket.ddata)} bytes, expected at least 3")
-                                            continue
-                                        
-                                        if device.device_type == 'switch':
-                                            is_on = paket.ddata[2] == 1
-                                            _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {'ON' if is_on else 'OFF'}")
-                                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}", is_on)
-                                            
-                                        elif device.device_type == 'timer':
-                                            is_on = paket.ddata[2] == 1
-                                            _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {'ON' if is_on else 'OFF'}")
-                                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}", is_on)
-                                            
-                                        elif device.device_type == 'cover':
-                                            is_closed = paket.ddata[2] != 1 
-                                            _LOGGER.debug(f"D0_ACTOR_ACK für {device_id}: {'CLOSED' if is_closed else 'OPEN'}")
-                                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}", is_closed)
-
-                                        elif device.device_type == 'light':
-                                            is_on = paket.ddata[2] >> 7
-                                            brightness_value = round((paket.ddata[2] & 0x7F) * 255 / 100)
-                                            _LOGGER.debug(f"STATUS_INFO_ACK for {device_id}: {'ON' if is_on else 'OFF'} {round((paket.ddata[2] & 0x7F))}%")
-                                            async_dispatcher_send(self._hass,f"net4home_update_{device_id}",{"is_on": is_on, "brightness": brightness_value},)
-
-                                        elif device.device_type == 'binary_sensor':
-                                            is_closed = paket.ddata[2] != 1 
-                                            _LOGGER.debug(f"STATUS_INFO_ACK for {device_id}: {'CLOSED' if is_closed else 'OPEN'}")
-                                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}", is_closed)
-                                            
-                                        else:
-                                            # Only log warning for unhandled device types
-                                            _LOGGER.warning(f"Unhandled device type in D0_ACTOR_ACK: {device.device_type} ({device.model}) for {device_id}")
-
-                                elif b0 == D0_RD_ACTOR_DATA_ACK:
-                                    _LOGGER.debug(f"D0_RD_ACTOR_DATA_ACK identified Type: {paket.ddata[2]}")
-                                    
-                                    b1  = paket.ddata[1] + 1 # channel
-                                    b2  = paket.ddata[2]     # actor type
-                                    b8  = paket.ddata[8]     # OBJ hi
-                                    b9  = paket.ddata[9]     # OBJ lo
-                                    
-
-                                    device_id = f"OBJ{(b8*256+b9):05d}"
-                                    objadr = (b8 << 8) + b9
-                                    via_device = f"MI{paket.ipsrc:04X}"
-                                    is_dimmer = False
-                                    is_jal = False
-
-                                    device_obj = self.devices.get(via_device)
-                                    
-                                    # Wenn das MI-Device nicht existiert, erstelle es automatisch
-                                    # (kann passieren, wenn die Abfrage von einem externen Programm kommt)
-                                    if not device_obj:
-                                        _LOGGER.warning(
-                                            f"MI device {via_device} not found when registering OBJ device {device_id}. "
-                                            f"Creating MI device automatically."
-                                        )
-                                        # Erstelle ein minimales MI-Device
-                                        await register_device_in_registry(
-                                            hass=self._hass,
-                                            entry=self._entry,
-                                            device_id=via_device,
-                                            name=via_device,
-                                            model="Unknown",
-                                            sw_version="",
-                                            hw_version="",
-                                            device_type="module",
-                                            via_device="",
-                                            api=self,
-                                            objadr=None,
-                                        )
-                                        device_obj = self.devices.get(via_device)
-                                        if device_obj:
-                                            _LOGGER.info(f"Created MI device {via_device} for OBJ device {device_id}")
-                                        else:
-                                            _LOGGER.error(f"Failed to create MI device {via_device}")
-                                            continue
-                                    
-                                    # Check module type for dimmer detection
-                                    if device_obj and device_obj.model in ('HS-AD1-1x10V', 'HS-AD3e', 'HS-AD3'):
-                                        is_dimmer = True
-                                        _LOGGER.debug(f"Dimmer module detected: {device_obj.model} for {device_id}, b2={b2}")
-                                        
-                                    if device_obj and device_obj.model in ('HS-AJ3', 'HS-AJ1', 'HS-AJ4-500', 'HS-AJ3-6'):
-                                        is_jal = True
-                                    
-                                    # Also check if the via_device already has dimmer devices (then it is a dimmer module)
-                                    if via_device in self.devices:
-                                        via_device_obj = self.devices[via_device]
-                                        # Check if there are already dimmer channels
-                                        for existing_device in self.devices.values():
-                                            if existing_device.via_device == via_device and existing_device.device_type == "light":
-                                                is_dimmer = True
-                                                _LOGGER.debug(f"Dimmer module detected through existing Light entities for {device_id}, b2={b2}")
-                                                break
-                                    
-                                    # Timer entries have priority and are detected regardless of module type
-                                    # IMPORTANT: Timer check must occur BEFORE dimmer check
-                                    # Timer is also detected on dimmer modules if b2 == OUT_HW_NR_IS_TIMER
-                                    if b2 == OUT_HW_NR_IS_TIMER:
-                                        _LOGGER.info(f"OUT_HW_NR_IS_TIMER identified: {device_id} (module: {device_obj.model if device_obj else 'unknown'}, is_dimmer={is_dimmer}, b2={b2})")
-
-                                        # Module details
-                                        b3  = paket.ddata[3]     # time1 hi
-                                        b4  = paket.ddata[4]     # time1 lo
-                                        b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
-                                        b6  = paket.ddata[6]     # min
-                                        b7  = paket.ddata[7]     # Status update
-                                        b10 = paket.ddata[10]     # time2 hi
-                                        b11 = paket.ddata[11]    # time2 lo
-                                        b12 = paket.ddata[12]    # inverted
-                                        t1  = b3*256+b4 # time1
-
-                                        try:
-                                            await register_device_in_registry(
-                                                hass=self._hass,
-                                                entry=self._entry,
-                                                device_id=device_id,
-                                                name = f"CH{b1}_{device_id[3:]}",
-                                                model="Timer",
-                                                sw_version="",
-                                                hw_version="",
-                                                device_type="switch",
-                                                via_device=via_device,
-                                                api=self,
-                                                objadr=objadr,
-                                                send_state_changes = bool(b7),
-                                            )
-                                            # Store powerup status and timer time1 in device (also for already existing devices)
-                                            if device_id in self.devices:
-                                                self.devices[device_id].powerup_status = b5
-                                                self.devices[device_id].timer_time1 = t1
-                                                _LOGGER.debug(f"Powerup status for {device_id} stored: {b5}, Timer time1: {t1}s")
-                                                # Sende Signal zur Aktualisierung der Diagnose-Sensoren
-                                                async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
-                                            else:
-                                                _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
-                                            _LOGGER.debug(f"OUT_HW_NR_IS_TIMER identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5}")
-                                        except Exception as e:
-                                            _LOGGER.error(f"Error during registration of TIMER device (channel) {device_id}: {e}")
-                                    
-                                    # Wenn OUT_HW_NR_IS_ONOFF und is_dimmer, dann als Dimmer behandeln
-                                    elif b2 == OUT_HW_NR_IS_ONOFF and is_dimmer:
-                                        _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF identified as DIMMER: {device_id}")
-                                        
-                                        # Module details
-                                        b3  = paket.ddata[3]     # time1 hi
-                                        b4  = paket.ddata[4]     # time1 lo
-                                        b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
-                                        b6  = paket.ddata[6]     # min
-                                        b7  = paket.ddata[7]     # Status update
-                                        b10 = paket.ddata[10]    # time2 hi
-                                        b11 = paket.ddata[11]    # time2 lo
-                                        b12 = paket.ddata[12]    # inverted
-                                        t1  = b3*256+b4 # time1
-
-                                        try:
-                                            await register_device_in_registry(
-                                                hass=self._hass,
-                                                entry=self._entry,
-                                                device_id=device_id,
-                                                name = f"CH{b1}_{device_id[3:]}",
-                                                model="Licht",
-                                                sw_version="",
-                                                hw_version="",
-                                                device_type="light",
-                                                via_device=via_device,
-                                                api=self,
-                                                objadr=objadr,
-                                                send_state_changes = bool(b7),
-                                            )
-                                            # Store powerup status and MinHell in device (also for already existing devices)
-                                            if device_id in self.devices:
-                                                self.devices[device_id].powerup_status = b5
-                                                self.devices[device_id].min_hell = b6
-                                                _LOGGER.debug(f"Powerup status for {device_id} saved: {b5}, MinHell: {b6}%")
-                                                # Sende Signal zur Aktualisierung der Diagnose-Sensoren
-                                                async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
-                                            else:
-                                                _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
-                                            _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF (as DIMMER) identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5} - MinHell: {b6}%")
-                                        except Exception as e:
-                                            _LOGGER.error(f"Error during registration of DIMMER device (channel) {device_id}: {e}", exc_info=True)
-
-                                    # We have a classic switch with ON/OFF feature
-                                    # IMPORTANT: Only for real ON/OFF actors, NOT for dimmers (they have OUT_HW_NR_IS_DIMMER)
-                                    elif b2 == OUT_HW_NR_IS_ONOFF and not is_dimmer:
-                                        _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF identified: {device_id}")
-
-                                        # Module details
-                                        b3  = paket.ddata[3]     # time1 hi
-                                        b4  = paket.ddata[4]     # time1 lo
-                                        b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
-                                        b6  = paket.ddata[6]     # min
-                                        b7  = paket.ddata[7]     # Status update
-                                        b10 = paket.ddata[8]     # time2 hi
-                                        b11 = paket.ddata[9]     # time2 lo
-                                        b12 = paket.ddata[10]    # inverted
-                                        t1  = b3*256+b4 # time1
-                                        
-                                        model="Schalter"
-                                        device_type="switch"
-                                        
-                                        try:
-                                            _LOGGER.debug(
-                                                f"Registering OBJ device {device_id} with via_device={via_device}, "
-                                                f"parent_exists={via_device in self.devices}"
-                                            )
-                                            await register_device_in_registry(
-                                                hass=self._hass,
-                                                entry=self._entry,
-                                                device_id=device_id,
-                                                name = f"CH{b1}_{device_id[3:]}",
-                                                model=model,
-                                                sw_version="",
-                                                hw_version="",
-                                                device_type=device_type,
-                                                via_device=via_device,
-                                                api=self,
-                                                objadr=objadr,
-                                                send_state_changes = bool(b7),
-                                            )
-                                            # Store powerup status in device (also for already existing devices)
-                                            if device_id in self.devices:
-                                                self.devices[device_id].powerup_status = b5
-                                                _LOGGER.debug(f"Powerup status for {device_id} stored: {b5}")
-                                                # Sende Signal zur Aktualisierung der Diagnose-Sensoren
-                                                async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
-                                            else:
-                                                _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
-                                            _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5}")
-                                        except Exception as e:
-                                            _LOGGER.error(f"Error during registration of ONOFF device (channel) {device_id}: {e}", exc_info=True)
-
-                                    # We have a dimmer
-                                    elif b2 == OUT_HW_NR_IS_DIMMER:
-                                        _LOGGER.debug(f"OUT_HW_NR_IS_DIMMER identified: {device_id}")
-
-                                        # Module details
-                                        b3  = paket.ddata[3]     # time1 hi
-                                        b4  = paket.ddata[4]     # time1 lo
-                                        b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
-                                        b6  = paket.ddata[6]     # min
-                                        b7  = paket.ddata[7]     # Status update
-                                        b10 = paket.ddata[10]    # time2 hi
-                                        b11 = paket.ddata[11]    # time2 lo
-                                        b12 = paket.ddata[12]    # inverted
-                                        t1  = b3*256+b4 # time1
-
-                                        try:
-                                            await register_device_in_registry(
-                                                hass=self._hass,
-                                                entry=self._entry,
-                                                device_id=device_id,
-                                                name = f"CH{b1}_{device_id[3:]}",
-                                                model="Licht",
-                                                sw_version="",
-                                                hw_version="",
-                                                device_type="light",
-                                                via_device=via_device,
-                                                api=self,
-                                                objadr=objadr,
-                                                send_state_changes = bool(b7),
-                                            )
-                                            # Store powerup status and MinHell in device (also for already existing devices)
-                                            if device_id in self.devices:
-                                                self.devices[device_id].powerup_status = b5
-                                                self.devices[device_id].min_hell = b6
-                                                _LOGGER.debug(f"Powerup status for {device_id} saved: {b5}, MinHell: {b6}%")
-                                                # Sende Signal zur Aktualisierung der Diagnose-Sensoren
-                                                async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
-                                            else:
-                                                _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
-                                            _LOGGER.debug(f"OUT_HW_NR_IS_DIMMER identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5} - MinHell: {b6}%")
-                                        except Exception as e:
-                                            _LOGGER.error(f"Error during registration of DIMMER device (channel) {device_id}: {e}", exc_info=True)
-
-                                    # We have a cover 
-                                    elif b2 == OUT_HW_NR_IS_JAL or is_jal:
-
-                                        _LOGGER.debug(f"OUT_HW_NR_IS_JAL Paket : {' '.join(f'{b:02X}' for b in paket.ddata)}")
-
-                                        # Module details
-                                        b3  = paket.ddata[3]     # time1 hi
-                                        b4  = paket.ddata[4]     # time1 lo
-                                        b7  = paket.ddata[7]     # Status update
-                                        t1  = b3*256+b4 # time1 (Run time for covers)
-                                        
-                                        _LOGGER.debug(f"OUT_HW_NR_IS_JAL identified: {device_id}")
-
-                                        try:
-                                            await register_device_in_registry(
-                                                hass=self._hass,
-                                                entry=self._entry,
-                                                device_id=device_id,
-                                                name = f"CH{b1}_{device_id[3:]}",
-                                                model="Jalousie",
-                                                sw_version="",
-                                                hw_version="",
-                                                device_type="cover",
-                                                via_device=via_device,
-                                                api=self,
-                                                objadr=objadr,
-                                                send_state_changes = bool(b7),
-                                            )
-                                            # Store run time (Timer1) in device (also for already existing devices)
-                                            if device_id in self.devices:
-                                                self.devices[device_id].timer_time1 = t1
-                                                _LOGGER.debug(f"Run time for {device_id} stored: {t1}s")
-                                                # Sende Signal zur Aktualisierung der Diagnose-Sensoren
-                                                async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
-                                            else:
-                                                _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store run time")
-                                            _LOGGER.debug(f"OUT_HW_NR_IS_JAL identified: {device_id} - CH{b1} - State change {bool(b7)} - Run time: {t1}s")
-                                        except Exception as e:
-                                            _LOGGER.error(f"Error during registration of COVER device (channel) {device_id}: {e}")
-
-                                elif b0 == D0_RD_SENSOR_DATA_ACK:
-
-                                    EE_IN_TAB_ADRFKT_LEN   = 5
-                                    EE_IN_TAB_ADR_OFFSET   = 0
-                                    EE_IN_TAB_FKT_OFFSET   = 2
-
-                                    EE_OFFSET_PIN_IS       = 0 + 2
-                                    EE_OFFSET_FKT1         = EE_OFFSET_PIN_IS + 1
-                                    EE_OFFSET_FKT2         = EE_OFFSET_FKT1   + EE_IN_TAB_ADRFKT_LEN
-                                    EE_OFFSET_ADR          = EE_OFFSET_FKT2   + EE_IN_TAB_ADRFKT_LEN
-                                    EE_OFFSET_MEM_STATE    = EE_OFFSET_ADR    + 2
-
-                                    EE_OFFSET_TIMER                 = EE_OFFSET_MEM_STATE + 1
-                                    EE_NCNO_INV                     = EE_OFFSET_TIMER     + 2
-                                    EE_OFFSET_FKT3                  = EE_NCNO_INV         + 1
-                                    EE_OFFSET_FKT4                  = EE_OFFSET_FKT3      + 5
-
-                                    # Check minimum required length (need at least EE_OFFSET_ADR+2 for objadr)
-                                    # EE_OFFSET_ADR = 13, so we need at least 15 bytes
-                                    min_required = EE_OFFSET_ADR + 2
-                                    if len(paket.ddata) < min_required:
-                                        _LOGGER.warning(f"D0_RD_SENSOR_DATA_ACK packet too short: {len(paket.ddata)} bytes, need at least {min_required} bytes")
-                                        continue
-                                    
-                                    pin_typ = paket.ddata[EE_OFFSET_PIN_IS]
-                                    #_LOGGER.debug(f"D0_RD_SENSOR_DATA_ACK identified: Typ: {pin_typ} - {' '.join(f'{b:02X}' for b in paket.ddata)}")
-
-                                    channel = paket.ddata[1] + 1
-                                    function_count, _ = get_function_and_address_count(pin_typ)
-
-                                    objadr = paket.ddata[EE_OFFSET_ADR]*256+paket.ddata[EE_OFFSET_ADR+1]
-                                    
-                                    # EE_NCNO_INV is optional - only available in longer packets (19+ bytes)
-                                    # For shorter packets (like UP-RF with 15 bytes), default to False
-                                    if len(paket.ddata) >= EE_NCNO_INV + 1:
-                                        detected_inverted = bool(paket.ddata[EE_NCNO_INV])
-                                    else:
-                                        detected_inverted = False
-                                    
-                                    #_LOGGER.debug(f"Erkannte objadr: {objadr} (Offset {EE_OFFSET_ADR})")
-
-                                    device_id = f"OBJ{objadr:05d}"
-                                    via_device = f"MI{paket.ipsrc:04X}"
-                                    device_obj = self.devices.get(via_device)
-                                    
-                                    # Wenn das MI-Device nicht existiert, erstelle es automatisch
-                                    # (kann passieren, wenn die Abfrage von einem externen Programm kommt)
-                                    if not device_obj:
-                                        _LOGGER.warning(
-                                            f"MI device {via_device} not found when registering OBJ device {device_id}. "
-                                            f"Creating MI device automatically."
-                                        )
-                                        # Erstelle ein minimales MI-Device
-                                        await register_device_in_registry(
-                                            hass=self._hass,
-                                            entry=self._entry,
-                                            device_id=via_device,
-                                            name=via_device,
-                                            model="Unknown",
-                                            sw_version="",
-                                            hw_version="",
-                                            device_type="module",
-                                            via_device="",
-                                            api=self,
-                                            objadr=None,
-                                        )
-                                        device_obj = self.devices.get(via_device)
-                                        if device_obj:
-                                            _LOGGER.info(f"Created MI device {via_device} for OBJ device {device_id}")
-                                        else:
-                                            _LOGGER.error(f"Failed to create MI device {via_device}")
-                                            continue
-
-                                    #_LOGGER.debug(f"D0_RD_SENSOR_DATA_ACK → model: {device_id}, objadr: {objadr}, via: {via_device}, model: {getattr(device_obj, 'model', 'UNKNOWN')}")
-
-                                    is_sensor = False
-                                    if device_obj and device_obj.model in ('UP-S4',):
-                                        is_sensor = True
-
-                                    if is_sensor:
-                                        try:
-                                            _LOGGER.debug(
-                                                f"Registering OBJ sensor device {device_id} with via_device={via_device}, "
-                                                f"parent_exists={via_device in self.devices}"
-                                            )
-                                            await register_device_in_registry(
-                                                hass=self._hass,
-                                                entry=self._entry,
-                                                device_id=device_id,
-                                                name=f"CH{channel}_{device_id[3:]}",
-                                                model="Sensor",
-                                                sw_version="",
-                                                hw_version="",
-                                                device_type="binary_sensor",
-                                                via_device=via_device,
-                                                api=self,
-                                                objadr=objadr,
-                                                inverted=detected_inverted,  
-                                            )
-                                            #_LOGGER.debug(f"SENSOR registration for  → model: {device_id}, objadr: {objadr}, via: {via_device}, model: {getattr(device_obj, 'model', 'UNKNOWN')}")
-                                        except Exception as e:
-                                            _LOGGER.error(f"Error during SENSOR registration for {device_id}: {e}", exc_info=True)
-                                    
-                                    # For UP-RF devices, we don't register OBJ addresses as separate devices
-                                    # The RF-Key sensor will be created directly on the MI device
-                                    if device_obj and device_obj.model in ('UP-RF', 'UP-RF-S4AR1'):
-                                        # Store OBJ address mapping for RF-Key message routing
-                                        # We'll map OBJ addresses to the parent MI device in D0_VALUE_ACK handler
-                                        _LOGGER.debug(f"UP-RF sensor object address detected: {device_id} (OBJ={objadr}) for {via_device}, channel: {channel}")
-
-                                elif b0 == D0_SENSOR_ACK:
-                                    # _LOGGER.debug(f"D0_SENSOR_ACK identified: Typ: {paket.ddata[1]} - {' '.join(f'{b:02X}' for b in paket.ddata)}")
-                                    device_id = f"OBJ{paket.objsrc:05d}"
-                                    device = self.devices.get(device_id)
-
-                                    if not device:
-                                        continue
-                                    
-                                    is_closed = paket.ddata[2] == 1
-
-                                    _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {is_closed}")
-                                    async_dispatcher_send(self._hass, f"net4home_update_{device_id}", is_closed)
-
-                                elif b0 == D0_RD_MODULSPEC_DATA_ACK:
-                                    _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK identified: Typ: {paket.ddata[1]} - {' '.join(f'{b:02X}' for b in paket.ddata)}")
-
-                                    b1  = paket.ddata[1] 
-                                    obj_heat = None
-                                    obj_cool = None
-                                    presetday = None
-                                    presetnight = None
-                                    
-                                    # Initialize b2 and b3 in case they are used later
-                                    b2 = None
-                                    b3 = None
-
-                                    device_id = f"MI{paket.ipsrc:04X}"
-                                    device = self.devices.get(device_id)
-                                    if not device:
-                                        _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK: Device {device_id} not found")
-                                        continue
-                                    
-                                    model = device.model or ""
-                                    objadr = device.objadr if device else None
-                                    
-                                    # Module-specific evaluation based on device.model
-                                    # See docs/modulspec.md for details
-                                    
-                                    # 1. UP-TLH / UP-T: Spezielle Indizes und Sensoren
-                                    if model in ('UP-TLH', 'UP-T'):
-                                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH")
-                                        # Special indices (0xF0, 0xF1) only for UP-TLH/UP-T
-                                        if b1 == 0xF0:  # Tag/Nachtwert (UP-TLH/UP-T)
-                                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> F0")
-                                            if len(paket.ddata) >= 6:
-                                                # Laut Dokumentation: Tagwert = (ddata[2] * 256 + ddata[3]) / 10.0
-                                                # ddata[2] = Tagwert High, ddata[3] = Tagwert Low
-                                                # Nachtwert = (ddata[4] * 256 + ddata[5]) / 10.0
-                                                # ddata[4] = Nachtwert High, ddata[5] = Nachtwert Low
-                                                presetday = (paket.ddata[2] * 256 + paket.ddata[3]) / 10.0
-                                                presetnight = (paket.ddata[4] * 256 + paket.ddata[5]) / 10.0
-                                                _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK 0xF0 for {device_id}: presetday={presetday}°C, presetnight={presetnight}°C")
-                                                # Send updates to climate device and individual sensors
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id}", {"presetday": presetday, "presetnight": presetnight})
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id}_presetday", presetday)
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id}_presetnight", presetnight)
-                                            else:
-                                                _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for 0xF0: {len(paket.ddata)} bytes")
-                                            continue
-                                        
-                                        if b1 == 0xF1:  # Heat/Cool Objektadressen (UP-TLH/UP-T)
-                                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> F1")
-                                            if len(paket.ddata) >= 10:
-                                                b2 = paket.ddata[2]
-                                                b3 = paket.ddata[3]
-                                                b6 = paket.ddata[6]  # heat (hi)
-                                                b7 = paket.ddata[7]  # heat (lo)
-                                                b8 = paket.ddata[8]  # cool (hi)
-                                                b9 = paket.ddata[9]  # cool (lo)
-                                                objadr = (b2 << 8) + b3
-                                                obj_heat = (b6 << 8) + b7
-                                                obj_cool = (b8 << 8) + b9
-                                                _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK 0xF1: objadr={objadr}, obj_heat={obj_heat}, obj_cool={obj_cool}")
-                                                # Store objadr in device object for later use when b1 < 0x80
-                                                device.objadr = objadr
-                                                
-                                                # Sende D0_REQ an die Basisadresse, um targettemp zu lesen
-                                                # Laut Dokumentation: D0_REQ, 0, 0 → Sollwert-Objektadresse (objadr + 0)
-                                                await self._packet_sender.send_raw_command(
-                                                    ipdst=objadr,
-                                                    ddata=bytes([D0_REQ, 0x00, 0x00]),
-                                                    objsource=self._objadr,
-                                                    mi=self._mi,
-                                                )
-                                                _LOGGER.debug(f"Sent D0_REQ for targettemp to {device_id} (OBJ={objadr}) after 0xF1")
-                                            else:
-                                                _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for 0xF1: {len(paket.ddata)} bytes")
-                                            continue
-                                        
-                                        # UP-TLH / UP-T: Sensors (b1 < 0x80: Index 0, 1, 2 for Temp, Lux, Humidity)
-                                        # IMPORTANT: objadr must come from the 0xF1 packet (stored in device.objadr)
-                                        if b1 < 0x80:
-                                            # Use objadr from device.objadr (was set at 0xF1)
-                                            if device.objadr is None:
-                                                _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK UP-TLH/UP-T b1={b1:02X}: objadr not yet set (0xF1 packet missing?)")
-                                                continue
-                                            
-                                            # Additional check: objadr must be > 0 and have a meaningful value
-                                            # (objadr should normally be > 1000, but we check at least > 0)
-                                            if device.objadr <= 0:
-                                                _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK UP-TLH/UP-T b1={b1:02X}: objadr={device.objadr} is invalid (0xF1 packet missing or wrong?)")
-                                                continue
-                                            
-                                            objadr = device.objadr
-                                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> 80   *********************************")
-                                            
-                                            sensor_obj = objadr
-
-                                            if b1 == 0:
-                                                sensor_obj = objadr + 3
-                                                sensor_type = "temperature"
-                                            elif b1 == 1: 
-                                                sensor_obj = objadr + 4
-                                                sensor_type = "illuminance"
-                                            elif b1 == 2: 
-                                                sensor_obj = objadr + 5
-                                                sensor_type = "humidity"
-                                            else:
-                                                continue
-                                                
-                                            device_id = f"OBJ{(sensor_obj):05d}"
-                                                
-                                            if sensor_type:
-                                                await register_device_in_registry(
-                                            hass=self._hass,
-                                            entry=self._entry,
-                                            device_id=device_id,
-                                            name=f"{sensor_type.capitalize()} Sensor {sensor_obj}",
-                                            model="Sensor",
-                                            sw_version="",
-                                            hw_version="",
-                                            device_type="sensor",
-                                            via_device=f"MI{paket.ipsrc:04X}",
-                                            api=self,
-                                            objadr=sensor_obj
-                                                )       
-                                                _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> Register Device   *********************************")
-                                                
-                                               
-                                                async_dispatcher_send(
-                                            self._hass,
-                                            f"net4home_new_device_{self._entry.entry_id}",
-                                            Net4HomeDevice(
-                                                device_id=device_id,
-                                                name=f"{sensor_type.capitalize()} Sensor {sensor_obj}",
-                                                model="Sensor",
-                                                device_type="sensor",
-                                                via_device=f"MI{paket.ipsrc:04X}",
-                                                objadr=sensor_obj,
-                                            )
-                                                )
-                                            continue
-                                    
-                                    # 1.5. HS-Time: Modul-Info (ddata[1] = $FF) - Basisadresse lesen
-                                    if model == "HS-Time" and b1 == 0xFF:
-                                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK HS-Time -> FF (Modul-Info)")
-                                if len(paket.ddata) >= 5:
-                                    # Laut Dokumentation: ddata[2] = Objektadresse High, ddata[3] = Objektadresse Low
-                                    objadr_high = paket.ddata[2]
-                                    objadr_low = paket.ddata[3]
-                                    objadr = (objadr_high << 8) + objadr_low
-                                    # ddata[4] = Broadcast-Index (0-7)
-                                    broadcast_index = paket.ddata[4]
-                                    _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK HS-Time 0xFF: objadr={objadr}, broadcast_index={broadcast_index}")
-                                    # Speichere objadr im device Objekt
-                                    device.objadr = objadr
-                                    
-                                    # Broadcast-Intervall-Mapping (laut korrigierter Dokumentation)
-                                    broadcast_intervals = {
-                                        0: "Nie",
-                                        1: "1 Minute",
-                                        2: "5 Minuten",
-                                        3: "15 Minuten",
-                                        4: "30 Minuten",
-                                        5: "60 Minuten",
-                                        6: "2 Stunden",
-                                        7: "4 Stunden",
-                                        8: "8 Stunden",
-                                        9: "12 Stunden",
-                                        10: "24 Stunden"
-                                    }
-                                    broadcast_interval_str = broadcast_intervals.get(broadcast_index, f"Unbekannt ({broadcast_index})")
-                                    
-                                    # Sende Broadcast-Intervall direkt an das MI-Device (wie bei UP-TLH)
-                                    # WICHTIG: sensor_key ist "broadcast interval" (mit Leerzeichen), aber Dispatcher-Key verwendet slugify
-                                    dispatcher_key_dict = f"net4home_update_{device_id}"
-                                    dispatcher_key_sensor = f"net4home_update_{device_id}_{slugify('broadcast interval')}"
-                                    async_dispatcher_send(self._hass, dispatcher_key_dict, {"broadcast interval": broadcast_interval_str})
-                                    async_dispatcher_send(self._hass, dispatcher_key_sensor, broadcast_interval_str)
-                                    _LOGGER.debug(f"HS-Time: Broadcast Interval for {device_id}: index={broadcast_index}, value='{broadcast_interval_str}', keys: {dispatcher_key_dict}, {dispatcher_key_sensor}")
-                                    
-                                    # Store Sunrise/Sunset object addresses for later D0_VALUE_REQ queries
-                                    sunrise_objadr = objadr + 17
-                                    sunset_objadr = objadr + 18
-                                    
-                                    # Send D0_VALUE_REQ for Sunrise and Sunset (values are stored directly on MI device)
-                                    await self._packet_sender.send_raw_command(
-                                        ipdst=sunrise_objadr,
-                                        ddata=bytes([D0_VALUE_REQ, 0x00, 0x00]),
-                                        objsource=self._objadr,
-                                        mi=self._mi,
-                                    )
-                                    await asyncio.sleep(0.1)
-                                    await self._packet_sender.send_raw_command(
-                                        ipdst=sunset_objadr,
-                                        ddata=bytes([D0_VALUE_REQ, 0x00, 0x00]),
-                                        objsource=self._objadr,
-                                        mi=self._mi,
-                                    )
-                                    _LOGGER.debug(f"HS-Time: Sent D0_VALUE_REQ for Sunrise/Sunset (objadr={objadr}, sunrise={sunrise_objadr}, sunset={sunset_objadr})")
-                                else:
-                                    _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for HS-Time 0xFF: {len(paket.ddata)} bytes")
-                                continue
-                            
-                            # 1.6. LCD3 (UP-LCD): b1..b2 = Adresse (Big Endian), $FFFF = Kapazitäts-Info
-                            # IMPORTANT: Check LCD BEFORE SensorConfig/PIR to avoid conflicts with b1 == 0
-                            elif model and 'LCD' in model.upper():
-                                _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 for {device_id}: model={model}, ddata_len={len(paket.ddata)}, ddata[0:5]={[hex(b) for b in paket.ddata[:5]]}")
-                                if len(paket.ddata) >= 3:
-                                    adr_insert = paket.ddata[1] * 256 + paket.ddata[2]  # Big Endian
-                                    _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 for {device_id}: adr_insert={adr_insert:04X}")
-                                    if adr_insert == 0xFFFF:
-                                        # Capacity info
-                                        if len(paket.ddata) >= 11:
-                                            size_cfg = (paket.ddata[3] << 8) | paket.ddata[4]  # Big Endian
-                                            size_strn = (paket.ddata[5] << 8) | paket.ddata[6]  # Big Endian
-                                            size_str = (paket.ddata[7] << 8) | paket.ddata[8]  # Big Endian
-                                            size_node = (paket.ddata[9] << 8) | paket.ddata[10]  # Big Endian
-                                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 capacity for {device_id}: "
-                                                        f"SizeCfg={size_cfg}, SizeStrN={size_strn}, SizeStr={size_str}, SizeNODE={size_node}")
-                                        else:
-                                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for LCD3 Kapazität: {len(paket.ddata)} bytes")
-                                    elif adr_insert == 0:
-                                        # Zeile 0: Konfiguration (TCfg_LCD3)
-                                        # Byte 0-1: adrUK (Basis-Objektadresse, Big Endian)
-                                        # Paketstruktur: ddata[0] = Befehl, ddata[1-2] = Adresse (Big Endian), ddata[3-34] = 32 Bytes Daten
-                                        # Mindestens 5 Bytes benötigt (Befehl + Adresse + erste 2 Bytes der Daten für adrUK)
-                                        if len(paket.ddata) >= 5:
-                                            # ddata[3:5] = adrUK (Big Endian) - erste 2 Bytes der Konfiguration
-                                            adr_uk = (paket.ddata[3] << 8) | paket.ddata[4]  # Big Endian
-                                            device.objadr = adr_uk
-                                            _LOGGER.info(f"D0_RD_MODULSPEC_DATA_ACK LCD3 config (line 0) for {device_id}: adrUK={adr_uk:04X} (OBJ={adr_uk}), packet_len={len(paket.ddata)} bytes")
-                                            
-                                            # Send signal to add LCD buttons if not already present
-                                            async_dispatcher_send(self._hass, f"net4home_device_updated_{self._entry.entry_id}", device_id)
-                                            
-                                            # Save objadr to config entry for persistence
-                                            try:
-                                                devices = dict(self._entry.options.get("devices", {}))
-                                                if device_id in devices:
-                                                    devices[device_id]["objadr"] = adr_uk
-                                                    new_options = dict(self._entry.options)
-                                                    new_options["devices"] = devices
-                                                    self._hass.config_entries.async_update_entry(self._entry, options=new_options)
-                                                    _LOGGER.debug(f"Saved objadr={adr_uk} for {device_id} to config entry")
-                                            except Exception as e:
-                                                _LOGGER.error(f"Failed to save objadr for {device_id}: {e}")
-                                        else:
-                                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for LCD3 config: {len(paket.ddata)} bytes (need at least 5 bytes for adrUK)")
-                                    else:
-                                        # Normal line data (other lines)
-                                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 line for {device_id}: adr={adr_insert:04X}")
-                                else:
-                                    _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for LCD3: {len(paket.ddata)} bytes")
-                                continue
-                            
-                            # 5. IR_TX: b1 = $FF = Modul-Info, b1 < $80 = Tabelle, b1 >= $C0 = MaxPower
-                            elif model and 'IR' in model.upper() and 'TX' in model.upper():
-                                if b1 == 0xFF:
-                                    # Modul-Info
-                                    if len(paket.ddata) >= 6:
-                                        tab_entry_count = paket.ddata[2]
-                                        adr_obj_ir = paket.ddata[3] * 256 + paket.ddata[4]  # Little Endian
-                                        tab2_entry_count = paket.ddata[5]
-                                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK IR_TX module info for {device_id}: "
-                                                    f"TabEntries={tab_entry_count}, ObjAdr={adr_obj_ir}, Tab2Entries={tab2_entry_count}")
-                                    else:
-                                        _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for IR_TX Modul-Info: {len(paket.ddata)} bytes")
-                                elif b1 < 0x80:
-                                    # Haupttabelle
-                                    if len(paket.ddata) >= 26:
-                                        tab_index = b1
-                                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK IR_TX table for {device_id}: Index={tab_index}")
-                                        # Table data can be stored for later use
-                                    else:
-                                        _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for IR_TX Tabelle: {len(paket.ddata)} bytes")
-                                elif b1 >= 0xC0:
-                                    # MaxPower-Tabelle
-                                    if len(paket.ddata) >= 34:
-                                        tab2_index = b1 - 0xC0
-                                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK IR_TX MaxPower for {device_id}: Index={tab2_index}")
-                                        # Table data can be stored for later use
-                                    else:
-                                        _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for IR_TX MaxPower: {len(paket.ddata)} bytes")
+                            # With a standby connector every telegram arrives on both links
+                            if self.standby is not None and self.standby.is_copy(payload, LINK_PRIMARY):
                                 continue
-
-                            elif b0 == D0_VALUE_ACK:
-                                    device_id = f"OBJ{paket.objsrc:05d}"
-                                    # _LOGGER.debug(f"D0_VALUE_ACK for {device_id} – Type: {paket.ddata[1]}")
-
-                                    # Check if packet has enough data (need at least 5 bytes for sensor values)
-                                    if len(paket.ddata) < 5:
-                                        _LOGGER.warning(f"D0_VALUE_ACK packet too short: {len(paket.ddata)} bytes, expected at least 5")
-                                        continue
-
-                                    if paket.ddata[1] == IN_HW_NR_IS_TEMP:
-                                        i_analog_value = paket.ddata[3] * 256 + paket.ddata[4]
-                                        if i_analog_value > 0x8000:
-                                            i_analog_value -= 0x10000
-                                        i_analog_value = (i_analog_value * 10) // 16
-                                        value = round(i_analog_value / 10, 1)
-                                        sensor_type = "temperature"
-                                        dispatcher_key = f"net4home_update_{device_id}_{sensor_type}"
-                                        async_dispatcher_send(self._hass, dispatcher_key, value)
-                                        #_LOGGER.debug(f"_temperature D0_VALUE_ACK for {dispatcher_key} – Value: {value}")
-                                    
-                                    elif paket.ddata[1] == IN_HW_NR_IS_HUMIDITY:
-                                        value = paket.ddata[3] * 256 + paket.ddata[4]
-                                        sensor_type = "humidity"
-                                        dispatcher_key = f"net4home_update_{device_id}_{sensor_type}"
-                                        async_dispatcher_send(self._hass, dispatcher_key, value)
-                                        #_LOGGER.debug(f"_humidity D0_VALUE_ACK for {dispatcher_key} – Value: {value}")
-                                        
-                                    elif paket.ddata[1] == IN_HW_NR_IS_LICHT_ANALOG:
-                                        value = paket.ddata[3] * 256 + paket.ddata[4]
-                                        sensor_type = "illuminance"
-                                        dispatcher_key = f"net4home_update_{device_id}_{sensor_type}"
-                                        async_dispatcher_send(self._hass, dispatcher_key, value)
-                                        #_LOGGER.debug(f"_illuminance D0_VALUE_ACK for {dispatcher_key} – Value: {value}")
-                                    
-                                    # HS-Time: Sonnenaufgang (VAL_IS_MIN_TAG_WORD_SA = 50)
-                                    elif paket.ddata[1] == VAL_IS_MIN_TAG_WORD_SA:
-                                        # Laut Dokumentation: ddata[2] = Minuten Low, ddata[3] = Minuten High
-                                        # Berechnung: Sonnenaufgang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
-                                        # Finde das HS-Time MI-Device (Sunrise kommt von objadr + 17)
-                                        device_id_from_ipsrc = f"MI{paket.ipsrc:04X}"
-                                        mi_device = self.get_known_device(device_id_from_ipsrc)
-                                        
-                                        if mi_device and mi_device.model == "HS-Time":
-                                            if len(paket.ddata) >= 4:
-                                                # Laut korrigierter Dokumentation (hs-time.md):
-                                                # ddata[2] = Minuten Low, ddata[3] = Minuten High
-                                                # Berechnung: Sonnenaufgang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
-                                                # Die Original-Implementierung interpretiert es falsch als direkt Stunden:Minuten
-                                                minutes_low = paket.ddata[2]
-                                                minutes_high = paket.ddata[3]
-                                                minutes_since_midnight = minutes_high * 256 + minutes_low
-                                                # Konvertiere Minuten seit Mitternacht zu Stunden:Minuten Format
-                                                hours = minutes_since_midnight // 60
-                                                minutes = minutes_since_midnight % 60
-                                                # Wert als Zeit-String formatieren (z.B. "06:30")
-                                                value = f"{hours:02d}:{minutes:02d}"
-                                                
-                                                # Sende direkt an das MI-Device (wie bei UP-TLH)
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}", {"sunrise": value})
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}_sunrise", value)
-                                                _LOGGER.debug(f"HS-Time Sunrise for {device_id_from_ipsrc}: {value} ({minutes_since_midnight} minutes since midnight, raw: ddata[2]=0x{minutes_low:02X}={minutes_low}, ddata[3]=0x{minutes_high:02X}={minutes_high})")
-                                            else:
-                                                _LOGGER.warning(f"D0_VALUE_ACK packet too short for HS-Time Sunrise: {len(paket.ddata)} bytes")
-                                        else:
-                                            _LOGGER.warning(f"HS-Time Sunrise: MI device {device_id_from_ipsrc} not found or not HS-Time")
-                                    
-                                    # HS-Time: Sonnenuntergang (VAL_IS_MIN_TAG_WORD_SU = 51)
-                                    elif paket.ddata[1] == VAL_IS_MIN_TAG_WORD_SU:
-                                        # Laut Dokumentation: ddata[2] = Minuten Low, ddata[3] = Minuten High
-                                        # Berechnung: Sonnenuntergang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
-                                        # Finde das HS-Time MI-Device (Sunset kommt von objadr + 18)
-                                        device_id_from_ipsrc = f"MI{paket.ipsrc:04X}"
-                                        mi_device = self.get_known_device(device_id_from_ipsrc)
-                                        
-                                        if mi_device and mi_device.model == "HS-Time":
-                                            if len(paket.ddata) >= 4:
-                                                # Laut korrigierter Dokumentation (hs-time.md):
-                                                # ddata[2] = Minuten Low, ddata[3] = Minuten High
-                                                # Berechnung: Sonnenuntergang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
-                                                # Die Original-Implementierung interpretiert es falsch als direkt Stunden:Minuten
-                                                minutes_low = paket.ddata[2]
-                                                minutes_high = paket.ddata[3]
-                                                minutes_since_midnight = minutes_high * 256 + minutes_low
-                                                # Konvertiere Minuten seit Mitternacht zu Stunden:Minuten Format
-                                                hours = minutes_since_midnight // 60
-                                                minutes = minutes_since_midnight % 60
-                                                # Wert als Zeit-String formatieren (z.B. "18:30")
-                                                value = f"{hours:02d}:{minutes:02d}"
-                                                
-                                                # Sende direkt an das MI-Device (wie bei UP-TLH)
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}", {"sunset": value})
-                                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}_sunset", value)
-                                                _LOGGER.debug(f"HS-Time Sunset for {device_id_from_ipsrc}: {value} ({minutes_since_midnight} minutes since midnight, raw: ddata[2]=0x{minutes_low:02X}={minutes_low}, ddata[3]=0x{minutes_high:02X}={minutes_high})")
-                                            else:
-                                                _LOGGER.warning(f"D0_VALUE_ACK packet too short for HS-Time Sunset: {len(paket.ddata)} bytes")
-                                        else:
-                                            _LOGGER.warning(f"HS-Time Sunset: MI device {device_id_from_ipsrc} not found or not HS-Time")
-                                    
-                                    elif paket.ddata[1] == IN_HW_NR_IS_RF_TAG_READER:
-                                        # Check if packet has enough data (need at least 10 bytes: indices 0-9)
-                                        if len(paket.ddata) < 10:
-                                            _LOGGER.warning(f"RF-Key packet too short: {len(paket.ddata)} bytes, expected at least 10")
-                                            continue
-                                        
-                                        # Extract 5-byte RF-Key code (40-bit)
-                                        rf_key_bytes = paket.ddata[3:8]
-                                        rf_key_hex = ''.join(f'{b:02X}' for b in rf_key_bytes)
-                                        
-                                        # Extract state from ddata[9]
-                                        tag_state = paket.ddata[9] & 6
-                                        if tag_state == 0:
-                                            state = "short_hold"
-                                        elif tag_state == 2:
-                                            state = "long_hold"
-                                        elif tag_state == 4:
-                                            state = "removed_after_short"
-                                        else:
-                                            state = "unknown"
-                                        
-                                        # Map OBJ address to parent MI device for RF-Key messages
-                                        # RF-Key sensor should be on the main MI device, not on OBJ child devices
-                                        via_device_id = f"MI{paket.ipsrc:04X}"
-                                        parent_device = self.devices.get(via_device_id)
-                                        
-                                        if parent_device and parent_device.device_type == "rf_reader":
-                                            # Send update to the parent MI device, not the OBJ address
-                                            dispatcher_key = f"net4home_update_{via_device_id}_rf_key"
-                                            async_dispatcher_send(self._hass, dispatcher_key, {
-                                                "rf_key": rf_key_hex,
-                                                "state": state
-                                            })
-                                            _LOGGER.debug(f"RF-Key detected: {rf_key_hex} ({state}) from OBJ {device_id}, mapped to {via_device_id}")
-                                            
-                                            # Fire Home Assistant event for automation triggers
-                                            self._hass.bus.async_fire(
-                                                "net4home_rf_key_detected",
-                                                {
-                                                    "device_id": via_device_id.upper(),
-                                                    "device_name": parent_device.name if parent_device else via_device_id,
-                                                    "rf_key": rf_key_hex,
-                                                    "state": state,
-                                                    "rf_key_bytes": rf_key_bytes.hex(),
-                                                }
-                                            )
-                                        else:
-                                            # Fallback: use OBJ address if parent not found
-                                            dispatcher_key = f"net4home_update_{device_id}_rf_key"
-                                            async_dispatcher_send(self._hass, dispatcher_key, {
-                                                "rf_key": rf_key_hex,
-                                                "state": state
-                                            })
-                                    _LOGGER.debug(f"RF-Key detected: {rf_key_hex} ({state}) from {device_id} (parent not found)")
-                                    
-                                    # Fire Home Assistant event for automation triggers
-                                    fallback_device = self.devices.get(device_id)
-                                    self._hass.bus.async_fire(
-                                        "net4home_rf_key_detected",
-                                        {
-                                            "device_id": device_id.upper(),
-                                            "device_name": fallback_device.name if fallback_device else device_id,
-                                            "rf_key": rf_key_hex,
-                                            "state": state,
-                                            "rf_key_bytes": rf_key_bytes.hex(),
-                                        }
-                                    )
-
-                            elif b0 == D0_STATUS_INFO:
-                                    device_id = f"OBJ{paket.objsrc:05d}"
-                                    
-                                    # Check if packet has enough data
-                                    if len(paket.ddata) < 4:
-                                        _LOGGER.warning(f"STATUS_INFO packet too short: {len(paket.ddata)} bytes, expected at least 4")
-                                        continue
-                                    
-                                    is_on = paket.ddata[2] == 1
-                                    
-                                    if paket.ddata[3] == OUT_HW_NR_IS_DIMMER:
-                                        is_on = paket.ddata[2] >> 7
-                                        brightness_value = round((paket.ddata[2] & 0x7F) * 255 / 100)
-                                        _LOGGER.debug(f"STATUS_INFO for {device_id}: {'ON' if is_on else 'OFF'} {brightness_value}%")
-                                        async_dispatcher_send(
-                                            self._hass,
-                                            f"net4home_update_{device_id}",
-                                            {
-                                                "is_on": is_on,
-                                                "brightness": brightness_value
-                                            }
-                                        )
-                                    else:
-                                        # _LOGGER.debug(f"STATUS_INFO for {device_id}: {'ON' if is_on else 'OFF'}")
-                                        async_dispatcher_send(self._hass, f"net4home_update_{device_id}", is_on)
-
-                            elif b0 in {D0_SET, D0_INC, D0_DEC, D0_TOGGLE}:
-                                    device_id = f"OBJ{paket.objsrc:05d}"
-                                    device = self.devices.get(device_id)
-
-                                    if not device:
-                                        continue
-
-                                    # _LOGGER.debug(f"D0_xxx for {device_id} – Command: {paket.ddata[0]}")
-
-                                    if device.device_type == "binary_sensor":
-                                        await self.async_request_status(device.device_id)
+                            opcode = metrics.on_rx(payload)
+                            started = time.perf_counter_ns()
+                            await self._async_handle_payload(payload)
+                            metrics.on_dispatched(opcode, time.perf_counter_ns() - started)
 
                 except (ConnectionResetError, OSError) as e:
                     _LOGGER.warning(f"[IP] Connection error: {e}")
@@ -1739,6 +708,1229 @@ class Net4HomeApi:
                 except Exception as e:
                     _LOGGER.error(f"Error in listener: {e}", exc_info=True)
 
+    async def _async_handle_payload(self, payload: bytes):
+        """Parse one decompressed bus packet and dispatch it."""
+        # Telegrams between modules/objects we do not manage are dropped unparsed
+        if not self.address_filter.accepts(payload):
+            return
+
+        try:
+            ret, paket = n4h_parse(payload)
+        except Exception as e:
+            _LOGGER.error(f"[IP] Parsing error: {e}", exc_info=True)
+            return
+
+        if paket is None:
+            _LOGGER.warning(
+                f"[IP] Unable to parse a legit bus packet - {ret} - "
+                f"{payload[:32].hex() if len(payload) >= 32 else payload.hex()}"
+            )
+            return
+
+        self.keepalive.on_packet(paket)
+
+        # Repeated telegrams (cyclic broadcasts, retries) are processed once
+        if self.duplicate_filter.is_duplicate(paket):
+            return
+
+        if paket.ddatalen != 0:
+            # Identify the action what we have to do
+            b0 = paket.ddata[0]
+
+            # Discovered a module, maybe we know it (enum all or enum for a single module)
+            if b0 == D0_ACK_TYP:
+                # Reset ENUM_ALL timeout if enumeration is active
+                if self._enum_state > 0 and self._enum_timeout_task:
+                    self._enum_timeout_task.cancel()
+                    self._enum_timeout_task = asyncio.create_task(
+                        self._wait_for_timeout()
+                    )
+                    _LOGGER.debug(f"[ENUM_ALL] Timer reset due to D0_ACK_TYP (round {self._enum_state})")
+
+                #  b0 -> D0_ACK_TYP
+                #  b1 -> Modultyp
+                #  b2 -> ns 
+                #  b3 -> na (number of channels)
+                #  b4 ->
+                #  b5 -> IPK Version (lo)
+                #  b6 ->
+                #  b7 -> Version (hi)
+                #  b8 -> Version (lo)
+                #  b9 -> IPK Version (hi)
+                # b10 ->  Config Status 
+
+                b10 = paket.ddata[10] 
+
+                device_id = f"MI{paket.ipsrc:04X}"
+                objadr = None 
+                model = platine_typ_to_name_a(paket.ddata[1])
+                sw_version = ""
+                name = device_id
+                device_type="module"
+
+                major = paket.ddata[9]
+                subsystem = paket.ddata[5]
+                minor_raw1 = paket.ddata[7]
+                minor_raw = paket.ddata[8]
+                sw_version = f"{major}.{'%02d' % subsystem}/{minor_raw1}.{minor_raw:02d}"                            
+
+                if b10 & D10_CONFIG_ENABLE_BIT:
+                    mode = "config"
+                elif b10 & D10_FCONFIG_ENABLE_BIT:    
+                    mode = "factory"
+                else:    
+                    mode = "normal"
+
+                # UP-TLH is a module with entities
+                if model == "UP-TLH":
+                    device_type="climate"
+                    # IMPORTANT: objadr will be set later from the 0xF1 packet (D0_RD_MODULSPEC_DATA_ACK)
+                    # Initially set to None so sensors are not created with wrong objadr
+                    objadr=None
+
+                # UP-RF is an RF-Key reader module
+                elif model in ("UP-RF", "UP-RF-S4AR1"):
+                    device_type="rf_reader"
+                    objadr=paket.objsrc
+
+                # HS-Safety is an alarm control panel module
+                elif model == "HS-Safety":
+                    device_type="alarm_control_panel"
+                    objadr=paket.objsrc
+
+                # HS-Time is a time control module with sunrise/sunset sensors
+                elif model == "HS-Time":
+                    device_type="sensor"  # Treated as sensor module
+                    # objadr will be set later from the 0xFF packet (D0_RD_MODULSPEC_DATA_ACK)
+                    objadr=None
+
+                # _LOGGER.debug(f"ACK_TYP received for device: {device_id} ({device_type}) ({model}) ({objadr}) ({sw_version})")
+
+                # Extract module type information from D0_ACK_TYP before registration
+                module_type = None
+                ns = None
+                na = None
+                nm = None
+                ng = None
+
+                # Check if we can access index 9 (IPK version) for 16-bit nm calculation
+                svwIPK = 0
+                if len(paket.ddata) > 9:
+                    svwIPK = paket.ddata[9]  # IPK version (hi)
+
+                if len(paket.ddata) > 1:
+                    module_type = paket.ddata[1]  # Module type
+                if len(paket.ddata) > 2:
+                    ns = paket.ddata[2]  # Number of sensors
+                if len(paket.ddata) > 3:
+                    na = paket.ddata[3]  # Number of actuators
+                if len(paket.ddata) > 12:
+                    ng = paket.ddata[12]  # Group table length
+                if len(paket.ddata) > 13:
+                    nm = paket.ddata[13]  # ModuleSpec table length
+                    # Consider 16-bit flag for ModulSpec (from NET3)
+                    if svwIPK >= 3:  # from NET3
+                        if len(paket.ddata) > 11 and (paket.ddata[11] & 0x01):  # D11_ACK_TYP_MS16BIT
+                            nm = nm * 4
+
+                try:
+                    await register_device_in_registry(
+                        hass=self._hass,
+                        entry=self._entry,
+                        device_id=device_id,
+                        name=name,
+                        model=model,
+                        sw_version=sw_version,
+                        hw_version="",
+                        device_type=device_type, 
+                        via_device="",
+                        api=self,
+                        objadr=objadr,
+                        module_type=module_type,
+                        ns=ns,
+                        na=na,
+                        nm=nm,
+                        ng=ng,
+                    )
+
+                    # Module type information is already stored during registration
+                    # Just verify it was set correctly and log
+                    device = self.devices.get(device_id)
+                    if device:
+                        # Update if not already set (shouldn't happen, but safety check)
+                        if device.module_type is None and module_type is not None:
+                            device.module_type = module_type
+                        if device.ns is None and ns is not None:
+                            device.ns = ns
+                        if device.na is None and na is not None:
+                            device.na = na
+                        if device.nm is None and nm is not None:
+                            device.nm = nm
+                        if device.ng is None and ng is not None:
+                            device.ng = ng
+
+                        if len(paket.ddata) < 14:
+                            _LOGGER.debug(
+                                f"D0_ACK_TYP packet shorter than expected for {device_id}: "
+                                f"{len(paket.ddata)} bytes (expected 14+), using defaults for missing fields"
+                            )
+
+                        _LOGGER.debug(
+                            f"Stored module info for {device_id}: "
+                            f"type={device.module_type}, ns={device.ns}, na={device.na}, "
+                            f"ng={device.ng}, nm={device.nm}, packet_len={len(paket.ddata)}"
+                        )
+
+                    # Request sensor data for UP-RF devices to discover sensor object addresses
+                    # (These requests are fast and can be done immediately)
+                    if device_type == "rf_reader":
+                        # Request sensor data for channels 0 and 1 (command 1 and command 2)
+                        await self.async_request_sensor_data(device_id, channel=0)
+                        await self.async_request_sensor_data(device_id, channel=1)
+
+                    # Add device to detail queue (for further detail queries)
+                    await self.async_queue_device_for_details(device_id)
+
+                except Exception as e:
+                    _LOGGER.error(f"Error during registration of device (module) {device_id}: {e}")
+
+            elif b0 == D0_ACTOR_ACK:
+                # For UP-TLH/UP-T: D0_ACTOR_ACK comes from OBJ addresses (objadr, objadr+1, objadr+2)
+                # But sensors are created on the MI device, so we need to find the MI device
+                device_id = f"MI{paket.ipsrc:04X}"
+                device = self.get_known_device(device_id)
+
+                if not device:
+                    # Fallback: Versuche OBJ-Device
+                    device_id = f"OBJ{paket.objsrc:05d}"
+                    device = self.get_known_device(device_id)
+                    if not device:
+                        # Unknown MI device: Try to discover it by sending ENUM command
+                        # This can happen if a module sends D0_ACTOR_ACK before being discovered by ENUM_ALL
+                        mi_address = paket.ipsrc
+
+                        # Rate limit: Only send ENUM once per MI address
+                        if mi_address not in self._enum_sent_to:
+                            self._enum_sent_to.add(mi_address)
+                            # Further ACKs of this module are dropped by the address filter until it answers
+                            self.address_filter.set_discovery_sent(mi_address)
+                            _LOGGER.info(f"D0_ACTOR_ACK from unknown MI device {device_id}, sending ENUM to discover it")
+                            try:
+                                # Send ENUM command to this specific module
+                                await self._packet_sender.send_raw_command(
+                                    ipdst=mi_address,
+                                    ddata=bytes([D0_ENUM_ALL]),
+                                    objsource=0,
+                                    mi=self._mi,
+                                    type8=SEND_AS_IP,
+                                )
+                                _LOGGER.debug(f"Sent ENUM command to {device_id} (MI address 0x{mi_address:04X})")
+                            except Exception as e:
+                                _LOGGER.error(f"Error sending ENUM to {device_id}: {e}")
+                                # Remove from set on error so we can retry later
+                                self._enum_sent_to.discard(mi_address)
+                                self.address_filter.set_discovery_sent(mi_address, False)
+                        else:
+                            _LOGGER.debug(f"D0_ACTOR_ACK from unknown MI device {device_id}, ENUM already sent, waiting for D0_ACK_TYP")
+                        return
+
+                # _LOGGER.debug(f"D0_ACTOR_ACK for *** {device_id}: {device.device_type} - obj {device.objadr} - {paket.objsrc}")
+
+                if device.device_type == 'climate':
+                    # For UP-TLH/UP-T: Determine sensor type based on objadr relationship
+                    # According to documentation: objadr + 0 = setpoint (targettemp), objadr + 1 = day value (presetday), objadr + 2 = night value (presetnight)
+                    # paket.objsrc is the object address from which the packet comes
+                    sensor_key = None
+                    if device.objadr is not None:
+                        if paket.objsrc == device.objadr:
+                            sensor_key = "targettemp"
+                        elif paket.objsrc == device.objadr + 1:
+                            sensor_key = "presetday"
+                        elif paket.objsrc == device.objadr + 2:
+                            sensor_key = "presetnight"
+
+                    if sensor_key:
+                        # According to documentation: Setpoint_Temperature = (ddata[1] + ddata[2] * 256) / 10.0 (Little Endian)
+                        # ddata[1] = Setpoint Low, ddata[2] = Setpoint High
+                        # BUT: In practice the byte order seems to be swapped
+                        # Test: 20°C = 200 = 0x00C8 (Little Endian: lo=0xC8, hi=0x00)
+                        # But we see 5,120.0°C = 51,200 = 0xC800 (hi=0xC8, lo=0x00)
+                        # This means: ddata[1] contains the High Byte, ddata[2] contains the Low Byte
+                        # Correct calculation: (ddata[2] + ddata[1] * 256) / 10.0
+                        if len(paket.ddata) >= 4:
+                            # The bytes are actually swapped compared to the documentation
+                            # ddata[1] = High Byte, ddata[2] = Low Byte
+                            hi = paket.ddata[1]  # Actually High Byte
+                            lo = paket.ddata[2]  # Actually Low Byte
+                            # Calculation: (Low Byte + High Byte * 256) / 10.0
+                            temp = (lo + hi * 256) / 10.0
+
+                            # ddata[3] contains status bits: Bit 0 = heating controller, Bit 1 = cooling controller
+                            status_byte = paket.ddata[3]
+                            heat_active = (status_byte & 0x01) != 0  # Bit 0
+                            cool_active = (status_byte & 0x02) != 0  # Bit 1
+
+                            # Determine HVAC Mode based on status bits
+                            if heat_active and cool_active:
+                                hvac_mode = "heat_cool"
+                            elif heat_active:
+                                hvac_mode = "heat"
+                            elif cool_active:
+                                hvac_mode = "cool"
+                            else:
+                                hvac_mode = "off"
+
+                            _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {sensor_key} = {temp}°C, status=0x{status_byte:02X} (heat={heat_active}, cool={cool_active}, mode={hvac_mode})")
+
+                            # Send updates to the MI device (where sensors were created)
+                            update_data = {
+                                sensor_key: temp,
+                                "hvac_mode": hvac_mode,
+                                "heat_active": heat_active,
+                                "cool_active": cool_active
+                            }
+                            self.confirmations.confirm(device_id, update_data)
+                            self._publish_state(device_id, update_data)
+                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}_{sensor_key}", temp)
+                        else:
+                            _LOGGER.warning(f"D0_ACTOR_ACK packet too short for climate: {len(paket.ddata)} bytes, expected at least 4")
+                    else:
+                        _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: No matching sensor type (objadr={device.objadr}, paket.objsrc={paket.objsrc})")
+
+                else:
+                    # Check if packet has enough data (need at least 3 bytes)
+                    if len(paket.ddata) < 3:
+                        _LOGGER.warning(f"D0_ACTOR_ACK packet too short: {len(paket.ddata)} bytes, expected at least 3")
+                        return
+
+                    if device.device_type == 'switch':
+                        is_on = paket.ddata[2] == 1
+                        _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {'ON' if is_on else 'OFF'}")
+                        self.confirmations.confirm(device_id, is_on)
+                        self._publish_state(device_id, is_on)
+
+                    elif device.device_type == 'timer':
+                        is_on = paket.ddata[2] == 1
+                        _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {'ON' if is_on else 'OFF'}")
+                        self.confirmations.confirm(device_id, is_on)
+                        self._publish_state(device_id, is_on)
+
+                    elif device.device_type == 'cover':
+                        is_closed = paket.ddata[2] != 1 
+                        _LOGGER.debug(f"D0_ACTOR_ACK für {device_id}: {'CLOSED' if is_closed else 'OPEN'}")
+                        self.confirmations.confirm(device_id, is_closed)
+                        self._publish_state(device_id, is_closed)
+
+                    elif device.device_type == 'light':
+                        is_on = paket.ddata[2] >> 7
+                        brightness_value = round((paket.ddata[2] & 0x7F) * 255 / 100)
+                        _LOGGER.debug(f"STATUS_INFO_ACK for {device_id}: {'ON' if is_on else 'OFF'} {round((paket.ddata[2] & 0x7F))}%")
+                        self.confirmations.confirm(device_id, {"is_on": is_on, "brightness": brightness_value})
+                        self._publish_state(device_id, {"is_on": is_on, "brightness": brightness_value})
+
+                    elif device.device_type == 'binary_sensor':
+                        is_closed = paket.ddata[2] != 1 
+                        _LOGGER.debug(f"STATUS_INFO_ACK for {device_id}: {'CLOSED' if is_closed else 'OPEN'}")
+                        self._publish_state(device_id, is_closed)
+
+                    else:
+                        # Only log warning for unhandled device types
+                        _LOGGER.warning(f"Unhandled device type in D0_ACTOR_ACK: {device.device_type} ({device.model}) for {device_id}")
+
+            elif b0 == D0_RD_ACTOR_DATA_ACK:
+                _LOGGER.debug(f"D0_RD_ACTOR_DATA_ACK identified Type: {paket.ddata[2]}")
+
+                b1  = paket.ddata[1] + 1 # channel
+                b2  = paket.ddata[2]     # actor type
+                b8  = paket.ddata[8]     # OBJ hi
+                b9  = paket.ddata[9]     # OBJ lo
+
+
+                device_id = f"OBJ{(b8*256+b9):05d}"
+                objadr = (b8 << 8) + b9
+                via_device = f"MI{paket.ipsrc:04X}"
+                self.group_index.register_channel(paket.ipsrc, paket.ddata[1], objadr)
+                is_dimmer = False
+                is_jal = False
+
+                device_obj = self.devices.get(via_device)
+
+                # Wenn das MI-Device nicht existiert, erstelle es automatisch
+                # (kann passieren, wenn die Abfrage von einem externen Programm kommt)
+                if not device_obj:
+                    _LOGGER.warning(
+                        f"MI device {via_device} not found when registering OBJ device {device_id}. "
+                        f"Creating MI device automatically."
+                    )
+                    # Erstelle ein minimales MI-Device
+                    await register_device_in_registry(
+                        hass=self._hass,
+                        entry=self._entry,
+                        device_id=via_device,
+                        name=via_device,
+                        model="Unknown",
+                        sw_version="",
+                        hw_version="",
+                        device_type="module",
+                        via_device="",
+                        api=self,
+                        objadr=None,
+                    )
+                    device_obj = self.devices.get(via_device)
+                    if device_obj:
+                        _LOGGER.info(f"Created MI device {via_device} for OBJ device {device_id}")
+                    else:
+                        _LOGGER.error(f"Failed to create MI device {via_device}")
+                        return
+
+                # Check module type for dimmer detection
+                if device_obj and device_obj.model in ('HS-AD1-1x10V', 'HS-AD3e', 'HS-AD3'):
+                    is_dimmer = True
+                    _LOGGER.debug(f"Dimmer module detected: {device_obj.model} for {device_id}, b2={b2}")
+
+                if device_obj and device_obj.model in ('HS-AJ3', 'HS-AJ1', 'HS-AJ4-500', 'HS-AJ3-6'):
+                    is_jal = True
+
+                # Also check if the via_device already has dimmer devices (then it is a dimmer module)
+                if via_device in self.devices:
+                    via_device_obj = self.devices[via_device]
+                    # Check if there are already dimmer channels
+                    for existing_device in self.devices.values():
+                        if existing_device.via_device == via_device and existing_device.device_type == "light":
+                            is_dimmer = True
+                            _LOGGER.debug(f"Dimmer module detected through existing Light entities for {device_id}, b2={b2}")
+                            break
+
+                # Timer entries have priority and are detected regardless of module type
+                # IMPORTANT: Timer check must occur BEFORE dimmer check
+                # Timer is also detected on dimmer modules if b2 == OUT_HW_NR_IS_TIMER
+                if b2 == OUT_HW_NR_IS_TIMER:
+                    _LOGGER.info(f"OUT_HW_NR_IS_TIMER identified: {device_id} (module: {device_obj.model if device_obj else 'unknown'}, is_dimmer={is_dimmer}, b2={b2})")
+
+                    # Module details
+                    b3  = paket.ddata[3]     # time1 hi
+                    b4  = paket.ddata[4]     # time1 lo
+                    b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
+                    b6  = paket.ddata[6]     # min
+                    b7  = paket.ddata[7]     # Status update
+                    b10 = paket.ddata[10]     # time2 hi
+                    b11 = paket.ddata[11]    # time2 lo
+                    b12 = paket.ddata[12]    # inverted
+                    t1  = b3*256+b4 # time1
+
+                    try:
+                        await register_device_in_registry(
+                            hass=self._hass,
+                            entry=self._entry,
+                            device_id=device_id,
+                            name = f"CH{b1}_{device_id[3:]}",
+                            model="Timer",
+                            sw_version="",
+                            hw_version="",
+                            device_type="switch",
+                            via_device=via_device,
+                            api=self,
+                            objadr=objadr,
+                            send_state_changes = bool(b7),
+                        )
+                        # Store powerup status and timer time1 in device (also for already existing devices)
+                        if device_id in self.devices:
+                            self.devices[device_id].powerup_status = b5
+                            self.devices[device_id].timer_time1 = t1
+                            _LOGGER.debug(f"Powerup status for {device_id} stored: {b5}, Timer time1: {t1}s")
+                            # Sende Signal zur Aktualisierung der Diagnose-Sensoren
+                            async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
+                        else:
+                            _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
+                        _LOGGER.debug(f"OUT_HW_NR_IS_TIMER identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5}")
+                    except Exception as e:
+                        _LOGGER.error(f"Error during registration of TIMER device (channel) {device_id}: {e}")
+
+                # Wenn OUT_HW_NR_IS_ONOFF und is_dimmer, dann als Dimmer behandeln
+                elif b2 == OUT_HW_NR_IS_ONOFF and is_dimmer:
+                    _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF identified as DIMMER: {device_id}")
+
+                    # Module details
+                    b3  = paket.ddata[3]     # time1 hi
+                    b4  = paket.ddata[4]     # time1 lo
+                    b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
+                    b6  = paket.ddata[6]     # min
+                    b7  = paket.ddata[7]     # Status update
+                    b10 = paket.ddata[10]    # time2 hi
+                    b11 = paket.ddata[11]    # time2 lo
+                    b12 = paket.ddata[12]    # inverted
+                    t1  = b3*256+b4 # time1
+
+                    try:
+                        await register_device_in_registry(
+                            hass=self._hass,
+                            entry=self._entry,
+                            device_id=device_id,
+                            name = f"CH{b1}_{device_id[3:]}",
+                            model="Licht",
+                            sw_version="",
+                            hw_version="",
+                            device_type="light",
+                            via_device=via_device,
+                            api=self,
+                            objadr=objadr,
+                            send_state_changes = bool(b7),
+                        )
+                        # Store powerup status and MinHell in device (also for already existing devices)
+                        if device_id in self.devices:
+                            self.devices[device_id].powerup_status = b5
+                            self.devices[device_id].min_hell = b6
+                            _LOGGER.debug(f"Powerup status for {device_id} saved: {b5}, MinHell: {b6}%")
+                            # Sende Signal zur Aktualisierung der Diagnose-Sensoren
+                            async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
+                        else:
+                            _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
+                        _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF (as DIMMER) identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5} - MinHell: {b6}%")
+                    except Exception as e:
+                        _LOGGER.error(f"Error during registration of DIMMER device (channel) {device_id}: {e}", exc_info=True)
+
+                # We have a classic switch with ON/OFF feature
+                # IMPORTANT: Only for real ON/OFF actors, NOT for dimmers (they have OUT_HW_NR_IS_DIMMER)
+                elif b2 == OUT_HW_NR_IS_ONOFF and not is_dimmer:
+                    _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF identified: {device_id}")
+
+                    # Module details
+                    b3  = paket.ddata[3]     # time1 hi
+                    b4  = paket.ddata[4]     # time1 lo
+                    b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
+                    b6  = paket.ddata[6]     # min
+                    b7  = paket.ddata[7]     # Status update
+                    b10 = paket.ddata[8]     # time2 hi
+                    b11 = paket.ddata[9]     # time2 lo
+                    b12 = paket.ddata[10]    # inverted
+                    t1  = b3*256+b4 # time1
+
+                    model="Schalter"
+                    device_type="switch"
+
+                    try:
+                        _LOGGER.debug(
+                            f"Registering OBJ device {device_id} with via_device={via_device}, "
+                            f"parent_exists={via_device in self.devices}"
+                        )
+                        await register_device_in_registry(
+                            hass=self._hass,
+                            entry=self._entry,
+                            device_id=device_id,
+                            name = f"CH{b1}_{device_id[3:]}",
+                            model=model,
+                            sw_version="",
+                            hw_version="",
+                            device_type=device_type,
+                            via_device=via_device,
+                            api=self,
+                            objadr=objadr,
+                            send_state_changes = bool(b7),
+                        )
+                        # Store powerup status in device (also for already existing devices)
+                        if device_id in self.devices:
+                            self.devices[device_id].powerup_status = b5
+                            _LOGGER.debug(f"Powerup status for {device_id} stored: {b5}")
+                            # Sende Signal zur Aktualisierung der Diagnose-Sensoren
+                            async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
+                        else:
+                            _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
+                        _LOGGER.debug(f"OUT_HW_NR_IS_ONOFF identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5}")
+                    except Exception as e:
+                        _LOGGER.error(f"Error during registration of ONOFF device (channel) {device_id}: {e}", exc_info=True)
+
+                # We have a dimmer
+                elif b2 == OUT_HW_NR_IS_DIMMER:
+                    _LOGGER.debug(f"OUT_HW_NR_IS_DIMMER identified: {device_id}")
+
+                    # Module details
+                    b3  = paket.ddata[3]     # time1 hi
+                    b4  = paket.ddata[4]     # time1 lo
+                    b5  = paket.ddata[5]     # Power Up (0=OFF, 1=ON, 2=ASBEFORE, 3=NoChange, 4=ON100% ) 
+                    b6  = paket.ddata[6]     # min
+                    b7  = paket.ddata[7]     # Status update
+                    b10 = paket.ddata[10]    # time2 hi
+                    b11 = paket.ddata[11]    # time2 lo
+                    b12 = paket.ddata[12]    # inverted
+                    t1  = b3*256+b4 # time1
+
+                    try:
+                        await register_device_in_registry(
+                            hass=self._hass,
+                            entry=self._entry,
+                            device_id=device_id,
+                            name = f"CH{b1}_{device_id[3:]}",
+                            model="Licht",
+                            sw_version="",
+                            hw_version="",
+                            device_type="light",
+                            via_device=via_device,
+                            api=self,
+                            objadr=objadr,
+                            send_state_changes = bool(b7),
+                        )
+                        # Store powerup status and MinHell in device (also for already existing devices)
+                        if device_id in self.devices:
+                            self.devices[device_id].powerup_status = b5
+                            self.devices[device_id].min_hell = b6
+                            _LOGGER.debug(f"Powerup status for {device_id} saved: {b5}, MinHell: {b6}%")
+                            # Sende Signal zur Aktualisierung der Diagnose-Sensoren
+                            async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
+                        else:
+                            _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store powerup status")
+                        _LOGGER.debug(f"OUT_HW_NR_IS_DIMMER identified: {device_id} - CH{b1} t1{t1} - State change {bool(b7)} - Powerup: {b5} - MinHell: {b6}%")
+                    except Exception as e:
+                        _LOGGER.error(f"Error during registration of DIMMER device (channel) {device_id}: {e}", exc_info=True)
+
+                # We have a cover 
+                elif b2 == OUT_HW_NR_IS_JAL or is_jal:
+
+                    _LOGGER.debug(f"OUT_HW_NR_IS_JAL Paket : {' '.join(f'{b:02X}' for b in paket.ddata)}")
+
+                    # Module details
+                    b3  = paket.ddata[3]     # time1 hi
+                    b4  = paket.ddata[4]     # time1 lo
+                    b7  = paket.ddata[7]     # Status update
+                    t1  = b3*256+b4 # time1 (Run time for covers)
+
+                    _LOGGER.debug(f"OUT_HW_NR_IS_JAL identified: {device_id}")
+
+                    try:
+                        await register_device_in_registry(
+                            hass=self._hass,
+                            entry=self._entry,
+                            device_id=device_id,
+                            name = f"CH{b1}_{device_id[3:]}",
+                            model="Jalousie",
+                            sw_version="",
+                            hw_version="",
+                            device_type="cover",
+                            via_device=via_device,
+                            api=self,
+                            objadr=objadr,
+                            send_state_changes = bool(b7),
+                        )
+                        # Store run time (Timer1) in device (also for already existing devices)
+                        if device_id in self.devices:
+                            self.devices[device_id].timer_time1 = t1
+                            _LOGGER.debug(f"Run time for {device_id} stored: {t1}s")
+                            # Sende Signal zur Aktualisierung der Diagnose-Sensoren
+                            async_dispatcher_send(self._hass, f"net4home_diagnostic_update_{device_id}")
+                        else:
+                            _LOGGER.warning(f"Device {device_id} not found in api.devices, cannot store run time")
+                        _LOGGER.debug(f"OUT_HW_NR_IS_JAL identified: {device_id} - CH{b1} - State change {bool(b7)} - Run time: {t1}s")
+                    except Exception as e:
+                        _LOGGER.error(f"Error during registration of COVER device (channel) {device_id}: {e}")
+
+            elif b0 == D0_RD_SENSOR_DATA_ACK:
+
+                EE_IN_TAB_ADRFKT_LEN   = 5
+                EE_IN_TAB_ADR_OFFSET   = 0
+                EE_IN_TAB_FKT_OFFSET   = 2
+
+                EE_OFFSET_PIN_IS       = 0 + 2
+                EE_OFFSET_FKT1         = EE_OFFSET_PIN_IS + 1
+                EE_OFFSET_FKT2         = EE_OFFSET_FKT1   + EE_IN_TAB_ADRFKT_LEN
+                EE_OFFSET_ADR          = EE_OFFSET_FKT2   + EE_IN_TAB_ADRFKT_LEN
+                EE_OFFSET_MEM_STATE    = EE_OFFSET_ADR    + 2
+
+                EE_OFFSET_TIMER                 = EE_OFFSET_MEM_STATE + 1
+                EE_NCNO_INV                     = EE_OFFSET_TIMER     + 2
+                EE_OFFSET_FKT3                  = EE_NCNO_INV         + 1
+                EE_OFFSET_FKT4                  = EE_OFFSET_FKT3      + 5
+
+                # Check minimum required length (need at least EE_OFFSET_ADR+2 for objadr)
+                # EE_OFFSET_ADR = 13, so we need at least 15 bytes
+                min_required = EE_OFFSET_ADR + 2
+                if len(paket.ddata) < min_required:
+                    _LOGGER.warning(f"D0_RD_SENSOR_DATA_ACK packet too short: {len(paket.ddata)} bytes, need at least {min_required} bytes")
+                    return
+
+                pin_typ = paket.ddata[EE_OFFSET_PIN_IS]
+                #_LOGGER.debug(f"D0_RD_SENSOR_DATA_ACK identified: Typ: {pin_typ} - {' '.join(f'{b:02X}' for b in paket.ddata)}")
+
+                channel = paket.ddata[1] + 1
+                function_count, _ = get_function_and_address_count(pin_typ)
+
+                objadr = paket.ddata[EE_OFFSET_ADR]*256+paket.ddata[EE_OFFSET_ADR+1]
+
+                # EE_NCNO_INV is optional - only available in longer packets (19+ bytes)
+                # For shorter packets (like UP-RF with 15 bytes), default to False
+                if len(paket.ddata) >= EE_NCNO_INV + 1:
+                    detected_inverted = bool(paket.ddata[EE_NCNO_INV])
+                else:
+                    detected_inverted = False
+
+                #_LOGGER.debug(f"Erkannte objadr: {objadr} (Offset {EE_OFFSET_ADR})")
+
+                device_id = f"OBJ{objadr:05d}"
+                via_device = f"MI{paket.ipsrc:04X}"
+                device_obj = self.devices.get(via_device)
+
+                # Wenn das MI-Device nicht existiert, erstelle es automatisch
+                # (kann passieren, wenn die Abfrage von einem externen Programm kommt)
+                if not device_obj:
+                    _LOGGER.warning(
+                        f"MI device {via_device} not found when registering OBJ device {device_id}. "
+                        f"Creating MI device automatically."
+                    )
+                    # Erstelle ein minimales MI-Device
+                    await register_device_in_registry(
+                        hass=self._hass,
+                        entry=self._entry,
+                        device_id=via_device,
+                        name=via_device,
+                        model="Unknown",
+                        sw_version="",
+                        hw_version="",
+                        device_type="module",
+                        via_device="",
+                        api=self,
+                        objadr=None,
+                    )
+                    device_obj = self.devices.get(via_device)
+                    if device_obj:
+                        _LOGGER.info(f"Created MI device {via_device} for OBJ device {device_id}")
+                    else:
+                        _LOGGER.error(f"Failed to create MI device {via_device}")
+                        return
+
+                #_LOGGER.debug(f"D0_RD_SENSOR_DATA_ACK → model: {device_id}, objadr: {objadr}, via: {via_device}, model: {getattr(device_obj, 'model', 'UNKNOWN')}")
+
+                is_sensor = False
+                if device_obj and device_obj.model in ('UP-S4',):
+                    is_sensor = True
+
+                if is_sensor:
+                    try:
+                        _LOGGER.debug(
+                            f"Registering OBJ sensor device {device_id} with via_device={via_device}, "
+                            f"parent_exists={via_device in self.devices}"
+                        )
+                        await register_device_in_registry(
+                            hass=self._hass,
+                            entry=self._entry,
+                            device_id=device_id,
+                            name=f"CH{channel}_{device_id[3:]}",
+                            model="Sensor",
+                            sw_version="",
+                            hw_version="",
+                            device_type="binary_sensor",
+                            via_device=via_device,
+                            api=self,
+                            objadr=objadr,
+                            inverted=detected_inverted,  
+                        )
+                        #_LOGGER.debug(f"SENSOR registration for  → model: {device_id}, objadr: {objadr}, via: {via_device}, model: {getattr(device_obj, 'model', 'UNKNOWN')}")
+                    except Exception as e:
+                        _LOGGER.error(f"Error during SENSOR registration for {device_id}: {e}", exc_info=True)
+
+                # For UP-RF devices, we don't register OBJ addresses as separate devices
+                # The RF-Key sensor will be created directly on the MI device
+                if device_obj and device_obj.model in ('UP-RF', 'UP-RF-S4AR1'):
+                    # Store OBJ address mapping for RF-Key message routing
+                    # We'll map OBJ addresses to the parent MI device in D0_VALUE_ACK handler
+                    _LOGGER.debug(f"UP-RF sensor object address detected: {device_id} (OBJ={objadr}) for {via_device}, channel: {channel}")
+
+            elif b0 == D0_SENSOR_ACK:
+                # _LOGGER.debug(f"D0_SENSOR_ACK identified: Typ: {paket.ddata[1]} - {' '.join(f'{b:02X}' for b in paket.ddata)}")
+                device_id = f"OBJ{paket.objsrc:05d}"
+                device = self.devices.get(device_id)
+
+                if not device:
+                    return
+
+                is_closed = paket.ddata[2] == 1
+
+                _LOGGER.debug(f"D0_ACTOR_ACK for {device_id}: {is_closed}")
+                self._publish_state(device_id, is_closed)
+
+            elif b0 == D0_RD_MODULSPEC_DATA_ACK:
+                _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK identified: Typ: {paket.ddata[1]} - {' '.join(f'{b:02X}' for b in paket.ddata)}")
+
+                b1  = paket.ddata[1] 
+                obj_heat = None
+                obj_cool = None
+                presetday = None
+                presetnight = None
+
+                # Initialize b2 and b3 in case they are used later
+                b2 = None
+                b3 = None
+
+                device_id = f"MI{paket.ipsrc:04X}"
+                device = self.devices.get(device_id)
+                if not device:
+                    _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK: Device {device_id} not found")
+                    return
+
+                model = device.model or ""
+                objadr = device.objadr if device else None
+
+                # Module-specific evaluation based on device.model
+                # See docs/modulspec.md for details
+
+                # 1. UP-TLH / UP-T: Spezielle Indizes und Sensoren
+                if model in ('UP-TLH', 'UP-T'):
+                    _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH")
+                    # Special indices (0xF0, 0xF1) only for UP-TLH/UP-T
+                    if b1 == 0xF0:  # Tag/Nachtwert (UP-TLH/UP-T)
+                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> F0")
+                        if len(paket.ddata) >= 6:
+                            # Laut Dokumentation: Tagwert = (ddata[2] * 256 + ddata[3]) / 10.0
+                            # ddata[2] = Tagwert High, ddata[3] = Tagwert Low
+                            # Nachtwert = (ddata[4] * 256 + ddata[5]) / 10.0
+                            # ddata[4] = Nachtwert High, ddata[5] = Nachtwert Low
+                            presetday = (paket.ddata[2] * 256 + paket.ddata[3]) / 10.0
+                            presetnight = (paket.ddata[4] * 256 + paket.ddata[5]) / 10.0
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK 0xF0 for {device_id}: presetday={presetday}°C, presetnight={presetnight}°C")
+                            # Send updates to climate device and individual sensors
+                            self._publish_state(device_id, {"presetday": presetday, "presetnight": presetnight})
+                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}_presetday", presetday)
+                            async_dispatcher_send(self._hass, f"net4home_update_{device_id}_presetnight", presetnight)
+                        else:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for 0xF0: {len(paket.ddata)} bytes")
+                        return
+
+                    if b1 == 0xF1:  # Heat/Cool Objektadressen (UP-TLH/UP-T)
+                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> F1")
+                        if len(paket.ddata) >= 10:
+                            b2 = paket.ddata[2]
+                            b3 = paket.ddata[3]
+                            b6 = paket.ddata[6]  # heat (hi)
+                            b7 = paket.ddata[7]  # heat (lo)
+                            b8 = paket.ddata[8]  # cool (hi)
+                            b9 = paket.ddata[9]  # cool (lo)
+                            objadr = (b2 << 8) + b3
+                            obj_heat = (b6 << 8) + b7
+                            obj_cool = (b8 << 8) + b9
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK 0xF1: objadr={objadr}, obj_heat={obj_heat}, obj_cool={obj_cool}")
+                            # Store objadr in device object for later use when b1 < 0x80
+                            device.objadr = objadr
+                            self.address_filter.add_device(device)
+
+                            # Sende D0_REQ an die Basisadresse, um targettemp zu lesen
+                            # Laut Dokumentation: D0_REQ, 0, 0 → Sollwert-Objektadresse (objadr + 0)
+                            await self._packet_sender.send_raw_command(
+                                ipdst=objadr,
+                                ddata=bytes([D0_REQ, 0x00, 0x00]),
+                                objsource=self._objadr,
+                                mi=self._mi,
+                            )
+                            _LOGGER.debug(f"Sent D0_REQ for targettemp to {device_id} (OBJ={objadr}) after 0xF1")
+                        else:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for 0xF1: {len(paket.ddata)} bytes")
+                        return
+
+                    # UP-TLH / UP-T: Sensors (b1 < 0x80: Index 0, 1, 2 for Temp, Lux, Humidity)
+                    # IMPORTANT: objadr must come from the 0xF1 packet (stored in device.objadr)
+                    if b1 < 0x80:
+                        # Use objadr from device.objadr (was set at 0xF1)
+                        if device.objadr is None:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK UP-TLH/UP-T b1={b1:02X}: objadr not yet set (0xF1 packet missing?)")
+                            return
+
+                        # Additional check: objadr must be > 0 and have a meaningful value
+                        # (objadr should normally be > 1000, but we check at least > 0)
+                        if device.objadr <= 0:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK UP-TLH/UP-T b1={b1:02X}: objadr={device.objadr} is invalid (0xF1 packet missing or wrong?)")
+                            return
+
+                        objadr = device.objadr
+                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> 80   *********************************")
+
+                        sensor_obj = objadr
+
+                        if b1 == 0:
+                            sensor_obj = objadr + 3
+                            sensor_type = "temperature"
+                        elif b1 == 1: 
+                            sensor_obj = objadr + 4
+                            sensor_type = "illuminance"
+                        elif b1 == 2: 
+                            sensor_obj = objadr + 5
+                            sensor_type = "humidity"
+                        else:
+                            return
+
+                        device_id = f"OBJ{(sensor_obj):05d}"
+
+                        if sensor_type:
+                            await register_device_in_registry(
+                        hass=self._hass,
+                        entry=self._entry,
+                        device_id=device_id,
+                        name=f"{sensor_type.capitalize()} Sensor {sensor_obj}",
+                        model="Sensor",
+                        sw_version="",
+                        hw_version="",
+                        device_type="sensor",
+                        via_device=f"MI{paket.ipsrc:04X}",
+                        api=self,
+                        objadr=sensor_obj
+                            )       
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK UP_TLH -> Register Device   *********************************")
+
+
+                            async_dispatcher_send(
+                        self._hass,
+                        f"net4home_new_device_{self._entry.entry_id}",
+                        Net4HomeDevice(
+                            device_id=device_id,
+                            name=f"{sensor_type.capitalize()} Sensor {sensor_obj}",
+                            model="Sensor",
+                            device_type="sensor",
+                            via_device=f"MI{paket.ipsrc:04X}",
+                            objadr=sensor_obj,
+                        )
+                            )
+                        return
+
+                # 1.5. HS-Time: Modul-Info (ddata[1] = $FF) - Basisadresse lesen
+                if model == "HS-Time" and b1 == 0xFF:
+                    _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK HS-Time -> FF (Modul-Info)")
+                    if len(paket.ddata) >= 5:
+                        # Laut Dokumentation: ddata[2] = Objektadresse High, ddata[3] = Objektadresse Low
+                        objadr_high = paket.ddata[2]
+                        objadr_low = paket.ddata[3]
+                        objadr = (objadr_high << 8) + objadr_low
+                        # ddata[4] = Broadcast-Index (0-7)
+                        broadcast_index = paket.ddata[4]
+                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK HS-Time 0xFF: objadr={objadr}, broadcast_index={broadcast_index}")
+                        # Speichere objadr im device Objekt
+                        device.objadr = objadr
+                        self.address_filter.add_device(device)
+
+                        # Broadcast-Intervall-Mapping (laut korrigierter Dokumentation)
+                        broadcast_intervals = {
+                            0: "Nie",
+                            1: "1 Minute",
+                            2: "5 Minuten",
+                            3: "15 Minuten",
+                            4: "30 Minuten",
+                            5: "60 Minuten",
+                            6: "2 Stunden",
+                            7: "4 Stunden",
+                            8: "8 Stunden",
+                            9: "12 Stunden",
+                            10: "24 Stunden"
+                        }
+                        broadcast_interval_str = broadcast_intervals.get(broadcast_index, f"Unbekannt ({broadcast_index})")
+
+                        # Sende Broadcast-Intervall direkt an das MI-Device (wie bei UP-TLH)
+                        # WICHTIG: sensor_key ist "broadcast interval" (mit Leerzeichen), aber Dispatcher-Key verwendet slugify
+                        dispatcher_key_dict = f"net4home_update_{device_id}"
+                        dispatcher_key_sensor = f"net4home_update_{device_id}_{slugify('broadcast interval')}"
+                        async_dispatcher_send(self._hass, dispatcher_key_dict, {"broadcast interval": broadcast_interval_str})
+                        async_dispatcher_send(self._hass, dispatcher_key_sensor, broadcast_interval_str)
+                        _LOGGER.debug(f"HS-Time: Broadcast Interval for {device_id}: index={broadcast_index}, value='{broadcast_interval_str}', keys: {dispatcher_key_dict}, {dispatcher_key_sensor}")
+
+                        # Store Sunrise/Sunset object addresses for later D0_VALUE_REQ queries
+                        sunrise_objadr = objadr + 17
+                        sunset_objadr = objadr + 18
+
+                        # Send D0_VALUE_REQ for Sunrise and Sunset (values are stored directly on MI device)
+                        await self._packet_sender.send_raw_command(
+                            ipdst=sunrise_objadr,
+                            ddata=bytes([D0_VALUE_REQ, 0x00, 0x00]),
+                            objsource=self._objadr,
+                            mi=self._mi,
+                        )
+                        await asyncio.sleep(0.1)
+                        await self._packet_sender.send_raw_command(
+                            ipdst=sunset_objadr,
+                            ddata=bytes([D0_VALUE_REQ, 0x00, 0x00]),
+                            objsource=self._objadr,
+                            mi=self._mi,
+                        )
+                        _LOGGER.debug(f"HS-Time: Sent D0_VALUE_REQ for Sunrise/Sunset (objadr={objadr}, sunrise={sunrise_objadr}, sunset={sunset_objadr})")
+                    else:
+                        _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for HS-Time 0xFF: {len(paket.ddata)} bytes")
+                    return
+
+                # 1.6. LCD3 (UP-LCD): b1..b2 = Adresse (Big Endian), $FFFF = Kapazitäts-Info
+                # IMPORTANT: Check LCD BEFORE SensorConfig/PIR to avoid conflicts with b1 == 0
+                elif model and 'LCD' in model.upper():
+                    _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 for {device_id}: model={model}, ddata_len={len(paket.ddata)}, ddata[0:5]={[hex(b) for b in paket.ddata[:5]]}")
+                    if len(paket.ddata) >= 3:
+                        adr_insert = paket.ddata[1] * 256 + paket.ddata[2]  # Big Endian
+                        _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 for {device_id}: adr_insert={adr_insert:04X}")
+                        if adr_insert == 0xFFFF:
+                            # Capacity info
+                            if len(paket.ddata) >= 11:
+                                size_cfg = (paket.ddata[3] << 8) | paket.ddata[4]  # Big Endian
+                                size_strn = (paket.ddata[5] << 8) | paket.ddata[6]  # Big Endian
+                                size_str = (paket.ddata[7] << 8) | paket.ddata[8]  # Big Endian
+                                size_node = (paket.ddata[9] << 8) | paket.ddata[10]  # Big Endian
+                                _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 capacity for {device_id}: "
+                                            f"SizeCfg={size_cfg}, SizeStrN={size_strn}, SizeStr={size_str}, SizeNODE={size_node}")
+                            else:
+                                _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for LCD3 Kapazität: {len(paket.ddata)} bytes")
+                        elif adr_insert == 0:
+                            # Zeile 0: Konfiguration (TCfg_LCD3)
+                            # Byte 0-1: adrUK (Basis-Objektadresse, Big Endian)
+                            # Paketstruktur: ddata[0] = Befehl, ddata[1-2] = Adresse (Big Endian), ddata[3-34] = 32 Bytes Daten
+                            # Mindestens 5 Bytes benötigt (Befehl + Adresse + erste 2 Bytes der Daten für adrUK)
+                            if len(paket.ddata) >= 5:
+                                # ddata[3:5] = adrUK (Big Endian) - erste 2 Bytes der Konfiguration
+                                adr_uk = (paket.ddata[3] << 8) | paket.ddata[4]  # Big Endian
+                                device.objadr = adr_uk
+                                self.address_filter.add_device(device)
+                                _LOGGER.info(f"D0_RD_MODULSPEC_DATA_ACK LCD3 config (line 0) for {device_id}: adrUK={adr_uk:04X} (OBJ={adr_uk}), packet_len={len(paket.ddata)} bytes")
+
+                                # Send signal to add LCD buttons if not already present
+                                async_dispatcher_send(self._hass, f"net4home_device_updated_{self._entry.entry_id}", device_id)
+
+                                # Save objadr to config entry for persistence
+                                try:
+                                    devices = dict(self._entry.options.get("devices", {}))
+                                    if device_id in devices:
+                                        devices[device_id]["objadr"] = adr_uk
+                                        new_options = dict(self._entry.options)
+                                        new_options["devices"] = devices
+                                        self._hass.config_entries.async_update_entry(self._entry, options=new_options)
+                                        _LOGGER.debug(f"Saved objadr={adr_uk} for {device_id} to config entry")
+                                except Exception as e:
+                                    _LOGGER.error(f"Failed to save objadr for {device_id}: {e}")
+                            else:
+                                _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for LCD3 config: {len(paket.ddata)} bytes (need at least 5 bytes for adrUK)")
+                        else:
+                            # Normal line data (other lines)
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK LCD3 line for {device_id}: adr={adr_insert:04X}")
+                    else:
+                        _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for LCD3: {len(paket.ddata)} bytes")
+                    return
+
+                # 5. IR_TX: b1 = $FF = Modul-Info, b1 < $80 = Tabelle, b1 >= $C0 = MaxPower
+                elif model and 'IR' in model.upper() and 'TX' in model.upper():
+                    if b1 == 0xFF:
+                        # Modul-Info
+                        if len(paket.ddata) >= 6:
+                            tab_entry_count = paket.ddata[2]
+                            adr_obj_ir = paket.ddata[3] * 256 + paket.ddata[4]  # Little Endian
+                            tab2_entry_count = paket.ddata[5]
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK IR_TX module info for {device_id}: "
+                                        f"TabEntries={tab_entry_count}, ObjAdr={adr_obj_ir}, Tab2Entries={tab2_entry_count}")
+                        else:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for IR_TX Modul-Info: {len(paket.ddata)} bytes")
+                    elif b1 < 0x80:
+                        # Haupttabelle
+                        if len(paket.ddata) >= 26:
+                            tab_index = b1
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK IR_TX table for {device_id}: Index={tab_index}")
+                            # Table data can be stored for later use
+                        else:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for IR_TX Tabelle: {len(paket.ddata)} bytes")
+                    elif b1 >= 0xC0:
+                        # MaxPower-Tabelle
+                        if len(paket.ddata) >= 34:
+                            tab2_index = b1 - 0xC0
+                            _LOGGER.debug(f"D0_RD_MODULSPEC_DATA_ACK IR_TX MaxPower for {device_id}: Index={tab2_index}")
+                            # Table data can be stored for later use
+                        else:
+                            _LOGGER.warning(f"D0_RD_MODULSPEC_DATA_ACK packet too short for IR_TX MaxPower: {len(paket.ddata)} bytes")
+                    return
+
+            elif b0 == D0_VALUE_ACK:
+                    device_id = f"OBJ{paket.objsrc:05d}"
+                    # _LOGGER.debug(f"D0_VALUE_ACK for {device_id} – Type: {paket.ddata[1]}")
+
+                    # Check if packet has enough data (need at least 5 bytes for sensor values)
+                    if len(paket.ddata) < 5:
+                        _LOGGER.warning(f"D0_VALUE_ACK packet too short: {len(paket.ddata)} bytes, expected at least 5")
+                        return
+
+                    if paket.ddata[1] == IN_HW_NR_IS_TEMP:
+                        i_analog_value = paket.ddata[3] * 256 + paket.ddata[4]
+                        if i_analog_value > 0x8000:
+                            i_analog_value -= 0x10000
+                        i_analog_value = (i_analog_value * 10) // 16
+                        value = round(i_analog_value / 10, 1)
+                        sensor_type = "temperature"
+                        dispatcher_key = f"net4home_update_{device_id}_{sensor_type}"
+                        async_dispatcher_send(self._hass, dispatcher_key, value)
+                        self.state_store.set(paket.objsrc, sensor_type, value)
+                        #_LOGGER.debug(f"_temperature D0_VALUE_ACK for {dispatcher_key} – Value: {value}")
+
+                    elif paket.ddata[1] == IN_HW_NR_IS_HUMIDITY:
+                        value = paket.ddata[3] * 256 + paket.ddata[4]
+                        sensor_type = "humidity"
+                        dispatcher_key = f"net4home_update_{device_id}_{sensor_type}"
+                        async_dispatcher_send(self._hass, dispatcher_key, value)
+                        self.state_store.set(paket.objsrc, sensor_type, value)
+                        #_LOGGER.debug(f"_humidity D0_VALUE_ACK for {dispatcher_key} – Value: {value}")
+
+                    elif paket.ddata[1] == IN_HW_NR_IS_LICHT_ANALOG:
+                        value = paket.ddata[3] * 256 + paket.ddata[4]
+                        sensor_type = "illuminance"
+                        dispatcher_key = f"net4home_update_{device_id}_{sensor_type}"
+                        async_dispatcher_send(self._hass, dispatcher_key, value)
+                        self.state_store.set(paket.objsrc, sensor_type, value)
+                        #_LOGGER.debug(f"_illuminance D0_VALUE_ACK for {dispatcher_key} – Value: {value}")
+
+                    # HS-Time: Sonnenaufgang (VAL_IS_MIN_TAG_WORD_SA = 50)
+                    elif paket.ddata[1] == VAL_IS_MIN_TAG_WORD_SA:
+                        # Laut Dokumentation: ddata[2] = Minuten Low, ddata[3] = Minuten High
+                        # Berechnung: Sonnenaufgang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
+                        # Finde das HS-Time MI-Device (Sunrise kommt von objadr + 17)
+                        device_id_from_ipsrc = f"MI{paket.ipsrc:04X}"
+                        mi_device = self.get_known_device(device_id_from_ipsrc)
+
+                        if mi_device and mi_device.model == "HS-Time":
+                            if len(paket.ddata) >= 4:
+                                # Laut korrigierter Dokumentation (hs-time.md):
+                                # ddata[2] = Minuten Low, ddata[3] = Minuten High
+                                # Berechnung: Sonnenaufgang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
+                                # Die Original-Implementierung interpretiert es falsch als direkt Stunden:Minuten
+                                minutes_low = paket.ddata[2]
+                                minutes_high = paket.ddata[3]
+                                minutes_since_midnight = minutes_high * 256 + minutes_low
+                                # Konvertiere Minuten seit Mitternacht zu Stunden:Minuten Format
+                                hours = minutes_since_midnight // 60
+                                minutes = minutes_since_midnight % 60
+                                # Wert als Zeit-String formatieren (z.B. "06:30")
+                                value = f"{hours:02d}:{minutes:02d}"
+
+                                # Sende direkt an das MI-Device (wie bei UP-TLH)
+                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}", {"sunrise": value})
+                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}_sunrise", value)
+                                _LOGGER.debug(f"HS-Time Sunrise for {device_id_from_ipsrc}: {value} ({minutes_since_midnight} minutes since midnight, raw: ddata[2]=0x{minutes_low:02X}={minutes_low}, ddata[3]=0x{minutes_high:02X}={minutes_high})")
+                            else:
+                                _LOGGER.warning(f"D0_VALUE_ACK packet too short for HS-Time Sunrise: {len(paket.ddata)} bytes")
+                        else:
+                            _LOGGER.warning(f"HS-Time Sunrise: MI device {device_id_from_ipsrc} not found or not HS-Time")
+
+                    # HS-Time: Sonnenuntergang (VAL_IS_MIN_TAG_WORD_SU = 51)
+                    elif paket.ddata[1] == VAL_IS_MIN_TAG_WORD_SU:
+                        # Laut Dokumentation: ddata[2] = Minuten Low, ddata[3] = Minuten High
+                        # Berechnung: Sonnenuntergang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
+                        # Finde das HS-Time MI-Device (Sunset kommt von objadr + 18)
+                        device_id_from_ipsrc = f"MI{paket.ipsrc:04X}"
+                        mi_device = self.get_known_device(device_id_from_ipsrc)
+
+                        if mi_device and mi_device.model == "HS-Time":
+                            if len(paket.ddata) >= 4:
+                                # Laut korrigierter Dokumentation (hs-time.md):
+                                # ddata[2] = Minuten Low, ddata[3] = Minuten High
+                                # Berechnung: Sonnenuntergang_Zeit = (ddata[3] * 256 + ddata[2]) Minuten seit Mitternacht
+                                # Die Original-Implementierung interpretiert es falsch als direkt Stunden:Minuten
+                                minutes_low = paket.ddata[2]
+                                minutes_high = paket.ddata[3]
+                                minutes_since_midnight = minutes_high * 256 + minutes_low
+                                # Konvertiere Minuten seit Mitternacht zu Stunden:Minuten Format
+                                hours = minutes_since_midnight // 60
+                                minutes = minutes_since_midnight % 60
+                                # Wert als Zeit-String formatieren (z.B. "18:30")
+                                value = f"{hours:02d}:{minutes:02d}"
+
+                                # Sende direkt an das MI-Device (wie bei UP-TLH)
+                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}", {"sunset": value})
+                                async_dispatcher_send(self._hass, f"net4home_update_{device_id_from_ipsrc}_sunset", value)
+                                _LOGGER.debug(f"HS-Time Sunset for {device_id_from_ipsrc}: {value} ({minutes_since_midnight} minutes since midnight, raw: ddata[2]=0x{minutes_low:02X}={minutes_low}, ddata[3]=0x{minutes_high:02X}={minutes_high})")
+                            else:
+                                _LOGGER.warning(f"D0_VALUE_ACK packet too short for HS-Time Sunset: {len(paket.ddata)} bytes")
+                        else:
+                            _LOGGER.warning(f"HS-Time Sunset: MI device {device_id_from_ipsrc} not found or not HS-Time")
+
+                    elif paket.ddata[1] == IN_HW_NR_IS_RF_TAG_READER:
+                        # Check if packet has enough data (need at least 10 bytes: indices 0-9)
+                        if len(paket.ddata) < 10:
+                            _LOGGER.warning(f"RF-Key packet too short: {len(paket.ddata)} bytes, expected at least 10")
+                            return
+
+                        # Extract 5-byte RF-Key code (40-bit)
+                        rf_key_bytes = paket.ddata[3:8]
+                        rf_key_hex = ''.join(f'{b:02X}' for b in rf_key_bytes)
+
+                        # Extract state from ddata[9]
+                        tag_state = paket.ddata[9] & 6
+                        if tag_state == 0:
+                            state = "short_hold"
+                        elif tag_state == 2:
+                            state = "long_hold"
+                        elif tag_state == 4:
+                            state = "removed_after_short"
+                        else:
+                            state = "unknown"
+
+                        # Map OBJ address to parent MI device for RF-Key messages
+                        # RF-Key sensor should be on the main MI device, not on OBJ child devices
+                        via_device_id = f"MI{paket.ipsrc:04X}"
+                        parent_device = self.devices.get(via_device_id)
+
+                        if parent_device and parent_device.device_type == "rf_reader":
+                            # Send update to the parent MI device, not the OBJ address
+                            dispatcher_key = f"net4home_update_{via_device_id}_rf_key"
+                            async_dispatcher_send(self._hass, dispatcher_key, {
+                                "rf_key": rf_key_hex,
+                                "state": state
+                            })
+                            _LOGGER.debug(f"RF-Key detected: {rf_key_hex} ({state}) from OBJ {device_id}, mapped to {via_device_id}")
+
+                            # Fire Home Assistant event for automation triggers
+                            self._hass.bus.async_fire(
+                                "net4home_rf_key_detected",
+                                {
+                                    "device_id": via_device_id.upper(),
+                                    "device_name": parent_device.name if parent_device else via_device_id,
+                                    "rf_key": rf_key_hex,
+                                    "state": state,
+                                    "rf_key_bytes": rf_key_bytes.hex(),
+                                }
+                            )
+                        else:
+                            # Fallback: use OBJ address if parent not found
+                            dispatcher_key = f"net4home_update_{device_id}_rf_key"
+                            async_dispatcher_send(self._hass, dispatcher_key, {
+                                "rf_key": rf_key_hex,
+                                "state": state
+                            })
+                        _LOGGER.debug(f"RF-Key detected: {rf_key_hex} ({state}) from {device_id} (parent not found)")
+
+                        # Fire Home Assistant event for automation triggers
+                        fallback_device = self.devices.get(device_id)
+                        self._hass.bus.async_fire(
+                            "net4home_rf_key_detected",
+                            {
+                                "device_id": device_id.upper(),
+                                "device_name": fallback_device.name if fallback_device else device_id,
+                                "rf_key": rf_key_hex,
+                                "state": state,
+                                "rf_key_bytes": rf_key_bytes.hex(),
+                            }
+                        )
+
+            elif b0 == D0_STATUS_INFO:
+                    device_id = f"OBJ{paket.objsrc:05d}"
+
+                    # Check if packet has enough data
+                    if len(paket.ddata) < 4:
+                        _LOGGER.warning(f"STATUS_INFO packet too short: {len(paket.ddata)} bytes, expected at least 4")
+                        return
+
+                    is_on = paket.ddata[2] == 1
+
+                    if paket.ddata[3] == OUT_HW_NR_IS_DIMMER:
+                        is_on = paket.ddata[2] >> 7
+                        brightness_value = round((paket.ddata[2] & 0x7F) * 255 / 100)
+                        _LOGGER.debug(f"STATUS_INFO for {device_id}: {'ON' if is_on else 'OFF'} {brightness_value}%")
+                        self.confirmations.confirm(device_id, {"is_on": is_on, "brightness": brightness_value})
+                        self._publish_state(
+                            device_id,
+                            {
+                                "is_on": is_on,
+                                "brightness": brightness_value
+                            }
+                        )
+                    else:
+                        # _LOGGER.debug(f"STATUS_INFO for {device_id}: {'ON' if is_on else 'OFF'}")
+                        self.confirmations.confirm(device_id, is_on)
+                        self._publish_state(device_id, is_on)
+
+            elif b0 in {D0_SET, D0_INC, D0_DEC, D0_TOGGLE}:
+                    # _LOGGER.debug(f"D0_xxx from OBJ{paket.objsrc:05d} to {paket.ipdest} – Command: {paket.ddata[0]}")
+                    self.passive_tracker.handle_command(paket)
+
     async def async_turn_on_switch(self, device_id: str):
         """Send an ON signal to the specified switch device."""
         try:
@@ -1756,6 +1948,7 @@ class Net4HomeApi:
             model = device.model
             
             if model == "Schalter":
+                self.confirmations.expect(device_id, True, lambda: self.async_turn_on_switch(device_id))
                 await self._packet_sender.send_raw_command(
                     ipdst=objadr,
                     ddata=bytes([D0_SET, 0x64, 0x00]),  
@@ -1764,6 +1957,8 @@ class Net4HomeApi:
                 )
                 _LOGGER.debug(f"Switch command ON sent to {device_id} (OBJ={objadr})")
             elif model == "Timer":
+                # A second toggle would switch the timer off again, confirm with D0_REQ only
+                self.confirmations.expect(device_id, True, None)
                 await self._packet_sender.send_raw_command(
                     ipdst=objadr,
                     ddata=bytes([D0_TOGGLE , 0x00, 0x00]),  
@@ -1790,6 +1985,7 @@ class Net4HomeApi:
                 _LOGGER.warning(f"No objadr for {device_id}")
                 return
 
+            self.confirmations.expect(device_id, False, lambda: self.async_turn_off_switch(device_id))
             await self._packet_sender.send_raw_command(
                 ipdst=objadr,
                 ddata=bytes([D0_SET, 0x00, 0x00]), 
@@ -2007,6 +2203,7 @@ class Net4HomeApi:
                 _LOGGER.warning(f"No objadr for {device_id}")
                 return
 
+            self.confirmations.expect(device_id, False, lambda: self.async_open_cover(device_id))
             await self._packet_sender.send_raw_command(
                 ipdst=objadr,
                 ddata=bytes([D0_SET, 0x03, 0x00]), 
@@ -2033,6 +2230,7 @@ class Net4HomeApi:
                 _LOGGER.warning(f"No objadr for {device_id}")
                 return
 
+            self.confirmations.expect(device_id, True, lambda: self.async_close_cover(device_id))
             await self._packet_sender.send_raw_command(
                 ipdst=objadr,
                 ddata=bytes([D0_SET, 0x01, 0x00]), 
@@ -2085,7 +2283,13 @@ class Net4HomeApi:
             _LOGGER.warning(f"No objadr for light {device_id}")
             return
         brightness100 = round(brightness * 100 / 255)
-        await self._packet_sender.send_raw_command(
+        self.confirmations.expect(
+            device_id,
+            {"is_on": True, "brightness": brightness},
+            lambda: self.async_turn_on_light(device_id, brightness),
+        )
+        # Slider moves produce many values, only the newest is sent per window
+        await self.coalescer.async_send(
             ipdst=objadr,
             ddata=bytes([D0_SET, brightness100, 0x00]),
             objsource=self._objadr,
@@ -2144,8 +2348,11 @@ class Net4HomeApi:
             _LOGGER.warning(f"No objadr for light {device_id}")
             return
 
+        self.confirmations.expect(device_id, {"is_on": False}, lambda: self.async_turn_off_light(device_id))
+
         # Example command: Turn off (adjust according to device)
-        await self._packet_sender.send_raw_command(
+        # Same coalescer as turn on, so a queued brightness cannot overtake the off command
+        await self.coalescer.async_send(
             ipdst=objadr,
             ddata=bytes([D0_SET, 0x00, 0x00]),  # Beispiel OFF-Befehl
             objsource=self._objadr,
@@ -2241,7 +2448,7 @@ class Net4HomeApi:
         """Get a known device by device_id."""
         device = self.devices.get(device_id)
         if not device:
-            _LOGGER.warning(f"Unknown device: {device_id}")
+            _LOGGER.debug(f"Unknown device: {device_id}")
         return device
 
     async def async_set_climate_mode(self, device_id: str, hvac_mode: str, target_temp: float = None):
@@ -2302,7 +2509,10 @@ class Net4HomeApi:
         hi = (temp_val >> 8) & 0xFF
         lo = temp_val & 0xFF
 
-        await self._packet_sender.send_raw_command(
+        # Show the new target temperature immediately, the module confirms with D0_ACTOR_ACK
+        self.confirmations.expect(device_id, {"targettemp": temperature}, lambda: self.async_set_temperature(device_id, temperature))
+
+        await self.coalescer.async_send(
             ipdst=objadr,
             ddata=bytes([D0_SET, hi, lo]),
             objsource=self._objadr,
@@ -2312,13 +2522,6 @@ class Net4HomeApi:
             f"Set target temperature {temperature:.1f}°C "
             f"(raw={temp_val}, hi=0x{hi:02X}, lo=0x{lo:02X}) for {device_id} (OBJ={objadr})"
         )
-        
-        # Immediately update the climate entity with the new target temperature
-        # This provides instant feedback without waiting for the bus response
-        if device.device_type == 'climate':
-            update_data = {"targettemp": temperature}
-            async_dispatcher_send(self._hass, f"net4home_update_{device_id}", update_data)
-            _LOGGER.debug(f"Sent immediate update for targettemp={temperature:.1f}°C to {device_id}")
 
     # ========== Detail Retrieval Queue Management ==========
     
@@ -2388,6 +2591,11 @@ class Net4HomeApi:
                     await asyncio.sleep(0.5)  # Check every 500ms
                     continue
                 
+                # No detail requests while the session is not usable
+                if not self.connection.is_ready:
+                    await asyncio.sleep(0.5)
+                    continue
+
                 # Initial delay beim ersten Start (nur wenn ENUM_ALL nicht aktiv war)
                 if not initial_delay_applied:
                     _LOGGER.debug(f"Applying initial delay of {self._detail_initial_delay} seconds")
@@ -2704,3 +2912,125 @@ class Net4HomeApi:
         except Exception as e:
             _LOGGER.error(f"Failed to save detail_status for {device_id}: {e}")
 
+    # ========== Device Index / Platforms ==========
+
+    def add_device(self, device: Net4HomeDevice):
+        """Add a device to api.devices and the per-type index."""
+        self.devices[device.device_id] = device
+        self._devices_by_type.setdefault(device.device_type, {})[device.device_id] = device
+        self.address_filter.add_device(device)
+
+    def add_devices(self, devices):
+        """Add many devices at once (startup)."""
+        for device in devices:
+            self.add_device(device)
+
+    def devices_of_type(self, device_type: str) -> list[Net4HomeDevice]:
+        """Return all devices of a device type."""
+        return list(self._devices_by_type.get(device_type, {}).values())
+
+    def required_platforms(self) -> set[str]:
+        """Return the platforms that have at least one device."""
+        # Connection diagnostics (reconnect circuit breaker, outage) are sensors
+        platforms: set[str] = {"sensor"}
+        for device in self.devices.values():
+            platforms |= platforms_for_device(device)
+        return platforms
+
+    async def async_ensure_platforms(self, device: Net4HomeDevice):
+        """Forward the platforms of a newly discovered device type on demand."""
+        if self._entry is None or platforms_for_device(device) <= self.loaded_platforms:
+            return
+
+        async with self._platform_lock:
+            missing = platforms_for_device(device) - self.loaded_platforms
+            if not missing:
+                return
+            # Mark as loaded first, devices discovered meanwhile must not forward twice
+            self.loaded_platforms |= missing
+            _LOGGER.info(f"Loading platforms {sorted(missing)} on demand for {device.device_id} ({device.device_type})")
+            config_entries = self._hass.config_entries
+            forward = getattr(config_entries, "async_late_forward_entry_setups", None)
+            if forward is None:
+                forward = config_entries.async_forward_entry_setups
+            try:
+                await forward(self._entry, sorted(missing))
+            except Exception as e:
+                self.loaded_platforms -= missing
+                _LOGGER.error(f"Error loading platforms {sorted(missing)}: {e}")
+
+    # ========== State Snapshot ==========
+
+    def _publish_state(self, device_id: str, payload):
+        """Remember the decoded state of a device and dispatch it to its entities."""
+        previous = self.last_states.get(device_id)
+        if isinstance(payload, dict) and isinstance(previous, dict):
+            # Partial updates (e.g. climate presets) are merged into the known state
+            self.last_states[device_id] = {**previous, **payload}
+        else:
+            self.last_states[device_id] = payload
+        device = self.devices.get(device_id)
+        if device is not None and device.objadr is not None:
+            self.state_store.update_from_payload(device.objadr, payload)
+        self.resync.mark_answered(device_id)
+        async_dispatcher_send(self._hass, f"net4home_update_{device_id}", payload)
+
+    def get_last_state(self, device_id: str):
+        """Return the last known state payload of a device (or None)."""
+        return self.last_states.get(device_id)
+
+    async def async_load_snapshot(self):
+        """Restore the last known states from the snapshot file."""
+        if self._snapshot is None:
+            return
+        states = await self._snapshot.async_load()
+        # Only keep states of devices that still exist
+        self.last_states = {
+            device_id: state
+            for device_id, state in states.items()
+            if device_id in self.devices
+        }
+        _LOGGER.info(f"Restored last known state for {len(self.last_states)} devices from snapshot")
+        await self.group_index.async_load()
+
+    async def async_save_snapshot(self, *_):
+        """Write the last known states to the snapshot file."""
+        if self._snapshot is None:
+            return
+        await self._snapshot.async_save(self.last_states)
+        await self.group_index.async_save()
+
+    def async_start_snapshot_resync(self, window: float = SNAPSHOT_RESYNC_WINDOW):
+        """Re-read restored objects from the bus, spread over a long window."""
+        if self._resync_task and not self._resync_task.done():
+            return
+        self._resync_task = asyncio.create_task(self._async_snapshot_resync(window))
+
+    async def async_stop_snapshot_resync(self):
+        """Stop the background resync of restored objects."""
+        if self._resync_task and not self._resync_task.done():
+            self._resync_task.cancel()
+            try:
+                await self._resync_task
+            except asyncio.CancelledError:
+                pass
+        self._resync_task = None
+
+    async def _async_snapshot_resync(self, window: float):
+        """Request the status of every restored device, one at a time."""
+        # Devices with pending details get their status from the detail queue
+        device_ids = [
+            device_id
+            for device_id in self.last_states
+            if device_id in self.devices and self.devices[device_id].detail_status == "completed"
+        ]
+        if not device_ids:
+            return
+
+        delay = window / len(device_ids)
+        _LOGGER.debug(f"Resyncing {len(device_ids)} restored devices over {window:.0f}s ({delay:.2f}s per device)")
+        for device_id in device_ids:
+            await asyncio.sleep(delay)
+            if device_id in self.devices:
+                await self.async_request_status(device_id)
+        _LOGGER.debug("Resync of restored devices completed")
@@ -24,7 +24,7 @@ async def async_setup_entry(
     api: Net4HomeApi = hass.data[DOMAIN][entry.entry_id]
 
     _LOGGER.info(f"[BinarySensor] Starting setup_entry with {len(api.devices)} known devices")
-    binary_sensor_devices = [d for d in api.devices.values() if d.device_type == "binary_sensor"]
+    binary_sensor_devices = api.devices_of_type("binary_sensor")
     _LOGGER.info(f"[BinarySensor] Found {len(binary_sensor_devices)} binary_sensor devices: {[d.device_id for d in binary_sensor_devices]}")
 
     # ONLY BinarySensor entities (no ConfigSensor entities)
@@ -115,3 +115,8 @@ class Net4HomeBinarySensor(BinarySensorEntity):
                 self._handle_update,
             )
         )
+
+        # Restore last known state from snapshot (re-read from the bus later)
+        last_state = self.api.get_last_state(self.device.device_id)
+        if last_state is not None:
+            self._handle_update(last_state)
@@ -0,0 +1,315 @@
+"""Capture of the raw connector traffic and replay of capture files.
+
+A capture file starts with a 16 byte header (magic, version, wall-clock
+time of the capture start) followed by records:
+
+    flags (1 byte) | microseconds since capture start (8 bytes) | length (2 bytes) | data
+
+All integers are little endian. flags bit 0 marks sent data, bit 1 data of
+the standby link. Received data is stored as read from the socket (chunks,
+not frames), so a replay reproduces split and corrupt frames exactly.
+The login frame is not captured.
+
+Files are rotated like log files (capture.n4hcap, capture.n4hcap.1, ...),
+the timestamps continue across the files of one capture.
+"""
+import asyncio
+import logging
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .const import (
+    CAPTURE_FLUSH_INTERVAL,
+    CAPTURE_MAX_BYTES,
+    CAPTURE_MAX_FILES,
+    CAPTURE_MAX_PENDING,
+)
+from .transport import Net4HomeLoopbackPeer, Net4HomeTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"N4HCAP"
+CAPTURE_VERSION = 1
+_HEADER = struct.Struct("<6sBxd")
+_RECORD = struct.Struct("<BQH")
+
+RECORD_TX = 0x01
+RECORD_STANDBY = 0x02
+
+
+def capture_files(path) -> list[Path]:
+    """Return the existing files of a capture, oldest first."""
+    path = Path(path)
+    rotated = sorted(
+        (p for p in path.parent.glob(path.name + ".*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True,
+    )
+    return rotated + ([path] if path.exists() else [])
+
+
+def read_capture(path) -> Iterator[tuple[int, int, bytes]]:
+    """Yield (flags, microseconds, data) of a capture file.
+
+    A record cut off at the end (capture not stopped cleanly) is ignored.
+    """
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a net4home capture file")
+        magic, version, started = _HEADER.unpack(header)
+        if version != CAPTURE_VERSION:
+            raise ValueError(f"{path}: unsupported capture version {version}")
+        while True:
+            head = file.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            flags, micros, length = _RECORD.unpack(head)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield flags, micros, data
+
+
+def received_stream(path) -> bytes:
+    """Return the data received on the primary link of a capture (all rotated files)."""
+    return b"".join(
+        data
+        for file in capture_files(path) or [Path(path)]
+        for flags, micros, data in read_capture(file)
+        if not flags & (RECORD_TX | RECORD_STANDBY)
+    )
+
+
+class Net4HomeCapture:
+    """Record the raw received and sent data of the connector links.
+
+    record() only appends to an in-memory buffer; the buffer is written in
+    the executor every CAPTURE_FLUSH_INTERVAL seconds. If writing falls
+    behind by more than CAPTURE_MAX_PENDING bytes, records are dropped
+    (counted) instead of growing the buffer. All file operations in the
+    executor run one at a time (lock), async_stop() waits for a write that
+    is still running before it closes the file.
+    """
+
+    def __init__(self, path, max_bytes: int = CAPTURE_MAX_BYTES, max_files: int = CAPTURE_MAX_FILES):
+        """Initialize the capture; max_bytes per file, max_files incl. the current one."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_files = max(1, max_files)
+        self._started = time.monotonic()
+        self._started_wall = time.time()
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._file = None
+        self._file_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Executor job of the last flush; keeps running if the flushing task is cancelled
+        self._writing: Optional[asyncio.Future] = None
+        self.stats = {
+            "rx_records": 0,
+            "tx_records": 0,
+            "bytes": 0,
+            "dropped_records": 0,
+            "rotations": 0,
+            "write_errors": 0,
+        }
+
+    def record(self, flags: int, data: bytes) -> None:
+        """Add received or sent data to the capture."""
+        if self._pending_bytes > CAPTURE_MAX_PENDING:
+            self.stats["dropped_records"] += 1
+            return
+        micros = int((time.monotonic() - self._started) * 1_000_000)
+        record = _RECORD.pack(flags, micros, len(data)) + bytes(data)
+        self._pending.append(record)
+        self._pending_bytes += len(record)
+        self.stats["tx_records" if flags & RECORD_TX else "rx_records"] += 1
+
+    async def async_start(self) -> None:
+        """Open the capture file and start the background writer."""
+        await asyncio.get_running_loop().run_in_executor(None, self._begin)
+        self._task = asyncio.create_task(self._async_run())
+        _LOGGER.info(f"[IP] Capturing connector traffic to {self.path}")
+
+    async def async_stop(self) -> None:
+        """Write the remaining records and close the file."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._writing is not None:
+            # The write of a cancelled flush can still be running in the executor
+            await asyncio.wait([self._writing])
+            if self._writing.exception() is not None:
+                self.stats["write_errors"] += 1
+                _LOGGER.error(f"[IP] Error writing capture file {self.path}: {self._writing.exception()}")
+            self._writing = None
+        await self._async_flush()
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(None, self._close)
+        _LOGGER.info(f"[IP] Capture to {self.path} stopped ({self.stats['bytes']} bytes)")
+
+    async def _async_run(self) -> None:
+        while True:
+            await asyncio.sleep(CAPTURE_FLUSH_INTERVAL)
+            await self._async_flush()
+
+    async def _async_flush(self) -> None:
+        if not self._pending:
+            return
+        records, self._pending, self._pending_bytes = self._pending, [], 0
+        try:
+            async with self._lock:
+                self._writing = asyncio.get_running_loop().run_in_executor(None, self._write, records)
+                # Cancelling the flush must not cancel the job, async_stop() waits for it
+                await asyncio.shield(self._writing)
+                self._writing = None
+        except OSError as e:
+            self._writing = None
+            self.stats["write_errors"] += 1
+            _LOGGER.error(f"[IP] Error writing capture file {self.path}: {e}")
+
+    def _begin(self) -> None:
+        # Files of an earlier capture to the same path would be replayed with this one
+        for file in capture_files(self.path):
+            file.unlink()
+        self._open()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, self._started_wall))
+        self._file_bytes = _HEADER.size
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self._close()
+        for index in range(self.max_files - 1, 0, -1):
+            source = self.path if index == 1 else self.path.with_name(f"{self.path.name}.{index - 1}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index}"))
+        if self.max_files == 1:
+            self.path.unlink(missing_ok=True)
+        self.stats["rotations"] += 1
+        self._open()
+
+    def _write(self, records: list[bytes]) -> None:
+        for record in records:
+            if self._file_bytes + len(record) > self.max_bytes and self._file_bytes > _HEADER.size:
+                self._rotate()
+            self._file.write(record)
+            self._file_bytes += len(record)
+            self.stats["bytes"] += len(record)
+        self._file.flush()
+
+    def info(self) -> dict:
+        """Return capture statistics for diagnostics."""
+        return {
+            "path": str(self.path),
+            "max_bytes": self.max_bytes,
+            "max_files": self.max_files,
+            "duration_s": round(time.monotonic() - self._started, 1),
+            **self.stats,
+        }
+
+
+class _CaptureReader:
+    """Stream reader of a connector link that hands received data to the api's capture."""
+
+    def __init__(self, reader, api):
+        self._reader = reader
+        self._api = api
+
+    async def read(self, n: int = -1) -> bytes:
+        data = await self._reader.read(n)
+        capture = self._api.capture
+        if capture is not None and data:
+            # The standby connection becomes the primary one on failover
+            capture.record(0 if self._api._reader is self else RECORD_STANDBY, data)
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._reader, name)
+
+
+class _CaptureWriter:
+    """Stream writer of a connector link that hands sent data to the api's capture."""
+
+    def __init__(self, writer, api):
+        self._writer = writer
+        self._api = api
+
+    def write(self, data: bytes) -> None:
+        capture = self._api.capture
+        if capture is not None:
+            capture.record(RECORD_TX if self._api._writer is self else RECORD_TX | RECORD_STANDBY, data)
+        self._writer.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._writer, name)
+
+
+def wrap_link(reader, writer, api):
+    """Return reader and writer of a link that feed api.capture while it is set."""
+    return _CaptureReader(reader, api), _CaptureWriter(writer, api)
+
+
+class Net4HomeCaptureTransport(Net4HomeTransport):
+    """Feed the received data of a capture to the api, writes are discarded.
+
+    speed 1.0 replays at the recorded pace, 2.0 twice as fast, 0 as fast as
+    the api reads. `done` is set at the end, the link stays open afterwards
+    (see Net4HomeFileTransport).
+    """
+
+    def __init__(self, path, speed: float = 1.0, keep_open: bool = True):
+        """Initialize the transport; path is the (newest) file of a capture."""
+        self.path = Path(path)
+        self.speed = speed
+        self.keep_open = keep_open
+        self.peer: Optional[Net4HomeLoopbackPeer] = None
+        self.done = asyncio.Event()
+
+    async def async_open(self, host: str, port: int):
+        self.peer = Net4HomeLoopbackPeer(keep_writes=False)
+        asyncio.create_task(self._async_feed(self.peer))
+        return self.peer.reader, self.peer.writer
+
+    def _load(self) -> list[tuple[int, bytes]]:
+        return [
+            (micros, data)
+            for file in capture_files(self.path) or [self.path]
+            for flags, micros, data in read_capture(file)
+            if not flags & (RECORD_TX | RECORD_STANDBY)
+        ]
+
+    async def _async_feed(self, peer: Net4HomeLoopbackPeer) -> None:
+        records = await asyncio.get_running_loop().run_in_executor(None, self._load)
+        _LOGGER.debug(f"Replaying {len(records)} received chunks from {self.path}")
+        started = time.monotonic()
+        first = records[0][0] if records else 0
+        for micros, data in records:
+            if peer.writer.is_closing():
+                break
+            if self.speed > 0:
+                delay = (micros - first) / 1_000_000 / self.speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            peer.feed(data)
+            # Let the listener process the chunk
+            await asyncio.sleep(0)
+        self.done.set()
+        if not self.keep_open:
+            peer.close()
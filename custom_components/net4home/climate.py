@@ -21,7 +21,7 @@ async def async_setup_entry(hass, entry, async_add_entities: Callable):
     api: Net4HomeApi = hass.data[DOMAIN][entry.entry_id]
     
     _LOGGER.info(f"[Climate] Setup called with {len(api.devices)} devices in API")
-    climate_devices = [d for d in api.devices.values() if d.device_type == "climate"]
+    climate_devices = api.devices_of_type("climate")
     _LOGGER.info(f"[Climate] Found {len(climate_devices)} climate devices: {[d.device_id for d in climate_devices]}")
 
     entities = [
@@ -79,6 +79,13 @@ class Net4HomeClimate(ClimateEntity):
             via_device=(DOMAIN, self.device.via_device.upper()) if self.device.via_device else None,
         )
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return extra state attributes."""
+        return {
+            "unconfirmed": self.api.confirmations.is_unconfirmed(self.device.device_id),
+        }
+
     async def async_added_to_hass(self):
         """Register update listener when entity is added."""
         # General updates for climate device
@@ -90,6 +97,11 @@ class Net4HomeClimate(ClimateEntity):
             )
         )
 
+        # Restore last known state from snapshot (re-read from the bus later)
+        last_state = self.api.get_last_state(self.device.device_id)
+        if last_state is not None:
+            self._handle_update(last_state)
+
         # Listen for temperature updates from linked sensor
         temp_signal = f"net4home_temperature_update_{self.device.device_id}"
         _LOGGER.debug(f"{self.entity_id} listening for sensor temperature updates: {temp_signal}")
@@ -0,0 +1,78 @@
+"""Last-value-wins coalescing of outgoing D0_SET commands per target."""
+import asyncio
+import logging
+from typing import Optional
+
+from .const import COMMAND_COALESCE_WINDOW, D0_SET, SEND_AS_OBJ_GRP
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Net4HomeCommandCoalescer:
+    """Collapse bursts of D0_SET commands to the same object address.
+
+    The first command for a target is sent at once and opens a window. Further
+    D0_SET commands within the window replace each other; only the newest is
+    sent when the window closes. Other commands (toggle, inc/dec) are not
+    idempotent: they flush a queued D0_SET of the target and are sent directly.
+    """
+
+    def __init__(self, api, window: float = COMMAND_COALESCE_WINDOW):
+        """Initialize the coalescer."""
+        self._api = api
+        self._window = window
+        # ipdst -> queued send_raw_command kwargs (None while the window is open but empty)
+        self._queued: dict[int, Optional[dict]] = {}
+        self._handles: dict[int, asyncio.TimerHandle] = {}
+        self.stats = {"sent": 0, "coalesced": 0}
+
+    async def async_send(self, ipdst: int, ddata: bytes, objsource: int = 0, mi: int = 65281,
+                         type8: int = SEND_AS_OBJ_GRP) -> None:
+        """Send a command, or queue it if a D0_SET for the same target was sent just now."""
+        command = {"ipdst": ipdst, "ddata": ddata, "objsource": objsource, "mi": mi, "type8": type8}
+
+        if not ddata or ddata[0] != D0_SET:
+            queued = self._queued.get(ipdst)
+            if queued is not None:
+                self._queued[ipdst] = None
+                await self._async_write(queued)
+            await self._async_write(command)
+            return
+
+        if ipdst in self._queued:
+            if self._queued[ipdst] is not None:
+                self.stats["coalesced"] += 1
+            self._queued[ipdst] = command
+            return
+
+        self._queued[ipdst] = None
+        self._handles[ipdst] = asyncio.get_running_loop().call_later(self._window, self._on_window_end, ipdst)
+        await self._async_write(command)
+
+    def _on_window_end(self, ipdst: int) -> None:
+        self._handles.pop(ipdst, None)
+        queued = self._queued.pop(ipdst, None)
+        if queued is None:
+            return
+        _LOGGER.debug(f"Sending coalesced command for 0x{ipdst:04X}: {queued['ddata'].hex()}")
+        # The newest value opens the next window
+        self._queued[ipdst] = None
+        self._handles[ipdst] = asyncio.get_running_loop().call_later(self._window, self._on_window_end, ipdst)
+        asyncio.create_task(self._async_write_coalesced(queued))
+
+    async def _async_write(self, command: dict) -> None:
+        self.stats["sent"] += 1
+        await self._api._packet_sender.send_raw_command(**command)
+
+    async def _async_write_coalesced(self, command: dict) -> None:
+        try:
+            await self._async_write(command)
+        except Exception as e:
+            _LOGGER.error(f"Error sending coalesced command for 0x{command['ipdst']:04X}: {e}")
+
+    def cancel(self) -> None:
+        """Drop queued commands."""
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+        self._queued.clear()
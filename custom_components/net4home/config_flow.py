@@ -15,6 +15,12 @@ from .const import (
     DEFAULT_OBJADR,
     CONF_MI,
     CONF_OBJADR,
+    CONF_DEDUP_WINDOW,
+    DEFAULT_DEDUP_WINDOW,
+    CONF_KEEPALIVE_INTERVAL,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    CONF_STANDBY_HOST,
+    CONF_STANDBY_PORT,
 )
 from .api import Net4HomeApi
 
@@ -119,6 +125,22 @@ class Net4HomeOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Optional(CONF_MI, default=current_mi): int,
             vol.Optional(CONF_OBJADR, default=current_objadr): int,
             vol.Optional("trigger_enum_all", default=False): bool,
+            vol.Optional(
+                CONF_DEDUP_WINDOW,
+                default=self.config_entry.options.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+            vol.Optional(
+                CONF_KEEPALIVE_INTERVAL,
+                default=self.config_entry.options.get(CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_STANDBY_HOST,
+                default=self.config_entry.options.get(CONF_STANDBY_HOST, ""),
+            ): str,
+            vol.Optional(
+                CONF_STANDBY_PORT,
+                default=self.config_entry.options.get(CONF_STANDBY_PORT, N4H_IP_PORT),
+            ): int,
         }
         
         schema = vol.Schema(schema_dict)
@@ -153,6 +175,21 @@ class Net4HomeOptionsFlowHandler(config_entries.OptionsFlow):
             if not errors:
                 new_options = dict(self.config_entry.options)
                 new_options["devices"] = devices
+                new_options[CONF_DEDUP_WINDOW] = user_input.get(CONF_DEDUP_WINDOW, DEFAULT_DEDUP_WINDOW)
+                new_options[CONF_KEEPALIVE_INTERVAL] = user_input.get(CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL)
+                standby_changed = (
+                    user_input.get(CONF_STANDBY_HOST, "").strip() != self.config_entry.options.get(CONF_STANDBY_HOST, "")
+                    or user_input.get(CONF_STANDBY_PORT, N4H_IP_PORT) != self.config_entry.options.get(CONF_STANDBY_PORT, N4H_IP_PORT)
+                )
+                new_options[CONF_STANDBY_HOST] = user_input.get(CONF_STANDBY_HOST, "").strip()
+                new_options[CONF_STANDBY_PORT] = user_input.get(CONF_STANDBY_PORT, N4H_IP_PORT)
+                # Takes effect without reload
+                api = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+                if api:
+                    api.duplicate_filter.window = new_options[CONF_DEDUP_WINDOW]
+                    api.keepalive.interval = new_options[CONF_KEEPALIVE_INTERVAL]
+                    if standby_changed:
+                        await api.async_set_standby(new_options[CONF_STANDBY_HOST], new_options[CONF_STANDBY_PORT])
                 self.hass.config_entries.async_update_entry(self.config_entry, options=new_options)
                 return self.async_create_entry(title="", data={})
         
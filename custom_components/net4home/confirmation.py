@@ -0,0 +1,198 @@
+"""Optimistic actuation with confirmation deadlines."""
+import asyncio
+import copy
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from .const import ACTUATION_CONFIRM_DEADLINE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Brightness is sent in percent, the ACK converted back to 0..255 can differ by rounding
+_BRIGHTNESS_TOLERANCE = 3
+_TEMPERATURE_TOLERANCE = 0.05
+
+
+def _value_matches(key: Optional[str], intended, reported) -> bool:
+    if key == "brightness":
+        return abs(intended - reported) <= _BRIGHTNESS_TOLERANCE
+    if isinstance(intended, float) or isinstance(reported, float):
+        return abs(intended - reported) <= _TEMPERATURE_TOLERANCE
+    return bool(intended) == bool(reported)
+
+
+def state_matches(intended, reported) -> Optional[bool]:
+    """Compare a reported state with the intended one.
+
+    Returns None if the report contains none of the intended values (e.g.
+    the ACK of a climate preset object while a setpoint is pending).
+    """
+    if isinstance(intended, dict):
+        if not isinstance(reported, dict):
+            return None
+        keys = [key for key in intended if reported.get(key) is not None]
+        if not keys:
+            return None
+        return all(_value_matches(key, intended[key], reported[key]) for key in keys)
+    if reported is None or isinstance(reported, dict):
+        return None
+    return _value_matches(None, intended, reported)
+
+
+class _PendingCommand:
+    __slots__ = ("intended", "previous", "sent_at", "attempts", "resend", "deadline", "handle")
+
+    def __init__(self, intended, previous, resend, deadline):
+        self.intended = intended
+        self.previous = previous
+        self.sent_at = time.monotonic()
+        self.attempts = 0
+        self.resend = resend
+        self.deadline = deadline
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class Net4HomeConfirmationTracker:
+    """Track commands whose state was applied optimistically until the actuator confirms.
+
+    A D0_ACTOR_ACK (or STATUS_INFO) within the deadline that reports the
+    intended state confirms the command; one that reports another state rolls
+    it back. On the first timeout the command is sent again if it is
+    idempotent (D0_SET); toggles (resend=None) and actuators without status
+    updates are asked with D0_REQ instead. On the second timeout the previous
+    state is restored (unknown if there was none), the device is marked
+    unconfirmed and its status is requested.
+    """
+
+    def __init__(self, api, deadline: float = ACTUATION_CONFIRM_DEADLINE):
+        """Initialize the tracker."""
+        self._api = api
+        self._deadline = deadline
+        self._pending: dict[str, _PendingCommand] = {}
+        self._resending: set[str] = set()
+        self.unconfirmed: set[str] = set()
+        self._latency: dict[str, dict] = {}
+        self.stats = {"confirmed": 0, "resends": 0, "rollbacks": 0}
+
+    def expect(self, device_id: str, intended, resend: Optional[Callable[[], Awaitable]], deadline: Optional[float] = None):
+        """Register a command and apply its intended state optimistically.
+
+        resend must repeat the command without changing its effect; pass None
+        for toggles and other commands that must not be sent twice.
+        """
+        pending = self._pending.get(device_id)
+        if pending is not None and device_id in self._resending:
+            # The resend calls the regular actuation function again, keep attempts and deadline
+            return
+
+        if pending is not None:
+            pending.handle.cancel()
+            # Roll back to the state before the first unconfirmed command
+            previous = pending.previous
+        else:
+            previous = copy.deepcopy(self._api.get_last_state(device_id))
+
+        pending = _PendingCommand(intended, previous, resend, deadline or self._deadline)
+        self._pending[device_id] = pending
+        self._arm(device_id, pending)
+        self._api._publish_state(device_id, intended)
+
+    def _arm(self, device_id: str, pending: _PendingCommand):
+        loop = asyncio.get_running_loop()
+        pending.handle = loop.call_later(pending.deadline, self._on_deadline, device_id)
+
+    def confirm(self, device_id: str, state) -> Optional[float]:
+        """Handle a state report from the bus; return the latency if it confirms a command.
+
+        The caller publishes the reported state afterwards, which also
+        replaces the optimistic state after a mismatch.
+        """
+        pending = self._pending.get(device_id)
+        if pending is None:
+            self.unconfirmed.discard(device_id)
+            return None
+        matches = state_matches(pending.intended, state)
+        if matches is None:
+            return None
+        del self._pending[device_id]
+        pending.handle.cancel()
+        if not matches:
+            self.stats["rollbacks"] += 1
+            self.unconfirmed.add(device_id)
+            _LOGGER.warning(f"Command for {device_id} not applied: intended {pending.intended}, reported {state}")
+            return None
+        self.unconfirmed.discard(device_id)
+
+        latency = time.monotonic() - pending.sent_at
+        self.stats["confirmed"] += 1
+        device = self._api.devices.get(device_id)
+        module = (device.via_device if device else None) or device_id
+        entry = self._latency.setdefault(module, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+        entry["count"] += 1
+        entry["total"] += latency
+        entry["max"] = max(entry["max"], latency)
+        entry["last"] = latency
+        _LOGGER.debug(f"Command for {device_id} confirmed after {latency * 1000:.0f} ms (attempts={pending.attempts + 1})")
+        return latency
+
+    def _on_deadline(self, device_id: str):
+        pending = self._pending.get(device_id)
+        if pending is None:
+            return
+
+        device = self._api.devices.get(device_id)
+        if pending.attempts == 0:
+            pending.attempts += 1
+            self._arm(device_id, pending)
+            if pending.resend is None or (device is not None and not device.send_state_changes):
+                # Not repeatable, or no status updates from this actuator: ask for the state instead
+                _LOGGER.debug(f"No confirmation for {device_id}, requesting status")
+                asyncio.create_task(self._api.async_request_status(device_id))
+            else:
+                self.stats["resends"] += 1
+                _LOGGER.debug(f"No confirmation for {device_id}, sending command again")
+                asyncio.create_task(self._async_resend(device_id, pending))
+            return
+
+        self._pending.pop(device_id, None)
+        self.stats["rollbacks"] += 1
+        self.unconfirmed.add(device_id)
+        _LOGGER.warning(f"Command for {device_id} not confirmed, restoring previous state")
+        if pending.previous is not None:
+            self._api._publish_state(device_id, pending.previous)
+        elif isinstance(pending.intended, dict):
+            # Nothing known before the command: the intended values become unknown
+            self._api._publish_state(device_id, dict.fromkeys(pending.intended))
+        else:
+            self._api._publish_state(device_id, None)
+        asyncio.create_task(self._api.async_request_status(device_id))
+
+    async def _async_resend(self, device_id: str, pending: _PendingCommand):
+        self._resending.add(device_id)
+        try:
+            await pending.resend()
+        finally:
+            self._resending.discard(device_id)
+
+    def is_unconfirmed(self, device_id: str) -> bool:
+        """Return True if the last command of a device was never confirmed."""
+        return device_id in self.unconfirmed
+
+    def latency_stats(self) -> dict:
+        """Return command-to-confirmation latency per module (ms)."""
+        return {
+            module: {
+                "count": entry["count"],
+                "avg_ms": round(entry["total"] / entry["count"] * 1000, 1),
+                "max_ms": round(entry["max"] * 1000, 1),
+                "last_ms": round(entry["last"] * 1000, 1),
+            }
+            for module, entry in self._latency.items()
+        }
+
+    def cancel(self):
+        """Drop all pending commands."""
+        for pending in self._pending.values():
+            pending.handle.cancel()
+        self._pending.clear()
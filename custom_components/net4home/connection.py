@@ -0,0 +1,170 @@
+"""Connection state machine for the bus connector session."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import HANDSHAKE_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CONNECTING = "connecting"
+STATE_AUTHENTICATING = "authenticating"
+STATE_READY = "ready"
+STATE_DEGRADED = "degraded"
+STATE_CLOSED = "closed"
+
+# States in which frames are written to the connector
+SENDABLE_STATES = (STATE_READY, STATE_DEGRADED)
+
+
+class Net4HomeConnectionError(HomeAssistantError):
+    """Raised when a frame is sent while the connection is closed."""
+
+
+class Net4HomeConnection:
+    """Track the session: connecting -> authenticating -> ready (or degraded) -> closed.
+
+    The session is ready when the connector acknowledges the password or,
+    for connectors that do not send the acknowledgement, when the first bus
+    packet arrives. Without either within HANDSHAKE_TIMEOUT the session is
+    degraded: frames are sent, but the state is visible in the diagnostics.
+    Listeners are called with (old state, new state) on every transition.
+    """
+
+    def __init__(self, handshake_timeout: float = HANDSHAKE_TIMEOUT):
+        """Initialize in the closed state."""
+        self.handshake_timeout = handshake_timeout
+        self.state = STATE_CLOSED
+        self._state_since = time.monotonic()
+        self._changed = asyncio.Event()
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._timeout_handle: Optional[asyncio.TimerHandle] = None
+        self._connect_started: Optional[float] = None
+        self._auth_started: Optional[float] = None
+        self.transitions: deque = deque(maxlen=20)
+        self.stats = {
+            "handshakes": 0,
+            "handshake_timeouts": 0,
+            "last_connect_ms": None,
+            "last_auth_ms": None,
+            "last_handshake_ms": None,
+            "ready_by": None,
+        }
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Call listener(old_state, new_state) on each transition."""
+        self._listeners.append(listener)
+
+    def _set_state(self, state: str) -> None:
+        if state == self.state:
+            return
+        old = self.state
+        now = time.monotonic()
+        self.transitions.append({
+            "from": old,
+            "to": state,
+            "after_s": round(now - self._state_since, 3),
+            "at": time.time(),
+        })
+        self.state = state
+        self._state_since = now
+        _LOGGER.debug(f"[IP] Connection state {old} -> {state}")
+
+        # Wake up waiters, they re-check the state
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+        for listener in self._listeners:
+            try:
+                listener(old, state)
+            except Exception as e:
+                _LOGGER.error(f"Error in connection state listener: {e}", exc_info=True)
+
+    @property
+    def is_ready(self) -> bool:
+        """Return True if frames can be written."""
+        return self.state in SENDABLE_STATES
+
+    def connecting(self) -> None:
+        """TCP connection is being opened."""
+        self._cancel_timeout()
+        self._connect_started = time.monotonic()
+        self._set_state(STATE_CONNECTING)
+
+    def authenticating(self) -> None:
+        """TCP connection open, credentials sent."""
+        now = time.monotonic()
+        if self._connect_started is not None:
+            self.stats["last_connect_ms"] = round((now - self._connect_started) * 1000, 1)
+        self._auth_started = now
+        self._set_state(STATE_AUTHENTICATING)
+        self._cancel_timeout()
+        self._timeout_handle = asyncio.get_running_loop().call_later(
+            self.handshake_timeout, self._on_handshake_timeout
+        )
+
+    def confirmed(self, reason: str) -> None:
+        """Password acknowledged (or first bus packet seen): the session is usable."""
+        if self.state not in (STATE_AUTHENTICATING, STATE_DEGRADED):
+            return
+        self._cancel_timeout()
+        now = time.monotonic()
+        if self._auth_started is not None:
+            self.stats["last_auth_ms"] = round((now - self._auth_started) * 1000, 1)
+        if self._connect_started is not None:
+            self.stats["last_handshake_ms"] = round((now - self._connect_started) * 1000, 1)
+        self.stats["handshakes"] += 1
+        self.stats["ready_by"] = reason
+        self._set_state(STATE_READY)
+
+    def degraded(self) -> None:
+        """The session works only partially (no handshake confirmation, failing probes)."""
+        if self.state in (STATE_READY, STATE_AUTHENTICATING):
+            self._set_state(STATE_DEGRADED)
+
+    def closed(self) -> None:
+        """Connection closed on purpose or given up."""
+        self._cancel_timeout()
+        self._set_state(STATE_CLOSED)
+
+    def _on_handshake_timeout(self) -> None:
+        self._timeout_handle = None
+        if self.state == STATE_AUTHENTICATING:
+            self.stats["handshake_timeouts"] += 1
+            _LOGGER.warning(
+                f"[IP] No password acknowledgement within {self.handshake_timeout:.0f}s, continuing degraded"
+            )
+            self.degraded()
+
+    def _cancel_timeout(self) -> None:
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
+
+    async def async_wait_ready(self, timeout: float) -> bool:
+        """Wait until frames can be sent; False on timeout, Net4HomeConnectionError if closed."""
+        deadline = time.monotonic() + timeout
+        while not self.is_ready:
+            if self.state == STATE_CLOSED:
+                raise Net4HomeConnectionError("Connection to the net4home bus connector is closed")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def info(self) -> dict:
+        """Return state and handshake metrics for diagnostics."""
+        return {
+            "state": self.state,
+            "state_for_s": round(time.monotonic() - self._state_since, 1),
+            **self.stats,
+            "transitions": list(self.transitions),
+        }
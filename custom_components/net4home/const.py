@@ -18,6 +18,102 @@ DEFAULT_MI = 65281
 DEFAULT_OBJADR = 32700
 CONF_MI = "MI"
 CONF_OBJADR = "OBJADR"
+CONF_DEDUP_WINDOW = "dedup_window"
+DEFAULT_DEDUP_WINDOW = 1.0          # Seconds in which an identical telegram of the same sender is dropped
+CONF_KEEPALIVE_INTERVAL = "keepalive_interval"
+DEFAULT_KEEPALIVE_INTERVAL = 30.0   # Seconds without received data before a keepalive probe is sent
+CONF_STANDBY_HOST = "standby_host"  # Optional second bus connector (hot standby)
+CONF_STANDBY_PORT = "standby_port"
+
+# Largest compressed frame accepted from the bus connector; longer length prefixes are treated as corrupt
+RX_MAX_FRAME_LEN = 2048
+
+# Outbound queue: congested at the high water mark until drained to the low water mark
+OUTBOUND_HIGH_WATER = 64
+OUTBOUND_LOW_WATER = 16
+# Traffic classes (policy while congested: commands wait, polls drop the oldest poll, discovery is rejected)
+TRAFFIC_COMMAND = "command"
+TRAFFIC_POLL = "poll"
+TRAFFIC_DISCOVERY = "discovery"
+
+# Replay of frames sent while disconnected: maximum age in seconds per traffic class (0 = not held)
+REPLAY_MAX_AGE = {
+    TRAFFIC_COMMAND: 30.0,
+    TRAFFIC_POLL: 60.0,
+    TRAFFIC_DISCOVERY: 0.0,
+}
+REPLAY_MAX_FRAMES = 256
+
+# Seconds to wait for the password acknowledgement before the session is treated as degraded
+HANDSHAKE_TIMEOUT = 5.0
+
+# Reconnect: immediate first retry, then exponential backoff with jitter (seconds)
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 60.0
+RECONNECT_BREAKER_THRESHOLD = 5      # Failed attempts in a row until the circuit breaker opens
+
+# Keepalive: seconds to wait for traffic after a probe, missed probes until the connection is aborted
+KEEPALIVE_TIMEOUT = 5.0
+KEEPALIVE_MAX_MISSES = 2
+
+# Standby connector: seconds between connection attempts, window in which the copy of a telegram from the other link is dropped
+STANDBY_RETRY_DELAY = 10.0
+LINK_DEDUP_WINDOW = 1.0
+
+# Capture of the raw connector traffic (services net4home.start_capture/stop_capture)
+CAPTURE_DIR = "net4home_captures"   # Below the Home Assistant config directory
+CAPTURE_MAX_BYTES = 10 * 1024 * 1024  # Per file, then the files are rotated
+CAPTURE_MAX_FILES = 5
+CAPTURE_FLUSH_INTERVAL = 1.0        # Seconds between writes of the buffered records
+CAPTURE_MAX_PENDING = 4 * 1024 * 1024  # Buffered bytes until records are dropped
+
+# Seconds between two samples of the traffic metrics (rates, diagnostic sensors)
+METRICS_INTERVAL = 60
+
+# Platforms that create entities for a device type (button is added for every MI module)
+DEVICE_TYPE_PLATFORMS = {
+    "light": ("light",),
+    "switch": ("switch",),
+    "cover": ("cover",),
+    "binary_sensor": ("binary_sensor", "sensor", "button"),
+    "climate": ("climate", "sensor"),
+    "sensor": ("sensor",),
+    "rf_reader": ("sensor",),
+    "alarm_control_panel": ("alarm_control_panel",),
+}
+
+# State snapshot (last known entity states, restored at startup)
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_INTERVAL = 300        # Seconds between periodic snapshot saves
+SNAPSHOT_RESYNC_WINDOW = 600.0      # Seconds over which restored objects are re-read from the bus
+
+# Passive state tracking (state derived from observed D0_SET/D0_TOGGLE telegrams)
+PASSIVE_CONFIRM_DELAY = 0.5         # Seconds before a confirming D0_REQ is sent
+PASSIVE_SUPPRESSION_WINDOW = 3.0    # Minimum seconds between two confirming D0_REQ per device
+
+# Optimistic actuation: seconds to wait for the D0_ACTOR_ACK before resend / rollback
+ACTUATION_CONFIRM_DEADLINE = 3.0
+
+# Group index (group address -> member objects, configured with the set_group service)
+GROUP_INDEX_STORAGE_VERSION = 1
+
+# Adaptive polling of objects that do not send state changes
+POLL_DEVICE_TYPES = ("switch", "light", "cover", "binary_sensor")
+POLL_MIN_INTERVAL = 60.0            # Seconds, used again after a change was seen
+POLL_MAX_INTERVAL = 1800.0          # Seconds, upper bound while the state is stable
+POLL_BACKOFF_FACTOR = 2.0
+POLL_JITTER = 0.2                   # +/- fraction of the interval
+POLL_BUDGET_PER_SECOND = 0.5        # D0_REQ per second for polling (bus-load budget)
+POLL_BUDGET_BURST = 5
+
+# Bulk status resync (service net4home.resync and after a reconnect)
+RESYNC_DEVICE_TYPES = ("switch", "light", "cover", "climate")
+RESYNC_RATE = 5.0                   # D0_REQ per second
+RESYNC_RETRIES = 2                  # Additional requests for devices without answer
+RESYNC_ANSWER_TIMEOUT = 3.0         # Seconds to wait for answers after each pass
+
+# Seconds in which D0_SET commands to the same target are collapsed to the newest one
+COMMAND_COALESCE_WINDOW = 0.3
 
 N4H_IP_PORT                         = 3478
 N4H_BJ_NAME_BUSCONNECTOR  =  "_n4hbuscon._tcp"
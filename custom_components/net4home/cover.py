@@ -22,7 +22,7 @@ async def async_setup_entry(
     api: Net4HomeApi = hass.data[DOMAIN][entry.entry_id]
     
     _LOGGER.info(f"[Cover] Setup called with {len(api.devices)} devices in API")
-    cover_devices = [d for d in api.devices.values() if d.device_type == "cover"]
+    cover_devices = api.devices_of_type("cover")
     _LOGGER.info(f"[Cover] Found {len(cover_devices)} cover devices: {[d.device_id for d in cover_devices]}")
 
     entities = [
@@ -107,6 +107,7 @@ class Net4HomeCover(CoverEntity):
             "model": self.device.model,
             "via_device": self.device.via_device or "",
             "send_state_changes": self.send_state_changes,  
+            "unconfirmed": self.api.confirmations.is_unconfirmed(self.device.device_id),
         }
 
     async def async_added_to_hass(self):
@@ -120,6 +121,11 @@ class Net4HomeCover(CoverEntity):
             )
         )
 
+        # Restore last known state from snapshot (re-read from the bus later)
+        last_state = self.api.get_last_state(self.device.device_id)
+        if last_state is not None:
+            self._handle_update(last_state)
+
     @callback
     def _handle_update(self, is_closed: bool):
         """Handle update from dispatcher."""
@@ -0,0 +1,71 @@
+"""Suppression of repeated bus telegrams."""
+import time
+from typing import Iterable
+
+from .const import D0_ACTOR_ACK, D0_DEC, D0_INC, D0_TOGGLE, DEFAULT_DEDUP_WINDOW
+
+# Each copy of these changes the state again, repeats are never dropped
+NON_IDEMPOTENT = frozenset((D0_TOGGLE, D0_INC, D0_DEC))
+
+# Answers to our own commands and D0_REQ: a repeated command gets an identical
+# answer that the confirmation tracker and the pollers still wait for
+ANSWERS = frozenset((D0_ACTOR_ACK,))
+
+# Prune the table when it grows beyond this many sources
+_PRUNE_SIZE = 4096
+
+
+class Net4HomeDuplicateFilter:
+    """Drop exact repeats of the last telegram of a sender within a time window.
+
+    Modules repeat telegrams (cyclic broadcasts, retries) and the connector
+    can deliver a frame twice in a burst. Per sender (ipsrc, objsrc) the hash
+    of the last (ipdest, ddata) is kept; an identical telegram arriving within
+    `window` seconds is reported as duplicate. A window of 0 disables the filter.
+    Toggles/inc/dec, D0_ACTOR_ACK and telegrams addressed to one of our own
+    addresses always pass.
+    """
+
+    def __init__(self, window: float = DEFAULT_DEDUP_WINDOW, own_addresses: Iterable[int] = ()):
+        """Initialize the filter; own_addresses are the connector's MI and objadr."""
+        self.window = window
+        self._own_addresses = frozenset(address for address in own_addresses if address is not None)
+        # (ipsrc, objsrc) -> (hash of ipdest/ddata, monotonic time)
+        self._last: dict[tuple[int, int], tuple[int, float]] = {}
+        self.stats = {"passed": 0, "dropped": 0}
+
+    def is_duplicate(self, paket) -> bool:
+        """Return True if the telegram repeats the previous one of its sender."""
+        if (
+            self.window <= 0
+            or not paket.ddata
+            or paket.ddata[0] in NON_IDEMPOTENT
+            or paket.ddata[0] in ANSWERS
+            or paket.ipdest in self._own_addresses
+        ):
+            self.stats["passed"] += 1
+            return False
+
+        now = time.monotonic()
+        source = (paket.ipsrc, paket.objsrc)
+        digest = hash((paket.ipdest, bytes(paket.ddata)))
+        last = self._last.get(source)
+        if last is not None and last[0] == digest and now - last[1] < self.window:
+            self.stats["dropped"] += 1
+            return True
+
+        if len(self._last) >= _PRUNE_SIZE:
+            self._prune(now)
+        self._last[source] = (digest, now)
+        self.stats["passed"] += 1
+        return False
+
+    def _prune(self, now: float) -> None:
+        self._last = {
+            source: entry for source, entry in self._last.items()
+            if now - entry[1] < self.window
+        }
+
+    def clear(self) -> None:
+        """Forget all senders (e.g. after a reconnect)."""
+        self._last.clear()
@@ -265,4 +265,286 @@ class Net4HomeCoverRunTimeDiagnosticSensor(SensorEntity):
             manufacturer="net4home",
             model=self.device.model,
             via_device=(DOMAIN, self.device.via_device.upper()) if self.device.via_device else None,
-        )
\ No newline at end of file
+        )
+
+def connector_device_info(entry) -> DeviceInfo:
+    """Return the device of the bus connector itself (connection diagnostics)."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"CONNECTOR_{entry.entry_id}")},
+        name="net4home Bus connector",
+        manufacturer="net4home",
+        model="Bus connector",
+    )
+
+
+# Reconnect circuit breaker of the bus connector connection
+class Net4HomeReconnectBreakerDiagnosticSensor(SensorEntity):
+    """Diagnostic sensor for the reconnect circuit breaker."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:lan-disconnect"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = ["closed", "open"]
+
+    def __init__(self, entry, api):
+        """Initialize the circuit breaker diagnostic sensor."""
+        self.entry = entry
+        self.api = api
+        self._attr_name = "Bus connector Reconnect circuit"
+        self._attr_unique_id = f"{entry.entry_id}_diagnostic_reconnect_breaker"
+
+    @property
+    def native_value(self):
+        return self.api.reconnect_supervisor.breaker
+
+    @property
+    def extra_state_attributes(self):
+        info = self.api.reconnect_supervisor.info()
+        return {
+            "connection_state": self.api.connection.state,
+            "consecutive_failures": info["consecutive_failures"],
+            "current_outage_s": info["current_outage_s"],
+            "outages": info["outages"],
+            "last_error": info["last_error"],
+        }
+
+    async def async_added_to_hass(self):
+        """Register update listener when entity is added."""
+        from homeassistant.helpers.dispatcher import async_dispatcher_connect
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"net4home_connection_{self.entry.entry_id}",
+                self._handle_update,
+            )
+        )
+
+    @callback
+    def _handle_update(self):
+        """Handle update signal from dispatcher."""
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return connector_device_info(self.entry)
+
+
+# Duration of the last connection outage
+class Net4HomeOutageDiagnosticSensor(SensorEntity):
+    """Diagnostic sensor for the duration of the last connection outage."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-alert-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = "s"
+
+    def __init__(self, entry, api):
+        """Initialize the outage diagnostic sensor."""
+        self.entry = entry
+        self.api = api
+        self._attr_name = "Bus connector Last outage"
+        self._attr_unique_id = f"{entry.entry_id}_diagnostic_last_outage"
+
+    @property
+    def native_value(self):
+        return self.api.reconnect_supervisor.stats["last_outage_s"]
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.api.reconnect_supervisor.stats
+        return {
+            "longest_outage_s": stats["longest_outage_s"],
+            "total_outage_s": stats["total_outage_s"],
+        }
+
+    async def async_added_to_hass(self):
+        """Register update listener when entity is added."""
+        from homeassistant.helpers.dispatcher import async_dispatcher_connect
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"net4home_connection_{self.entry.entry_id}",
+                self._handle_update,
+            )
+        )
+
+    @callback
+    def _handle_update(self):
+        """Handle update signal from dispatcher."""
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return connector_device_info(self.entry)
+
+
+# Round-trip time of the keepalive probes
+class Net4HomeRoundTripDiagnosticSensor(SensorEntity):
+    """Diagnostic sensor for the round-trip time to the bus."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-sync-outline"
+    _attr_native_unit_of_measurement = "ms"
+
+    def __init__(self, entry, api):
+        """Initialize the round-trip diagnostic sensor."""
+        self.entry = entry
+        self.api = api
+        self._attr_name = "Bus connector Round-trip time"
+        self._attr_unique_id = f"{entry.entry_id}_diagnostic_round_trip"
+
+    @property
+    def native_value(self):
+        return self.api.keepalive.rtt_ms
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.api.keepalive.stats
+        return {
+            "rtt_min_ms": stats["rtt_min_ms"],
+            "rtt_max_ms": stats["rtt_max_ms"],
+            "missed_probes": stats["misses"],
+            "dead_connections": stats["dead_connections"],
+        }
+
+    async def async_added_to_hass(self):
+        """Register update listener when entity is added."""
+        from homeassistant.helpers.dispatcher import async_dispatcher_connect
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"net4home_connection_{self.entry.entry_id}",
+                self._handle_update,
+            )
+        )
+
+    @callback
+    def _handle_update(self):
+        """Handle update signal from dispatcher."""
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return connector_device_info(self.entry)
+
+
+# Traffic metrics of the bus connection (disabled by default)
+class Net4HomeMetricsDiagnosticSensor(SensorEntity):
+    """Base class of the traffic metrics sensors, updated every METRICS_INTERVAL."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+    _metric_name = ""
+    _metric_key = ""
+
+    def __init__(self, entry, api):
+        """Initialize the metrics diagnostic sensor."""
+        self.entry = entry
+        self.api = api
+        self._attr_name = f"Bus connector {self._metric_name}"
+        self._attr_unique_id = f"{entry.entry_id}_diagnostic_metrics_{self._metric_key}"
+
+    async def async_added_to_hass(self):
+        """Register update listener when entity is added."""
+        from homeassistant.helpers.dispatcher import async_dispatcher_connect
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"net4home_metrics_{self.entry.entry_id}",
+                self._handle_update,
+            )
+        )
+
+    @callback
+    def _handle_update(self):
+        """Handle update signal from dispatcher."""
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return connector_device_info(self.entry)
+
+
+class Net4HomeReceivedRateDiagnosticSensor(Net4HomeMetricsDiagnosticSensor):
+    """Received telegrams per minute, busiest modules as attributes."""
+
+    _attr_icon = "mdi:download-network-outline"
+    _attr_native_unit_of_measurement = "telegrams/min"
+    _metric_name = "Received telegrams"
+    _metric_key = "rx_rate"
+
+    @property
+    def native_value(self):
+        return self.api.metrics.rx_rate
+
+    @property
+    def extra_state_attributes(self):
+        metrics = self.api.metrics
+        busiest = sorted(metrics.module_rates.items(), key=lambda item: -item[1])[:5]
+        return {
+            "total": sum(metrics.rx_opcodes) + metrics.rx_empty,
+            "busiest_modules": {f"MI{ipsrc:04X}": rate for ipsrc, rate in busiest if rate},
+        }
+
+
+class Net4HomeSentRateDiagnosticSensor(Net4HomeMetricsDiagnosticSensor):
+    """Sent telegrams per minute."""
+
+    _attr_icon = "mdi:upload-network-outline"
+    _attr_native_unit_of_measurement = "telegrams/min"
+    _metric_name = "Sent telegrams"
+    _metric_key = "tx_rate"
+
+    @property
+    def native_value(self):
+        return self.api.metrics.tx_rate
+
+    @property
+    def extra_state_attributes(self):
+        return {"total": sum(self.api.metrics.tx_opcodes)}
+
+
+class Net4HomeDecodeErrorsDiagnosticSensor(Net4HomeMetricsDiagnosticSensor):
+    """Frames that could not be decompressed, per error code as attributes."""
+
+    _attr_icon = "mdi:alert-circle-outline"
+    _metric_name = "Decode errors"
+    _metric_key = "decode_errors"
+
+    @property
+    def native_value(self):
+        return sum(self.api.metrics.decode_errors.values())
+
+    @property
+    def extra_state_attributes(self):
+        return self.api.metrics.info()["decode_errors"]
+
+
+class Net4HomeDispatchTimeDiagnosticSensor(Net4HomeMetricsDiagnosticSensor):
+    """Average dispatch time of a received telegram."""
+
+    _attr_icon = "mdi:timer-cog-outline"
+    _attr_native_unit_of_measurement = "µs"
+    _metric_name = "Dispatch time"
+    _metric_key = "dispatch_time"
+
+    @property
+    def native_value(self):
+        return self.api.metrics.dispatch_avg_us
+
+
+class Net4HomeQueueDepthDiagnosticSensor(Net4HomeMetricsDiagnosticSensor):
+    """Depth of the outbound queue, the other queues as attributes."""
+
+    _attr_icon = "mdi:tray-full"
+    _metric_name = "Outbound queue"
+    _metric_key = "queue_depth"
+
+    @property
+    def native_value(self):
+        return self.api.metrics.queue_depths()["outbound"]
+
+    @property
+    def extra_state_attributes(self):
+        return {**self.api.metrics.queue_depths(), **self.api.metrics.reconnects()}
@@ -60,6 +60,12 @@ async def async_get_config_entry_diagnostics(
         "reconnect_enabled": getattr(api, "_reconnect_enabled", True),
     }
 
+    # Startup phases (load_devices, register_modules, load_snapshot, platforms, connect, total)
+    startup_timings = {
+        phase: round(duration, 3)
+        for phase, duration in getattr(api, "startup_timings", {}).items()
+    }
+
     # Config entry info
     config_info = {
         "entry_id": config_entry.entry_id,
@@ -72,6 +78,37 @@ async def async_get_config_entry_diagnostics(
     data = {
         "config_entry": config_info,
         "connection": connection_status,
+        "startup_timings": startup_timings,
+        "state_store": api.state_store.stats() if hasattr(api, "state_store") else {},
+        "passive_tracking": dict(api.passive_tracker.stats) if hasattr(api, "passive_tracker") else {},
+        "group_index": api.group_index.stats() if hasattr(api, "group_index") else {},
+        "confirmations": {
+            **api.confirmations.stats,
+            "unconfirmed": sorted(api.confirmations.unconfirmed),
+            "latency_by_module": api.confirmations.latency_stats(),
+        } if hasattr(api, "confirmations") else {},
+        "polling": api.poller.info() if hasattr(api, "poller") else {},
+        "resync": {
+            "progress": api.resync.progress,
+            "last_result": api.resync.last_result,
+        } if hasattr(api, "resync") else {},
+        "command_coalescing": api.coalescer.stats if hasattr(api, "coalescer") else {},
+        "connection_state": api.connection.info() if hasattr(api, "connection") else {},
+        "reconnect": api.reconnect_supervisor.info() if hasattr(api, "reconnect_supervisor") else {},
+        "standby": api.standby.info() if getattr(api, "standby", None) else {},
+        "keepalive": api.keepalive.info() if hasattr(api, "keepalive") else {},
+        "capture": api.capture.info() if getattr(api, "capture", None) else {},
+        "metrics": api.metrics.info() if hasattr(api, "metrics") else {},
+        "outbound_queue": api.outbound.info() if hasattr(api, "outbound") else {},
+        "receiver": api._packet_receiver.stats if hasattr(api, "_packet_receiver") else {},
+        "address_filter": {
+            **api.address_filter.stats,
+            "marked_addresses": api.address_filter.marked(),
+        } if hasattr(api, "address_filter") else {},
+        "duplicate_filter": {
+            **api.duplicate_filter.stats,
+            "window": api.duplicate_filter.window,
+        } if hasattr(api, "duplicate_filter") else {},
         "devices": {
             "count": len(devices_info),
             "list": devices_info,
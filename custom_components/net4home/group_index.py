@@ -0,0 +1,126 @@
+"""Index of group addresses to member objects, built from configured group memberships."""
+import logging
+from typing import Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, GROUP_INDEX_STORAGE_VERSION, sa2_ADR_GRUPPE
+
+_LOGGER = logging.getLogger(__name__)
+
+class Net4HomeGroupIndex:
+    """Map group addresses (>= 0x8000) to the actor objects that listen to them.
+
+    Each module reports its actor channels (D0_RD_ACTOR_DATA_ACK: channel ->
+    object address). Which groups switch which channels of a module is
+    configured with the set_group service (group address + channel mask);
+    the group tables are not read from the modules. The member sets are
+    rebuilt whenever a channel or an entry changes and persisted, so group
+    telegrams can be applied after a restart.
+    """
+
+    def __init__(self, hass: Optional[HomeAssistant] = None, entry_id: Optional[str] = None):
+        """Initialize the index (persistent when hass and entry_id are given)."""
+        self._store = (
+            Store(hass, GROUP_INDEX_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.groups")
+            if hass is not None and entry_id else None
+        )
+        # mi -> channel -> objadr
+        self._channels: dict[int, dict[int, int]] = {}
+        # mi -> group address -> channel mask
+        self._tables: dict[int, dict[int, int]] = {}
+        # group address -> member objadrs
+        self._members: dict[int, set[int]] = {}
+        self._dirty = False
+
+    def register_channel(self, mi: int, channel: int, objadr: int) -> None:
+        """Remember the object address of an actor channel."""
+        channels = self._channels.setdefault(mi, {})
+        if channels.get(channel) != objadr:
+            channels[channel] = objadr
+            self._rebuild()
+
+    def set_entry(self, mi: int, group: int, mask: int) -> None:
+        """Set the actor channels (bit 0 = channel 0) of a module that a group switches.
+
+        A mask of 0 removes the group from the module.
+        """
+        if not group & sa2_ADR_GRUPPE:
+            raise ValueError(f"0x{group:04X} is not a group address")
+        table = self._tables.setdefault(mi, {})
+        if not mask:
+            if table.pop(group, None) is not None:
+                self._rebuild()
+            if not table:
+                del self._tables[mi]
+            return
+        if table.get(group) != mask:
+            table[group] = mask
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        members: dict[int, set[int]] = {}
+        for mi, table in self._tables.items():
+            channels = self._channels.get(mi, {})
+            for group, mask in table.items():
+                for channel, objadr in channels.items():
+                    if mask & (1 << channel):
+                        members.setdefault(group, set()).add(objadr)
+        self._members = members
+        self._dirty = True
+
+    def members(self, group: int) -> list[int]:
+        """Return the object addresses that belong to a group."""
+        return sorted(self._members.get(group, ()))
+
+    def groups_of(self, objadr: int) -> list[int]:
+        """Return the groups an object belongs to."""
+        return sorted(group for group, members in self._members.items() if objadr in members)
+
+    def stats(self) -> dict:
+        """Return size information for diagnostics."""
+        return {
+            "modules": len(self._tables),
+            "groups": len(self._members),
+            "memberships": sum(len(members) for members in self._members.values()),
+        }
+
+    async def async_load(self) -> None:
+        """Load the stored channels and entries."""
+        if self._store is None:
+            return
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning(f"Unable to load group index: {e}")
+            return
+        if not isinstance(data, dict):
+            return
+        # JSON keys are strings
+        self._channels = {
+            int(mi): {int(ch): objadr for ch, objadr in channels.items()}
+            for mi, channels in data.get("channels", {}).items()
+        }
+        self._tables = {
+            int(mi): {int(group): mask for group, mask in table.items()}
+            for mi, table in data.get("groups", {}).items()
+        }
+        self._rebuild()
+        self._dirty = False
+        _LOGGER.debug(f"Loaded group index: {self.stats()}")
+
+    async def async_save(self) -> None:
+        """Store the channels and entries if they changed."""
+        if self._store is None or not self._dirty:
+            return
+        try:
+            await self._store.async_save({"channels": self._channels, "groups": self._tables})
+            self._dirty = False
+        except Exception as e:
+            _LOGGER.error(f"Unable to save group index: {e}")
+
+    async def async_remove(self) -> None:
+        """Remove the stored channels and entries."""
+        if self._store is not None:
+            await self._store.async_remove()
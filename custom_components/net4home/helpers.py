@@ -2,13 +2,14 @@
 import logging
 import glob
 import os
+from datetime import datetime
 from typing import Optional, Set, Tuple, List, Dict
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import DOMAIN
+from .const import DOMAIN, DEVICE_TYPE_PLATFORMS
 from .models import Net4HomeDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -37,6 +38,66 @@ def decode_powerup_status(powerup_index: Optional[int]) -> str:
     
     return powerup_map.get(powerup_index, f"unknown ({powerup_index})")
 
+
+def platforms_for_device(device: Net4HomeDevice) -> Set[str]:
+    """Return the platforms that create entities for a device."""
+    platforms = set(DEVICE_TYPE_PLATFORMS.get(device.device_type, ()))
+    # Read Device Config button for every MI module (OBJ child devices have a via_device)
+    if device.device_id.startswith("MI") and not device.via_device:
+        platforms.add("button")
+    return platforms
+
+
+def device_from_options(dev: dict) -> Net4HomeDevice:
+    """Build a Net4HomeDevice from its stored config entry options."""
+    last_detail_request = None
+    if dev.get("last_detail_request"):
+        try:
+            last_detail_request = datetime.fromisoformat(dev["last_detail_request"])
+        except (ValueError, TypeError):
+            pass
+
+    device_id = dev["device_id"]
+    return Net4HomeDevice(
+        device_id=device_id,
+        name=dev["name"],
+        model=dev["model"],
+        device_type=dev["device_type"],
+        via_device=dev.get("via_device"),
+        objadr=dev.get("objadr", int(device_id[3:]) if device_id.startswith("OBJ") else None),
+        send_state_changes=dev.get("send_state_changes", False),
+        detail_status=dev.get("detail_status", "pending"),
+        detail_retry_count=dev.get("detail_retry_count", 0),
+        last_detail_request=last_detail_request,
+        module_type=dev.get("module_type"),
+        ns=dev.get("ns"),
+        na=dev.get("na"),
+        nm=dev.get("nm"),
+        ng=dev.get("ng"),
+    )
+
+
+def register_modules_in_registry(hass: HomeAssistant, entry_id: str, stored_devices: dict) -> int:
+    """Register all stored modules in the device registry in one pass."""
+    device_registry = dr.async_get(hass)
+    count = 0
+    for dev in stored_devices.values():
+        if dev.get("device_type") != "module":
+            continue
+        device_registry.async_get_or_create(
+            config_entry_id=entry_id,
+            identifiers={(DOMAIN, dev["device_id"].upper())},
+            manufacturer="net4home",
+            name=dev["name"],
+            model=dev["model"],
+            sw_version=dev.get("sw_version", ""),
+            hw_version=dev.get("hw_version", ""),
+            connections=set(),
+            via_device=None,
+        )
+        count += 1
+    return count
+
 async def register_device_in_registry(
     hass: HomeAssistant,
     entry,
@@ -155,7 +216,8 @@ async def register_device_in_registry(
                 nm=nm_loaded if nm_loaded is not None else nm,
                 ng=ng_loaded if ng_loaded is not None else ng,
             )
-            api.devices[device_id] = device
+            api.add_device(device)
+            await api.async_ensure_platforms(device)
             _LOGGER.debug(f"Device {device_id} added to api.devices (already existing)")
         elif api and device_id in api.devices:
             # Update existing device with new module information if available
@@ -222,7 +284,9 @@ async def register_device_in_registry(
     )
 
     if api:
-        api.devices[device_id] = device
+        # Load missing platforms first, their setup must not pick up the device twice
+        await api.async_ensure_platforms(device)
+        api.add_device(device)
     else:
         _LOGGER.warning(f"No API reference – device {device_id} not saved to internal registry")
 
@@ -0,0 +1,154 @@
+"""Keepalive probes, round-trip measurement and dead-connection detection."""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    D0_REQ,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    KEEPALIVE_MAX_MISSES,
+    KEEPALIVE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Actuators answer D0_REQ with D0_ACTOR_ACK from the same object address
+PROBE_DEVICE_TYPES = ("switch", "light", "cover")
+
+
+class Net4HomeKeepalive:
+    """Probe the connection when it has been silent for `interval` seconds.
+
+    The probe is a D0_REQ to a known actuator. Any received data counts as a
+    sign of life; the answer of the probed object gives the round-trip time.
+    A probe without any traffic within KEEPALIVE_TIMEOUT is a miss: the first
+    miss marks the session degraded, KEEPALIVE_MAX_MISSES in a row abort the
+    connection so the listener reconnects (with a standby connector up, the
+    first miss does). An interval of 0 disables probes.
+    """
+
+    def __init__(self, api, interval: float = DEFAULT_KEEPALIVE_INTERVAL):
+        """Initialize the keepalive."""
+        self._api = api
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._last_rx = time.monotonic()
+        self._probe_sent: Optional[float] = None
+        self._probe_objadr: Optional[int] = None
+        self._probe_index = 0
+        self._misses = 0
+        self.rtt_ms: Optional[float] = None
+        self.stats = {"probes": 0, "answers": 0, "misses": 0, "dead_connections": 0, "rtt_min_ms": None, "rtt_max_ms": None}
+
+    def on_data(self) -> None:
+        """Called for every chunk read from the connector."""
+        self._last_rx = time.monotonic()
+
+    def on_packet(self, paket) -> None:
+        """Called for every parsed bus packet, completes the round trip of a probe."""
+        if self._probe_sent is None or paket.objsrc != self._probe_objadr:
+            return
+        rtt = (time.monotonic() - self._probe_sent) * 1000
+        self._probe_sent = None
+        self.rtt_ms = round(rtt, 1)
+        self.stats["answers"] += 1
+        self.stats["rtt_min_ms"] = min(self.stats["rtt_min_ms"] or self.rtt_ms, self.rtt_ms)
+        self.stats["rtt_max_ms"] = max(self.stats["rtt_max_ms"] or 0.0, self.rtt_ms)
+        async_dispatcher_send(self._api._hass, f"net4home_connection_{self._api._entry_id}")
+
+    def start(self) -> None:
+        """Start the keepalive task."""
+        if self._task and not self._task.done():
+            return
+        self._last_rx = time.monotonic()
+        self._task = asyncio.create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop the keepalive task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def _probe_target(self) -> Optional[int]:
+        """Round-robin over the actuators, so one missing module does not look like a dead link."""
+        targets = [
+            device.objadr
+            for device_type in PROBE_DEVICE_TYPES
+            for device in self._api.devices_of_type(device_type)
+            if device.objadr is not None
+        ]
+        if not targets:
+            return None
+        self._probe_index = (self._probe_index + 1) % len(targets)
+        return targets[self._probe_index]
+
+    async def _async_run(self) -> None:
+        while True:
+            await asyncio.sleep(1.0)
+            if self.interval <= 0 or not self._api.connection.is_ready:
+                self._probe_sent = None
+                continue
+
+            now = time.monotonic()
+            if self._probe_sent is not None:
+                if self._last_rx > self._probe_sent:
+                    # Connection is alive, the answer of the probed object may still come
+                    if self._misses:
+                        self._misses = 0
+                        self._api.connection.confirmed("keepalive")
+                    if now - self._probe_sent > KEEPALIVE_TIMEOUT:
+                        self._probe_sent = None
+                elif now - self._probe_sent > KEEPALIVE_TIMEOUT:
+                    self._probe_sent = None
+                    self._on_miss()
+                continue
+
+            if now - self._last_rx >= self.interval:
+                await self._async_probe()
+
+    async def _async_probe(self) -> None:
+        objadr = self._probe_target()
+        if objadr is None:
+            return
+        self._probe_objadr = objadr
+        self._probe_sent = time.monotonic()
+        self.stats["probes"] += 1
+        _LOGGER.debug(f"[IP] Keepalive probe D0_REQ to OBJ{objadr:05d}")
+        try:
+            await self._api._packet_sender.send_raw_command(
+                ipdst=objadr,
+                ddata=bytes([D0_REQ, 0x00, 0x00]),
+                objsource=self._api._objadr,
+                mi=self._api._mi,
+            )
+        except Exception as e:
+            _LOGGER.debug(f"[IP] Keepalive probe failed: {e}")
+
+    def _on_miss(self) -> None:
+        self._misses += 1
+        self.stats["misses"] += 1
+        _LOGGER.warning(f"[IP] No traffic after keepalive probe ({self._misses}/{KEEPALIVE_MAX_MISSES})")
+        if self._misses == 1:
+            self._api.connection.degraded()
+        # With a standby connector ready, switching over is cheaper than waiting
+        standby = self._api.standby
+        if self._misses >= KEEPALIVE_MAX_MISSES or (standby is not None and standby.is_up):
+            self._misses = 0
+            self.stats["dead_connections"] += 1
+            self._api.abort_connection("keepalive timeout")
+
+    def info(self) -> dict:
+        """Return keepalive statistics for diagnostics."""
+        return {
+            "interval": self.interval,
+            "rtt_ms": self.rtt_ms,
+            "idle_s": round(time.monotonic() - self._last_rx, 1),
+            **self.stats,
+        }
@@ -26,7 +26,7 @@ async def async_setup_entry(
     api: Net4HomeApi = hass.data[DOMAIN][entry.entry_id]
     
     _LOGGER.info(f"[Light] Setup called with {len(api.devices)} devices in API")
-    light_devices = [d for d in api.devices.values() if d.device_type == "light"]
+    light_devices = api.devices_of_type("light")
     _LOGGER.info(f"[Light] Found {len(light_devices)} light devices: {[d.device_id for d in light_devices]}")
 
     entities = [
@@ -132,6 +132,7 @@ class Net4HomeLight(LightEntity):
             "model": self.device.model,
             "via_device": self.device.via_device or "",
             "send_state_changes": self.send_state_changes,  
+            "unconfirmed": self.api.confirmations.is_unconfirmed(self.device.device_id),
         }
 
 
@@ -146,6 +147,11 @@ class Net4HomeLight(LightEntity):
             )
         )
 
+        # Restore last known state from snapshot (re-read from the bus later)
+        last_state = self.api.get_last_state(self.device.device_id)
+        if last_state is not None:
+            self._handle_update(last_state)
+
     @callback
     def _handle_update(self, update_data):
         """Handle update from dispatcher."""
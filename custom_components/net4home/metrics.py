@@ -0,0 +1,192 @@
+"""Traffic metrics of the bus connection (always on)."""
+import time
+from array import array
+from typing import Optional
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from . import const
+
+# Offsets in the decompressed payload (see n4h_parse)
+_OFS_IPSRC = 10
+_OFS_DDATALEN = 16
+_OFS_D0 = 17
+
+# First name per opcode value for readable keys (D0_SET, D0_ACTOR_ACK, ...)
+OPCODE_NAMES: dict[int, str] = {}
+for _name, _value in vars(const).items():
+    if _name.startswith("D0_") and isinstance(_value, int) and not _name.endswith(("_BYTE", "_MASK")):
+        OPCODE_NAMES.setdefault(_value, _name)
+
+
+def opcode_name(opcode: int) -> str:
+    """Return the D0_ name of an opcode (or its number)."""
+    return OPCODE_NAMES.get(opcode, str(opcode))
+
+
+class Net4HomeMetrics:
+    """Counters per opcode and module, decode errors and dispatch durations.
+
+    The hot paths only increment plain ints in arrays indexed by opcode and
+    a dict per sending module. Sent frames are counted by the outbound
+    writer when they are written; frames the outbound or replay queue
+    rejects, replaces or lets expire are counted as dropped. Rates are computed by sample(), every
+    METRICS_INTERVAL seconds, from the difference to the previous sample;
+    queue depths and reconnect counts are read from their owners then.
+    """
+
+    def __init__(self, api):
+        """Initialize empty counters."""
+        self._api = api
+        self.rx_opcodes = array("Q", bytes(8 * 256))
+        self.tx_opcodes = array("Q", bytes(8 * 256))
+        self.tx_dropped = array("Q", bytes(8 * 256))
+        # Telegrams without data bytes are counted separately
+        self.rx_empty = 0
+        self.dispatch_ns = array("Q", bytes(8 * 256))
+        self.dispatch_max_ns = array("Q", bytes(8 * 256))
+        # ipsrc -> received telegrams
+        self.rx_modules: dict[int, int] = {}
+        # DecompressionError code (None for other errors) -> count
+        self.decode_errors: dict[Optional[int], int] = {}
+        self._started = time.monotonic()
+        self._sample_time = self._started
+        self._sample_rx = 0
+        self._sample_rx_data = 0
+        self._sample_tx = 0
+        self._sample_dispatch_ns = 0
+        self._sample_modules: dict[int, int] = {}
+        # Values of the last sample interval
+        self.rx_rate: Optional[float] = None
+        self.tx_rate: Optional[float] = None
+        self.dispatch_avg_us: Optional[float] = None
+        self.module_rates: dict[int, float] = {}
+
+    def on_rx(self, payload: bytes) -> int:
+        """Count a received telegram, return its opcode (-1 without data)."""
+        if len(payload) <= _OFS_D0:
+            return -1
+        ipsrc = payload[_OFS_IPSRC] | payload[_OFS_IPSRC + 1] << 8
+        modules = self.rx_modules
+        modules[ipsrc] = modules.get(ipsrc, 0) + 1
+        if not payload[_OFS_DDATALEN]:
+            self.rx_empty += 1
+            return -1
+        opcode = payload[_OFS_D0]
+        self.rx_opcodes[opcode] += 1
+        return opcode
+
+    def on_dispatched(self, opcode: int, duration_ns: int) -> None:
+        """Add the dispatch duration of a telegram."""
+        if opcode < 0:
+            return
+        self.dispatch_ns[opcode] += duration_ns
+        if duration_ns > self.dispatch_max_ns[opcode]:
+            self.dispatch_max_ns[opcode] = duration_ns
+
+    def on_tx(self, opcode: int) -> None:
+        """Count a telegram written to the connector."""
+        self.tx_opcodes[opcode] += 1
+
+    def on_tx_dropped(self, opcode: int) -> None:
+        """Count a telegram that was never written (rejected, replaced or expired)."""
+        self.tx_dropped[opcode] += 1
+
+    def on_decode_error(self, code: Optional[int]) -> None:
+        """Count a frame that could not be decompressed."""
+        self.decode_errors[code] = self.decode_errors.get(code, 0) + 1
+
+    @callback
+    def sample(self, *_) -> None:
+        """Compute the rates since the previous sample and update the sensors."""
+        now = time.monotonic()
+        elapsed = now - self._sample_time
+        if elapsed <= 0:
+            return
+        rx_data = sum(self.rx_opcodes)
+        rx_total = rx_data + self.rx_empty
+        tx_total = sum(self.tx_opcodes)
+        dispatch_ns = sum(self.dispatch_ns)
+        self.rx_rate = round((rx_total - self._sample_rx) * 60 / elapsed, 1)
+        self.tx_rate = round((tx_total - self._sample_tx) * 60 / elapsed, 1)
+        # Durations are only recorded for telegrams with data
+        dispatched = rx_data - self._sample_rx_data
+        self.dispatch_avg_us = (
+            round((dispatch_ns - self._sample_dispatch_ns) / dispatched / 1000, 1) if dispatched else None
+        )
+        previous = self._sample_modules
+        self.module_rates = {
+            ipsrc: round((count - previous.get(ipsrc, 0)) * 60 / elapsed, 1)
+            for ipsrc, count in self.rx_modules.items()
+        }
+        self._sample_time = now
+        self._sample_rx = rx_total
+        self._sample_rx_data = rx_data
+        self._sample_tx = tx_total
+        self._sample_dispatch_ns = dispatch_ns
+        self._sample_modules = dict(self.rx_modules)
+        async_dispatcher_send(self._api._hass, f"net4home_metrics_{self._api._entry_id}")
+
+    def queue_depths(self) -> dict:
+        """Return the current depth of the api's queues."""
+        api = self._api
+        detail_queue = getattr(api, "_detail_queue", None)
+        capture = getattr(api, "capture", None)
+        return {
+            "outbound": len(api.outbound._queue),
+            "replay": len(api.outbound.replay),
+            "detail": detail_queue.qsize() if detail_queue is not None else 0,
+            "capture_pending_bytes": capture._pending_bytes if capture is not None else 0,
+        }
+
+    def reconnects(self) -> dict:
+        """Return reconnect and failover counts."""
+        api = self._api
+        stats = api.reconnect_supervisor.stats
+        return {
+            "outages": stats["outages"],
+            "attempts": stats["attempts"],
+            "dead_connections": api.keepalive.stats["dead_connections"],
+            "failovers": api.standby.stats["failovers"] if api.standby is not None else 0,
+        }
+
+    def info(self) -> dict:
+        """Return all metrics for diagnostics."""
+        rx_counts = self.rx_opcodes
+        return {
+            "uptime_s": round(time.monotonic() - self._started, 1),
+            "rx_total": sum(rx_counts) + self.rx_empty,
+            "tx_total": sum(self.tx_opcodes),
+            "rx_per_min": self.rx_rate,
+            "tx_per_min": self.tx_rate,
+            "rx_by_opcode": {
+                opcode_name(opcode): count for opcode, count in enumerate(rx_counts) if count
+            },
+            "rx_without_data": self.rx_empty,
+            "tx_by_opcode": {
+                opcode_name(opcode): count for opcode, count in enumerate(self.tx_opcodes) if count
+            },
+            "tx_dropped_total": sum(self.tx_dropped),
+            "tx_dropped_by_opcode": {
+                opcode_name(opcode): count for opcode, count in enumerate(self.tx_dropped) if count
+            },
+            "dispatch_by_opcode": {
+                opcode_name(opcode): {
+                    "avg_us": round(self.dispatch_ns[opcode] / count / 1000, 1),
+                    "max_us": round(self.dispatch_max_ns[opcode] / 1000, 1),
+                }
+                for opcode, count in enumerate(rx_counts) if count
+            },
+            "dispatch_avg_us": self.dispatch_avg_us,
+            "modules": {
+                f"MI{ipsrc:04X}": {"telegrams": count, "per_min": self.module_rates.get(ipsrc)}
+                for ipsrc, count in sorted(self.rx_modules.items(), key=lambda item: -item[1])
+            },
+            "decode_errors": {
+                str(code) if code is not None else "other": count
+                for code, count in self.decode_errors.items()
+            },
+            "queues": self.queue_depths(),
+            "reconnects": self.reconnects(),
+        }
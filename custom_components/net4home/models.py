@@ -1,10 +1,52 @@
 # custom_components/net4home/models.py
 
+import sys
 from typing import Optional
 from typing import NamedTuple
 from datetime import datetime
 
+# Detail status is stored as index into this tuple, the names are kept for the API and config entry
+DETAIL_STATUS_NAMES = ("pending", "in_progress", "completed", "failed")
+
+
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+def _from_epoch(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
 class Net4HomeDevice:
+    """Compact device record (one per bus object/module).
+
+    Uses __slots__, interned model/type strings, an int-coded detail status and
+    epoch timestamps; datetimes and status names are provided as properties.
+    """
+
+    __slots__ = (
+        "device_id",
+        "name",
+        "model",
+        "device_type",
+        "via_device",
+        "objadr",
+        "send_state_changes",
+        "inverted",
+        "_detail_status",
+        "detail_retry_count",
+        "_last_detail_request",
+        "_discovered_at",
+        "module_type",
+        "ns",
+        "na",
+        "nm",
+        "ng",
+        "powerup_status",
+        "min_hell",
+        "timer_time1",
+    )
+
     def __init__(
         self,
         device_id: str,
@@ -30,8 +72,9 @@ class Net4HomeDevice:
     ):
         self.device_id = device_id
         self.name = name
-        self.model = model
-        self.device_type = device_type
+        # Only a few dozen distinct values, share one string object between all devices
+        self.model = sys.intern(model) if isinstance(model, str) else model
+        self.device_type = sys.intern(device_type) if isinstance(device_type, str) else device_type
         self.via_device = via_device
         self.objadr = objadr
         self.send_state_changes = send_state_changes
@@ -49,6 +92,33 @@ class Net4HomeDevice:
         self.min_hell = min_hell
         self.timer_time1 = timer_time1
 
+    @property
+    def detail_status(self) -> str:
+        return DETAIL_STATUS_NAMES[self._detail_status]
+
+    @detail_status.setter
+    def detail_status(self, value: str):
+        self._detail_status = DETAIL_STATUS_NAMES.index(value)
+
+    @property
+    def last_detail_request(self) -> Optional[datetime]:
+        return _from_epoch(self._last_detail_request)
+
+    @last_detail_request.setter
+    def last_detail_request(self, value: Optional[datetime]):
+        self._last_detail_request = _to_epoch(value)
+
+    @property
+    def discovered_at(self) -> Optional[datetime]:
+        return _from_epoch(self._discovered_at)
+
+    @discovered_at.setter
+    def discovered_at(self, value: Optional[datetime]):
+        self._discovered_at = _to_epoch(value)
+
+    def __repr__(self) -> str:
+        return f"Net4HomeDevice({self.device_id!r}, {self.device_type!r}, {self.model!r})"
+
 
 class TN4Hpaket(NamedTuple):
     type8: int
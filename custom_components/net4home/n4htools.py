@@ -311,12 +311,79 @@ def hex_lines(b: bytes) -> str:
 
 
 class DecompressionError(Exception):
+    """Exception raised when decompression fails."""
+    
     def __init__(self, code: int, detail: int):
+        """Initialize decompression error."""
         super().__init__(f"Decompression error {code}, detail: {detail}")
         self.code = code
         self.detail = detail
 
 
+def decomp_section_c_exact(data: bytes, offset: int, length: int, max_out_len: int, use_cs: bool) -> Tuple[bytes, int]:
+    """Decompress a section using the C exact algorithm."""
+    result = bytearray()
+    cs_calc = 0
+    i = offset
+    g_pout_pos = 0
+    ende = False
+    err = False
+
+    while i < length and g_pout_pos < max_out_len and not ende and not err:
+        b = data[i]
+
+        if (b & 0xC0) == 0xC0:
+            if i + 4 >= length:
+                raise DecompressionError(-98, i)
+            cs_rx = (
+                (data[i + 1] << 24)
+                | (data[i + 2] << 16)
+                | (data[i + 3] << 8)
+                | data[i + 4]
+            )
+            i += 5
+            ende = True
+            if use_cs and cs_rx != cs_calc:
+                raise DecompressionError(-100, cs_rx - cs_calc)
+
+        elif (b & 0xC0) == 0x00:
+            if i + 1 >= length:
+                raise DecompressionError(-97, i)
+            cclen = ((data[i] << 8) | data[i + 1]) & 0x3FFF
+            i += 2
+            for j in range(cclen):
+                if i < length:
+                    val = data[i]
+                    result.append(val)
+                    cs_calc += val
+                    g_pout_pos += 1
+                    i += 1
+                else:
+                    raise DecompressionError(-11, i)
+
+        elif (b & 0xC0) == 0x40:
+            if i + 2 >= length:
+                raise DecompressionError(-95, i)
+            cclen = ((data[i] << 8) | data[i + 1]) & 0x3FFF
+            val = data[i + 2]
+            i += 3
+            for _ in range(cclen):
+                result.append(val)
+                cs_calc += val
+                g_pout_pos += 1
+
+        elif (b & 0xC0) == 0x80:
+            raise DecompressionError(-2, i)
+
+        else:
+            raise DecompressionError(-5, i)
+
+    if not err and ende and len(result) <= max_out_len:
+        return bytes(result), len(result)
+
+    raise DecompressionError(-220, i)
+
+
 def compress_section(payload_hex: str) -> str:
     """Compress a hex payload section."""
     cs = sum(int(payload_hex[i:i+2], 16) for i in range(0, len(payload_hex), 2))
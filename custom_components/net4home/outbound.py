@@ -0,0 +1,223 @@
+"""Bounded outbound queue in front of the bus connector writer."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+from .replay import Net4HomeReplayQueue
+from .const import (
+    D0_ENUM_ALL,
+    D0_GET_TYP,
+    D0_RD_ACTOR_DATA,
+    D0_RD_EE16_DATA,
+    D0_RD_MODULSPEC_DATA,
+    D0_RD_SENSOR_DATA,
+    D0_REQ,
+    D0_VALUE_REQ,
+    OUTBOUND_HIGH_WATER,
+    OUTBOUND_LOW_WATER,
+    TRAFFIC_COMMAND,
+    TRAFFIC_DISCOVERY,
+    TRAFFIC_POLL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_OPCODES = frozenset((D0_REQ, D0_VALUE_REQ))
+DISCOVERY_OPCODES = frozenset((
+    D0_ENUM_ALL,
+    D0_GET_TYP,
+    D0_RD_ACTOR_DATA,
+    D0_RD_EE16_DATA,
+    D0_RD_MODULSPEC_DATA,
+    D0_RD_SENSOR_DATA,
+))
+
+
+def traffic_class_for(ddata: bytes) -> str:
+    """Classify a telegram by its first data byte."""
+    if ddata:
+        if ddata[0] in POLL_OPCODES:
+            return TRAFFIC_POLL
+        if ddata[0] in DISCOVERY_OPCODES:
+            return TRAFFIC_DISCOVERY
+    return TRAFFIC_COMMAND
+
+
+class Net4HomeOutboundQueue:
+    """Queue encoded frames and write them from a single task.
+
+    When the depth reaches the high water mark the queue is congested until
+    it drains to the low water mark. While congested, commands wait for
+    space, a new poll replaces the oldest queued poll, and discovery
+    requests are rejected. While disconnected, frames go to the replay
+    queue and are queued again (commands first) once the connection is ready.
+    """
+
+    def __init__(self, high_water: int = OUTBOUND_HIGH_WATER, low_water: int = OUTBOUND_LOW_WATER, metrics=None):
+        """Initialize the queue; metrics counts written and dropped frames per opcode."""
+        self._high_water = high_water
+        self._low_water = low_water
+        self._metrics = metrics
+        # [frame, traffic class, enqueue time, replay key]
+        self._queue: deque[list] = deque()
+        self.replay = Net4HomeReplayQueue(metrics=metrics)
+        self._connected = False
+        self._not_empty = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._congested = False
+        self._writer = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "sent": 0,
+            "blocked": 0,
+            "dropped_polls": 0,
+            "rejected_discovery": 0,
+            "write_errors": 0,
+            "max_depth": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def set_writer(self, writer) -> None:
+        """Use a (new) stream writer and make sure the writer task runs."""
+        self._writer = writer
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._async_run())
+
+    def mark_disconnected(self) -> None:
+        """Connection lost: hold queued and new frames for the next connection."""
+        if not self._connected:
+            return
+        self._connected = False
+        while self._queue:
+            frame, traffic_class, queued_at, key = self._queue.popleft()
+            self.replay.hold(frame, traffic_class, key, queued_at)
+        self._update_congestion()
+        _LOGGER.debug(f"Outbound queue disconnected, {len(self.replay)} frames held for replay")
+
+    def mark_connected(self) -> None:
+        """Connection ready: queue the held frames in priority order before new frames."""
+        self._connected = True
+        frames = self.replay.take()
+        now = time.monotonic()
+        for frame, traffic_class, key in reversed(frames):
+            self._queue.appendleft([frame, traffic_class, now, key])
+        if frames:
+            _LOGGER.info(f"Replaying {len(frames)} frames held during the outage")
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+            self._update_congestion()
+            self._not_empty.set()
+
+    async def async_stop(self) -> None:
+        """Stop the writer task and drop queued frames."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for entry in self._queue:
+            self._dropped(entry[3])
+        self._queue.clear()
+        self._update_congestion()
+
+    async def async_put(self, frame: bytes, traffic_class: str = TRAFFIC_COMMAND, key=None) -> bool:
+        """Queue a frame; return False if it was rejected or dropped.
+
+        key is (target address, opcode) and lets the replay queue collapse
+        superseded frames.
+        """
+        if not self._connected:
+            return self.replay.hold(frame, traffic_class, key)
+
+        if self._congested:
+            if traffic_class == TRAFFIC_DISCOVERY:
+                self.stats["rejected_discovery"] += 1
+                self._dropped(key)
+                _LOGGER.debug("Outbound queue congested, discovery request rejected")
+                return False
+            if traffic_class == TRAFFIC_POLL:
+                for entry in self._queue:
+                    if entry[1] == TRAFFIC_POLL:
+                        self._queue.remove(entry)
+                        self.stats["dropped_polls"] += 1
+                        self._dropped(entry[3])
+                        break
+                else:
+                    self.stats["dropped_polls"] += 1
+                    self._dropped(key)
+                    return False
+            else:
+                self.stats["blocked"] += 1
+                while self._congested:
+                    await self._drained.wait()
+
+        self._queue.append([frame, traffic_class, time.monotonic(), key])
+        self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+        self._update_congestion()
+        self._not_empty.set()
+        return True
+
+    def _dropped(self, key) -> None:
+        if self._metrics is not None and key is not None:
+            self._metrics.on_tx_dropped(key[1])
+
+    def _update_congestion(self) -> None:
+        depth = len(self._queue)
+        if not self._congested and depth >= self._high_water:
+            self._congested = True
+            self._drained.clear()
+            _LOGGER.debug(f"Outbound queue congested ({depth} frames)")
+        elif self._congested and depth <= self._low_water:
+            self._congested = False
+            self._drained.set()
+
+    async def _async_run(self) -> None:
+        while True:
+            if not self._queue:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+
+            entry = self._queue.popleft()
+            frame, traffic_class, queued_at, key = entry
+            self._update_congestion()
+            wait = time.monotonic() - queued_at
+            self.stats["wait_total"] += wait
+            self.stats["wait_max"] = max(self.stats["wait_max"], wait)
+            try:
+                self._writer.write(frame)
+                await self._writer.drain()
+                self.stats["sent"] += 1
+                if self._metrics is not None and key is not None:
+                    self._metrics.on_tx(key[1])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["write_errors"] += 1
+                _LOGGER.error(f"[IP] Error writing queued frame: {e}")
+                # Connection is broken, keep the frame for the reconnect
+                self.replay.hold(frame, traffic_class, key, queued_at)
+                self.mark_disconnected()
+
+    def info(self) -> dict:
+        """Return queue metrics for diagnostics."""
+        sent = self.stats["sent"] or 1
+        return {
+            **self.stats,
+            "depth": len(self._queue),
+            "connected": self._connected,
+            "replay": {**self.replay.stats, "held_now": len(self.replay)},
+            "congested": self._congested,
+            "wait_avg_ms": round(self.stats["wait_total"] / sent * 1000, 1),
+            "wait_max_ms": round(self.stats["wait_max"] * 1000, 1),
+            "high_water": self._high_water,
+            "low_water": self._low_water,
+        }
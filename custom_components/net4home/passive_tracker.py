@@ -0,0 +1,132 @@
+"""Passive state tracking from observed net4home command telegrams."""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .const import (
+    D0_SET,
+    D0_TOGGLE,
+    PASSIVE_CONFIRM_DELAY,
+    PASSIVE_SUPPRESSION_WINDOW,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Group addresses, members come from the group index
+GROUP_ADDRESS_MIN = 0x8000
+
+
+class Net4HomePassiveTracker:
+    """Derive actuator states from D0_SET/D0_INC/D0_DEC/D0_TOGGLE seen on the bus.
+
+    Telegrams from wall switches to an actuator change its state before the
+    actuator answers. Where the result is unambiguous (D0_SET on a switch or
+    dimmer, D0_TOGGLE with a known cached state) it is published directly.
+    Otherwise one confirming D0_REQ is sent; requests per device are spaced
+    by a suppression window so bursts of button presses become one request.
+    """
+
+    def __init__(self, api, confirm_delay: float = PASSIVE_CONFIRM_DELAY,
+                 suppression_window: float = PASSIVE_SUPPRESSION_WINDOW):
+        """Initialize the tracker."""
+        self._api = api
+        self._confirm_delay = confirm_delay
+        self._suppression_window = suppression_window
+        self._pending: dict[str, asyncio.TimerHandle] = {}
+        self._last_request: dict[str, float] = {}
+        self.stats = {"inferred": 0, "group_commands": 0, "confirm_requests": 0, "suppressed": 0}
+
+    def handle_command(self, paket) -> None:
+        """Process a D0_SET/D0_INC/D0_DEC/D0_TOGGLE telegram."""
+        cmd = paket.ddata[0]
+
+        # Sender is an input object (e.g. contact): its own state depends on the module config
+        source = self._api.devices.get(f"OBJ{paket.objsrc:05d}")
+        if source is not None and source.device_type == "binary_sensor":
+            self.request_confirmation(source.device_id)
+
+        value = paket.ddata[1] if len(paket.ddata) > 1 else None
+
+        if paket.ipdest >= GROUP_ADDRESS_MIN:
+            # Apply to all configured members in one step
+            members = self._api.group_index.members(paket.ipdest)
+            if members:
+                self.stats["group_commands"] += 1
+            for objadr in members:
+                target = self._api.devices.get(f"OBJ{objadr:05d}")
+                if target is not None:
+                    self._apply(target, cmd, value)
+            return
+
+        target = self._api.devices.get(f"OBJ{paket.ipdest:05d}")
+        if target is not None:
+            self._apply(target, cmd, value)
+
+    def _apply(self, target, cmd: int, value: Optional[int]) -> None:
+        state = self._infer(target, cmd, value)
+        if state is None:
+            self.request_confirmation(target.device_id)
+            return
+
+        self.stats["inferred"] += 1
+        _LOGGER.debug(f"Passive state for {target.device_id} from command {cmd} (value={value}): {state}")
+        self._api._publish_state(target.device_id, state)
+
+    def _infer(self, device, cmd: int, value: Optional[int]):
+        """Return the state payload after the command, or None if ambiguous."""
+        if device.device_type == "switch" and device.model != "Timer":
+            if cmd == D0_SET and value is not None:
+                return value > 0
+            if cmd == D0_TOGGLE:
+                is_on = self._cached_is_on(device.device_id)
+                return None if is_on is None else not is_on
+            return None
+
+        if device.device_type == "light":
+            if cmd == D0_SET and value is not None and value <= 100:
+                if value == 0:
+                    return {"is_on": False}
+                return {"is_on": True, "brightness": round(value * 255 / 100)}
+            if cmd == D0_TOGGLE:
+                is_on = self._cached_is_on(device.device_id)
+                # Brightness after switching on is unknown (last value / powerup config)
+                return None if is_on is None or not is_on else {"is_on": False}
+            # D0_INC/D0_DEC ramp the brightness, the end value is unknown
+            return None
+
+        # Covers move for their run time, timers and climate setpoints depend on the module
+        return None
+
+    def _cached_is_on(self, device_id: str) -> Optional[bool]:
+        state = self._api.get_last_state(device_id)
+        if isinstance(state, dict):
+            state = state.get("is_on")
+        return None if state is None else bool(state)
+
+    def request_confirmation(self, device_id: str) -> None:
+        """Schedule one D0_REQ for a device, respecting its suppression window."""
+        if device_id in self._pending:
+            self.stats["suppressed"] += 1
+            return
+
+        now = time.monotonic()
+        last = self._last_request.get(device_id)
+        delay = self._confirm_delay
+        if last is not None:
+            delay = max(delay, last + self._suppression_window - now)
+
+        loop = asyncio.get_running_loop()
+        self._pending[device_id] = loop.call_later(delay, self._fire, device_id)
+
+    def _fire(self, device_id: str) -> None:
+        self._pending.pop(device_id, None)
+        self._last_request[device_id] = time.monotonic()
+        self.stats["confirm_requests"] += 1
+        asyncio.create_task(self._api.async_request_status(device_id))
+
+    def cancel(self) -> None:
+        """Cancel all scheduled confirmations."""
+        for handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
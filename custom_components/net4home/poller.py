@@ -0,0 +1,150 @@
+"""Adaptive polling of bus objects that do not push their state."""
+import asyncio
+import heapq
+import logging
+import random
+import time
+
+from .const import (
+    POLL_DEVICE_TYPES,
+    POLL_MIN_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_BACKOFF_FACTOR,
+    POLL_JITTER,
+    POLL_BUDGET_PER_SECOND,
+    POLL_BUDGET_BURST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between checks for new/removed devices
+_SYNC_INTERVAL = 60.0
+
+
+class Net4HomePollScheduler:
+    """Poll non-push objects (send_state_changes off) with an adaptive interval.
+
+    The interval drops to the minimum after a change and doubles while the
+    state is stable, each due time is jittered. Objects that got a value from
+    the bus since their last poll are skipped. A token bucket limits the D0_REQ
+    rate so polling never takes more than its share of the bus.
+    """
+
+    def __init__(self, api):
+        """Initialize the scheduler."""
+        self._api = api
+        self._task: asyncio.Task | None = None
+        self._heap: list[tuple[float, str]] = []
+        # device_id -> [interval, value at last poll, wall clock time of last poll]
+        self._objects: dict[str, list] = {}
+        self._tokens = float(POLL_BUDGET_BURST)
+        self._tokens_at = time.monotonic()
+        self.stats = {"polls": 0, "skipped_pushed": 0, "deferred_budget": 0}
+
+    @staticmethod
+    def _is_pollable(device) -> bool:
+        return (
+            device.device_type in POLL_DEVICE_TYPES
+            and not device.send_state_changes
+            and device.objadr is not None
+            and device.device_id.startswith("OBJ")
+        )
+
+    def _jitter(self, interval: float) -> float:
+        return interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def _sync(self) -> None:
+        """Track new pollable devices, forget devices that now push their state."""
+        now = time.monotonic()
+        for device_id, device in self._api.devices.items():
+            pollable = self._is_pollable(device)
+            if pollable and device_id not in self._objects:
+                self._objects[device_id] = [POLL_MIN_INTERVAL, None, 0.0]
+                # Spread the first polls over the minimum interval
+                heapq.heappush(self._heap, (now + random.uniform(0, POLL_MIN_INTERVAL), device_id))
+            elif not pollable and device_id in self._objects:
+                del self._objects[device_id]
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(POLL_BUDGET_BURST, self._tokens + (now - self._tokens_at) * POLL_BUDGET_PER_SECOND)
+        self._tokens_at = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def start(self) -> None:
+        """Start the scheduler task."""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop the scheduler task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _async_run(self) -> None:
+        last_sync = 0.0
+        while True:
+            now = time.monotonic()
+            if now - last_sync >= _SYNC_INTERVAL:
+                self._sync()
+                last_sync = now
+
+            while self._heap and self._heap[0][0] <= now:
+                if not self._take_token():
+                    self.stats["deferred_budget"] += 1
+                    break
+                _, device_id = heapq.heappop(self._heap)
+                entry = self._objects.get(device_id)
+                if entry is None:
+                    continue
+                await self._async_poll(device_id, entry, now)
+
+            await asyncio.sleep(1.0)
+
+    async def _async_poll(self, device_id: str, entry: list, now: float) -> None:
+        interval, last_value, last_poll = entry
+        device = self._api.devices.get(device_id)
+        if device is None:
+            self._objects.pop(device_id, None)
+            return
+        current = self._api.get_last_state(device_id)
+
+        # Value arrived from the bus since the last poll (push, ACK of a command, passive tracking)
+        updated = self._api.state_store.last_update(device.objadr)
+        if last_poll and updated is not None and updated > last_poll + 1:
+            self.stats["skipped_pushed"] += 1
+            entry[1] = current
+            entry[2] = time.time()
+            heapq.heappush(self._heap, (now + self._jitter(interval), device_id))
+            return
+
+        if last_poll and current != last_value:
+            interval = POLL_MIN_INTERVAL
+        elif last_poll:
+            interval = min(POLL_MAX_INTERVAL, interval * POLL_BACKOFF_FACTOR)
+
+        entry[0] = interval
+        entry[1] = current
+        entry[2] = time.time()
+        self.stats["polls"] += 1
+        await self._api.async_request_status(device_id)
+        heapq.heappush(self._heap, (now + self._jitter(interval), device_id))
+
+    def info(self) -> dict:
+        """Return scheduler information for diagnostics."""
+        intervals = [entry[0] for entry in self._objects.values()]
+        return {
+            **self.stats,
+            "objects": len(self._objects),
+            "avg_interval": round(sum(intervals) / len(intervals), 1) if intervals else None,
+            "running": self._task is not None and not self._task.done(),
+        }
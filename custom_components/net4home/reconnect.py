@@ -0,0 +1,130 @@
+"""Reconnect supervisor with jittered exponential backoff and a circuit breaker."""
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .connection import SENDABLE_STATES
+from .const import (
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_BREAKER_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+
+
+class Net4HomeReconnectSupervisor:
+    """Reconnect until the connector is reachable again.
+
+    The first retry is immediate, then the delay doubles from
+    RECONNECT_BASE_DELAY up to RECONNECT_MAX_DELAY with +/-50% jitter.
+    Attempts never stop; after RECONNECT_BREAKER_THRESHOLD failures in a row
+    the circuit breaker opens (shown as entity) until a connection succeeds.
+    Outages are measured from the loss of the connection until the session
+    is ready again. Changes are sent via net4home_connection_{entry_id}.
+    """
+
+    def __init__(self, api):
+        """Initialize the supervisor."""
+        self._api = api
+        self.breaker = BREAKER_CLOSED
+        self.failures = 0
+        self._outage_started: Optional[float] = None
+        self.stats = {
+            "outages": 0,
+            "attempts": 0,
+            "last_outage_s": None,
+            "longest_outage_s": None,
+            "total_outage_s": 0.0,
+            "last_error": None,
+        }
+        api.connection.add_listener(self._on_connection_state)
+
+    def _delay(self, attempt: int) -> float:
+        if attempt <= 1:
+            return 0.0
+        delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** (attempt - 2))
+        return delay * random.uniform(0.5, 1.5)
+
+    @property
+    def outage_duration(self) -> Optional[float]:
+        """Return the duration of the current outage in seconds (None while connected)."""
+        if self._outage_started is None:
+            return None
+        return time.monotonic() - self._outage_started
+
+    async def async_run(self) -> None:
+        """Reconnect; returns when the TCP connection is open again."""
+        if self._outage_started is None:
+            self._outage_started = time.monotonic()
+            self.stats["outages"] += 1
+            self._notify()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            delay = self._delay(attempt)
+            if delay:
+                _LOGGER.warning(f"[IP] Reconnect attempt {attempt} in {delay:.1f}s (breaker {self.breaker})")
+                await asyncio.sleep(delay)
+            else:
+                _LOGGER.warning("[IP] Connection lost, reconnecting immediately")
+
+            self.stats["attempts"] += 1
+            try:
+                if await self._api.async_reopen():
+                    _LOGGER.info(f"[IP] Reconnect successful on attempt {attempt}")
+                    self.failures = 0
+                    self._set_breaker(BREAKER_CLOSED)
+                    return
+                self.stats["last_error"] = "connection closed after open"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["last_error"] = str(e)
+                _LOGGER.debug(f"[IP] Reconnect attempt {attempt} failed: {e}")
+
+            self.failures += 1
+            if self.failures >= RECONNECT_BREAKER_THRESHOLD:
+                self._set_breaker(BREAKER_OPEN)
+
+    def _set_breaker(self, state: str) -> None:
+        if state == self.breaker:
+            return
+        self.breaker = state
+        if state == BREAKER_OPEN:
+            _LOGGER.error(
+                f"[IP] Bus connector unreachable after {self.failures} attempts, "
+                f"retrying every {RECONNECT_MAX_DELAY:.0f}s at most"
+            )
+        self._notify()
+
+    def _on_connection_state(self, old: str, new: str) -> None:
+        if new in SENDABLE_STATES and self._outage_started is not None:
+            duration = time.monotonic() - self._outage_started
+            self._outage_started = None
+            self.stats["last_outage_s"] = round(duration, 3)
+            self.stats["longest_outage_s"] = round(max(self.stats["longest_outage_s"] or 0.0, duration), 3)
+            self.stats["total_outage_s"] = round(self.stats["total_outage_s"] + duration, 3)
+            _LOGGER.info(f"[IP] Connection restored after {duration:.3f}s")
+            self._notify()
+
+    def _notify(self) -> None:
+        async_dispatcher_send(self._api._hass, f"net4home_connection_{self._api._entry_id}")
+
+    def info(self) -> dict:
+        """Return reconnect statistics for diagnostics."""
+        current = self.outage_duration
+        return {
+            "breaker": self.breaker,
+            "consecutive_failures": self.failures,
+            "current_outage_s": round(current, 1) if current is not None else None,
+            **self.stats,
+        }
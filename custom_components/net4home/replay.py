@@ -0,0 +1,99 @@
+"""Hold outbound frames while the bus connector is disconnected."""
+import logging
+import time
+from typing import Optional
+
+from .const import (
+    D0_REQ,
+    D0_SET,
+    D0_SET_N,
+    D0_VALUE_REQ,
+    REPLAY_MAX_AGE,
+    REPLAY_MAX_FRAMES,
+    TRAFFIC_COMMAND,
+    TRAFFIC_POLL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# A newer frame with the same (target, opcode) replaces the older one
+COLLAPSIBLE_OPCODES = frozenset((D0_SET, D0_SET_N, D0_REQ, D0_VALUE_REQ))
+
+# Flush order after the reconnect
+FLUSH_PRIORITY = (TRAFFIC_COMMAND, TRAFFIC_POLL)
+
+
+class Net4HomeReplayQueue:
+    """In-memory queue of frames that could not be sent during an outage.
+
+    Frames expire by age per traffic class (discovery is never held, the
+    detail queue and the reconnect resync read everything again). Idempotent
+    frames are collapsed per target so only the newest value is replayed.
+    Frames that are not held, collapsed, expired or pushed out are reported
+    to metrics.on_tx_dropped() with their opcode.
+    """
+
+    def __init__(self, max_age: Optional[dict] = None, max_frames: int = REPLAY_MAX_FRAMES, metrics=None):
+        """Initialize the replay queue."""
+        self._max_age = max_age or REPLAY_MAX_AGE
+        self._max_frames = max_frames
+        self._metrics = metrics
+        # slot -> [frame, traffic class, time, key], insertion order is the send order
+        self._frames: dict = {}
+        self._seq = 0
+        self.stats = {"held": 0, "collapsed": 0, "expired": 0, "overflow": 0, "replayed": 0}
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def hold(self, frame: bytes, traffic_class: str, key=None, queued_at: Optional[float] = None) -> bool:
+        """Keep a frame for the next connection; return False if its class is not replayed."""
+        if self._max_age.get(traffic_class, 0) <= 0:
+            self._dropped(key)
+            return False
+
+        if key is not None and key[1] in COLLAPSIBLE_OPCODES:
+            slot = key
+            if self._frames.pop(slot, None) is not None:
+                self.stats["collapsed"] += 1
+                self._dropped(key)
+        else:
+            # Not collapsible, every frame is replayed
+            self._seq += 1
+            slot = ("seq", self._seq)
+
+        if len(self._frames) >= self._max_frames:
+            self._dropped(self._frames.pop(next(iter(self._frames)))[3])
+            self.stats["overflow"] += 1
+
+        self._frames[slot] = [frame, traffic_class, queued_at or time.monotonic(), key]
+        self.stats["held"] += 1
+        return True
+
+    def take(self) -> list[tuple[bytes, str, object]]:
+        """Return the frames that did not expire, commands first, and empty the queue."""
+        now = time.monotonic()
+        result = []
+        for traffic_class in FLUSH_PRIORITY:
+            max_age = self._max_age.get(traffic_class, 0)
+            for frame, frame_class, queued_at, key in self._frames.values():
+                if frame_class != traffic_class:
+                    continue
+                if now - queued_at > max_age:
+                    self.stats["expired"] += 1
+                    self._dropped(key)
+                    continue
+                result.append((frame, frame_class, key))
+        self._frames.clear()
+        self.stats["replayed"] += len(result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all held frames."""
+        for entry in self._frames.values():
+            self._dropped(entry[3])
+        self._frames.clear()
+
+    def _dropped(self, key) -> None:
+        if self._metrics is not None and key is not None:
+            self._metrics.on_tx_dropped(key[1])
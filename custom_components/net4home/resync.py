@@ -0,0 +1,141 @@
+"""Paced bulk status resync (D0_REQ sweep) with coverage tracking."""
+import asyncio
+import logging
+import time
+from typing import Iterable, Optional
+
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    RESYNC_DEVICE_TYPES,
+    RESYNC_RATE,
+    RESYNC_RETRIES,
+    RESYNC_ANSWER_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Net4HomeBulkResync:
+    """Request the status of many objects through a paced pipeline.
+
+    D0_REQ frames are spaced by 1/rate seconds. Every state published for a
+    requested device counts as its answer; devices that stay silent are asked
+    again up to `retries` times. Progress is sent via the dispatcher signal
+    net4home_resync_progress_{entry_id}, the result is fired as the
+    net4home_resync_finished event and kept for the diagnostics.
+    """
+
+    def __init__(self, api):
+        """Initialize the resync."""
+        self._api = api
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._waiting: set[str] = set()
+        self._all_answered = asyncio.Event()
+        self.progress: dict = {"running": False}
+        self.last_result: Optional[dict] = None
+
+    def select(self, device_types: Optional[Iterable[str]] = None,
+               device_ids: Optional[Iterable[str]] = None) -> list[str]:
+        """Return the devices matching the filter (default: all actuators and climate)."""
+        if device_ids:
+            return [device_id for device_id in device_ids if device_id in self._api.devices]
+        types = set(device_types or RESYNC_DEVICE_TYPES)
+        return [
+            device.device_id
+            for device_type in types
+            for device in self._api.devices_of_type(device_type)
+            if device.objadr is not None
+        ]
+
+    def mark_answered(self, device_id: str) -> None:
+        """Called for every published state, completes the request of a device."""
+        if device_id in self._waiting:
+            self._waiting.discard(device_id)
+            self.progress["answered"] += 1
+            if not self._waiting:
+                self._all_answered.set()
+
+    def async_start(self, **kwargs) -> asyncio.Task:
+        """Run a resync in the background (the listener must keep reading the answers)."""
+        if self._task and not self._task.done():
+            _LOGGER.debug("Resync already running")
+            return self._task
+        self._task = asyncio.create_task(self.async_run(**kwargs))
+        return self._task
+
+    async def async_stop(self) -> None:
+        """Cancel a running background resync."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def async_run(
+        self,
+        device_types: Optional[Iterable[str]] = None,
+        device_ids: Optional[Iterable[str]] = None,
+        rate: float = RESYNC_RATE,
+        retries: int = RESYNC_RETRIES,
+        answer_timeout: float = RESYNC_ANSWER_TIMEOUT,
+    ) -> dict:
+        """Request the status of the selected devices and return the coverage."""
+        async with self._lock:
+            targets = self.select(device_types, device_ids)
+            started = time.monotonic()
+            interval = 1.0 / rate if rate > 0 else 0.0
+            self._waiting = set(targets)
+            self._all_answered.clear()
+            self.progress = {"running": True, "total": len(targets), "sent": 0, "answered": 0, "attempt": 0}
+            _LOGGER.info(f"Resync of {len(targets)} devices started ({rate:.1f} requests/s, {retries} retries)")
+
+            try:
+                for attempt in range(retries + 1):
+                    pending = [device_id for device_id in targets if device_id in self._waiting]
+                    if not pending:
+                        break
+                    self.progress["attempt"] = attempt + 1
+                    for device_id in pending:
+                        if device_id not in self._waiting:
+                            continue
+                        await self._api.async_request_status(device_id)
+                        self.progress["sent"] += 1
+                        self._send_progress()
+                        await asyncio.sleep(interval)
+
+                    if self._waiting:
+                        try:
+                            await asyncio.wait_for(self._all_answered.wait(), answer_timeout)
+                        except asyncio.TimeoutError:
+                            _LOGGER.debug(f"Resync attempt {attempt + 1}: {len(self._waiting)} devices silent")
+            finally:
+                missing = sorted(self._waiting)
+                self._waiting = set()
+                self.progress["running"] = False
+                self._send_progress()
+
+            result = {
+                "requested": len(targets),
+                "answered": len(targets) - len(missing),
+                "missing": missing,
+                "coverage": round(100.0 * (len(targets) - len(missing)) / len(targets), 1) if targets else 100.0,
+                "frames": self.progress["sent"],
+                "attempts": self.progress["attempt"],
+                "duration": round(time.monotonic() - started, 2),
+            }
+            self.last_result = result
+            _LOGGER.info(
+                f"Resync finished: {result['answered']}/{result['requested']} devices answered "
+                f"({result['coverage']}%) in {result['duration']}s"
+            )
+            if missing:
+                _LOGGER.debug(f"No answer from: {', '.join(missing)}")
+            self._api._hass.bus.async_fire("net4home_resync_finished", {"entry_id": self._api._entry_id, **result})
+            return result
+
+    def _send_progress(self) -> None:
+        async_dispatcher_send(self._api._hass, f"net4home_resync_progress_{self._api._entry_id}", dict(self.progress))
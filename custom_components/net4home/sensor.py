@@ -12,7 +12,17 @@ from homeassistant.core import callback
 
 from .const import DOMAIN
 from .api import Net4HomeApi, Net4HomeDevice
-from .diagnostic_sensor import Net4HomeInvertedDiagnosticSensor
+from .diagnostic_sensor import (
+    Net4HomeInvertedDiagnosticSensor,
+    Net4HomeReconnectBreakerDiagnosticSensor,
+    Net4HomeOutageDiagnosticSensor,
+    Net4HomeRoundTripDiagnosticSensor,
+    Net4HomeReceivedRateDiagnosticSensor,
+    Net4HomeSentRateDiagnosticSensor,
+    Net4HomeDecodeErrorsDiagnosticSensor,
+    Net4HomeDispatchTimeDiagnosticSensor,
+    Net4HomeQueueDepthDiagnosticSensor,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,21 +56,21 @@ async def async_setup_entry(hass, entry, async_add_entities: Callable):
     _LOGGER.debug(f"Listening for new devices with key: net4home_new_device_{entry.entry_id}")
 
     # Climate device sensors
-    climate_devices = [d for d in api.devices.values() if d.device_type == "climate"]
+    climate_devices = api.devices_of_type("climate")
     _LOGGER.info(f"[Sensor] Found {len(climate_devices)} climate devices")
     for device in climate_devices:
         for sensor_key, unit in CLIMATE_SENSOR_TYPES:
             entities.append(Net4HomeSensor(api, entry, device, sensor_key, unit))
     
     # HS-Time device sensors (direkt am MI-Device, wie bei UP-TLH)
-    hs_time_devices = [d for d in api.devices.values() if d.device_type == "sensor" and d.model == "HS-Time"]
+    hs_time_devices = [d for d in api.devices_of_type("sensor") if d.model == "HS-Time"]
     _LOGGER.info(f"[Sensor] Found {len(hs_time_devices)} HS-Time devices")
     for device in hs_time_devices:
         for sensor_key, unit in HS_TIME_SENSOR_TYPES:
             entities.append(Net4HomeSensor(api, entry, device, sensor_key, unit))
 
     # Sensor devices
-    sensor_devices = [d for d in api.devices.values() if d.device_type == "sensor"]
+    sensor_devices = api.devices_of_type("sensor")
     _LOGGER.info(f"[Sensor] Found {len(sensor_devices)} sensor devices: {[d.device_id for d in sensor_devices]}")
     for device in sensor_devices:
         sensor_info = SENSOR_MODEL_TO_TYPE_UNIT.get(device.model.lower())
@@ -73,17 +83,33 @@ async def async_setup_entry(hass, entry, async_add_entities: Callable):
 
     # RF-Reader devices (only MI devices, not OBJ child devices)
     # IMPORTANT: Devices with via_device are OBJ devices, even if device_id starts with "MI"
-    rf_reader_devices = [d for d in api.devices.values() if d.device_type == "rf_reader" and d.device_id.startswith("MI") and not d.via_device]
+    rf_reader_devices = [d for d in api.devices_of_type("rf_reader") if d.device_id.startswith("MI") and not d.via_device]
     _LOGGER.info(f"[Sensor] Found {len(rf_reader_devices)} RF-Reader devices: {[d.device_id for d in rf_reader_devices]}")
     for device in rf_reader_devices:
         entities.append(Net4HomeRfReaderSensor(api, entry, device))
 
     # DIAGNOSTIC entities for binary sensors!
-    binary_sensor_devices = [d for d in api.devices.values() if d.device_type == "binary_sensor"]
+    binary_sensor_devices = api.devices_of_type("binary_sensor")
     _LOGGER.info(f"[Sensor] Found {len(binary_sensor_devices)} binary_sensor devices")
     for device in binary_sensor_devices:
         diagnostic_entities.append(Net4HomeInvertedDiagnosticSensor(entry, device))
 
+    # Connection diagnostics of the bus connector
+    diagnostic_entities.append(Net4HomeReconnectBreakerDiagnosticSensor(entry, api))
+    diagnostic_entities.append(Net4HomeOutageDiagnosticSensor(entry, api))
+    diagnostic_entities.append(Net4HomeRoundTripDiagnosticSensor(entry, api))
+    # Traffic metrics (disabled by default)
+    diagnostic_entities.extend(
+        sensor_class(entry, api)
+        for sensor_class in (
+            Net4HomeReceivedRateDiagnosticSensor,
+            Net4HomeSentRateDiagnosticSensor,
+            Net4HomeDecodeErrorsDiagnosticSensor,
+            Net4HomeDispatchTimeDiagnosticSensor,
+            Net4HomeQueueDepthDiagnosticSensor,
+        )
+    )
+
     _LOGGER.info(f"[Sensor] Creating {len(entities)} sensor entities and {len(diagnostic_entities)} diagnostic entities")
     async_add_entities(entities + diagnostic_entities, True)  
 
@@ -0,0 +1,49 @@
+"""Persistent snapshot of the last known net4home entity states."""
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Net4HomeStateSnapshot:
+    """Load and save the last decoded state of every object of a config entry.
+
+    The snapshot holds the payloads exactly as they were dispatched on
+    ``net4home_update_<device_id>``, so entities can feed them through their
+    regular update handler when they are added after a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the snapshot store for a config entry."""
+        self._store = Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.states")
+
+    async def async_load(self) -> dict[str, Any]:
+        """Return the stored states (empty dict if there is no snapshot yet)."""
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning(f"Unable to load state snapshot: {e}")
+            return {}
+
+        if not isinstance(data, dict):
+            return {}
+        states = data.get("states", {})
+        _LOGGER.debug(f"Loaded state snapshot with {len(states)} objects")
+        return states
+
+    async def async_save(self, states: dict[str, Any]) -> None:
+        """Write the given states to disk."""
+        try:
+            await self._store.async_save({"states": states})
+            _LOGGER.debug(f"Saved state snapshot with {len(states)} objects")
+        except Exception as e:
+            _LOGGER.error(f"Unable to save state snapshot: {e}")
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot file (config entry removed)."""
+        await self._store.async_remove()
@@ -0,0 +1,209 @@
+"""Hot-standby connection to a second bus connector."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+from .const import LINK_DEDUP_WINDOW, STANDBY_RETRY_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+LINK_PRIMARY = "primary"
+LINK_STANDBY = "standby"
+
+
+class Net4HomeStandbyLink:
+    """Keep a logged-in connection to a second connector on the same bus.
+
+    The standby link only receives; its telegrams are dispatched like those
+    of the primary link. While both links are up every telegram arrives
+    twice, the copy from the other link within LINK_DEDUP_WINDOW is dropped
+    (before the duplicate filter, so toggles are not applied twice).
+    When the primary connection fails, the api takes over the standby
+    connection (see Net4HomeApi.async_reopen) and this link reconnects to
+    the former primary connector as the new standby.
+    """
+
+    def __init__(self, api, host: str, port: int, receiver):
+        """Initialize the standby link; receiver is a separate N4HPacketReceiver."""
+        self._api = api
+        self.host = host
+        self.port = port
+        self._receiver = receiver
+        self._receiver.on_password_ack = self._on_password_ack
+        self._reader = None
+        self._writer = None
+        self._authenticated = False
+        self._task: Optional[asyncio.Task] = None
+        # Dispatch is not interrupted by a takeover
+        self._dispatch_lock = asyncio.Lock()
+        self._last_rx: Optional[float] = None
+        # payload (without IP header) -> deliveries not matched by the other link yet, oldest first
+        self._seen: OrderedDict[bytes, deque[tuple[str, float]]] = OrderedDict()
+        self.stats = {
+            "connects": 0,
+            "disconnects": 0,
+            "frames": 0,
+            "duplicates": 0,
+            "failovers": 0,
+            "last_error": None,
+        }
+
+    @property
+    def is_up(self) -> bool:
+        """Return True if the standby connection can take over."""
+        return (
+            self._writer is not None
+            and not self._writer.is_closing()
+            and self._authenticated
+        )
+
+    def _on_password_ack(self) -> None:
+        self._authenticated = True
+
+    def is_copy(self, payload: bytes, link: str) -> bool:
+        """Return True if the other link delivered the same telegram just now.
+
+        Every unmatched delivery is kept, so two identical telegrams (e.g. two
+        toggles) that arrive on one link before their copies on the other are
+        matched one by one and both dispatched exactly once.
+        """
+        now = time.monotonic()
+        key = bytes(payload[8:])
+        outstanding = self._seen.get(key)
+        if outstanding is None:
+            outstanding = self._seen[key] = deque()
+        else:
+            while outstanding and now - outstanding[0][1] > LINK_DEDUP_WINDOW:
+                outstanding.popleft()
+            # All unmatched deliveries of a payload come from the same link
+            if outstanding and outstanding[0][0] != link:
+                outstanding.popleft()
+                if not outstanding:
+                    del self._seen[key]
+                self.stats["duplicates"] += 1
+                return True
+            self._seen.move_to_end(key)
+        outstanding.append((link, now))
+        # Payloads are ordered by their newest delivery
+        while self._seen:
+            first = next(iter(self._seen.values()))
+            if now - first[-1][1] <= LINK_DEDUP_WINDOW:
+                break
+            self._seen.popitem(last=False)
+        return False
+
+    def start(self, delay: float = 0.0) -> None:
+        """Connect to the standby connector in the background."""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._async_run(delay))
+
+    async def async_stop(self) -> None:
+        """Stop the link and close the standby connection."""
+        await self._async_cancel()
+        self._close()
+
+    async def _async_cancel(self) -> None:
+        if self._task and not self._task.done():
+            async with self._dispatch_lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception as e:
+                _LOGGER.debug(f"[IP] Error closing standby connection: {e}")
+        self._reader = None
+        self._writer = None
+        self._authenticated = False
+
+    async def async_take_over(self, host: str, port: int, receiver):
+        """Hand the standby connection to the api and become standby for host:port.
+
+        Returns (reader, writer, receiver, (host, port)) of the standby
+        connection; receiver is the api's old receiver, used from now on here.
+        """
+        await self._async_cancel()
+        reader, writer, link_receiver = self._reader, self._writer, self._receiver
+        link = (self.host, self.port)
+        _LOGGER.warning(
+            f"[IP] Failover to standby bus connector at {self.host}:{self.port}, "
+            f"{host}:{port} becomes the standby"
+        )
+        self.stats["failovers"] += 1
+        self._reader = None
+        self._writer = None
+        self._authenticated = False
+        self._seen.clear()
+        self.host, self.port = host, port
+        self._receiver = receiver
+        self._receiver.reset()
+        self._receiver.on_password_ack = self._on_password_ack
+        # The former primary is probably rebooting
+        self.start(STANDBY_RETRY_DELAY)
+        return reader, writer, link_receiver, link
+
+    async def _async_run(self, delay: float) -> None:
+        while True:
+            if delay:
+                await asyncio.sleep(delay)
+            delay = STANDBY_RETRY_DELAY
+            try:
+                self._reader, self._writer = await self._api._async_open_link(self.host, self.port)
+            except (OSError, asyncio.TimeoutError) as e:
+                self.stats["last_error"] = str(e)
+                _LOGGER.debug(f"[IP] Standby bus connector {self.host}:{self.port} not reachable: {e}")
+                continue
+
+            self._receiver.reset()
+            self._authenticated = False
+            self.stats["connects"] += 1
+            _LOGGER.info(f"[IP] Standby bus connector at {self.host}:{self.port} connected")
+            try:
+                await self._async_read()
+            except asyncio.CancelledError:
+                raise
+            except (ConnectionResetError, OSError) as e:
+                self.stats["last_error"] = str(e)
+            self.stats["disconnects"] += 1
+            _LOGGER.warning(f"[IP] Connection to standby bus connector at {self.host}:{self.port} lost")
+            self._close()
+
+    async def _async_read(self) -> None:
+        while True:
+            data = await self._reader.read(4096)
+            if not data:
+                return
+            self._last_rx = time.monotonic()
+            for ptype, payload in self._receiver.receive_raw_command(data):
+                # Connectors without password acknowledgement forward bus traffic after the login
+                self._authenticated = True
+                self.stats["frames"] += 1
+                if self.is_copy(payload, LINK_STANDBY):
+                    continue
+                opcode = self._api.metrics.on_rx(payload)
+                async with self._dispatch_lock:
+                    started = time.perf_counter_ns()
+                    try:
+                        await self._api._async_handle_payload(payload)
+                        self._api.metrics.on_dispatched(opcode, time.perf_counter_ns() - started)
+                    except Exception as e:
+                        _LOGGER.error(f"Error dispatching standby telegram: {e}", exc_info=True)
+
+    def info(self) -> dict:
+        """Return standby link statistics for diagnostics."""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "up": self.is_up,
+            "idle_s": round(time.monotonic() - self._last_rx, 1) if self._last_rx is not None else None,
+            **self.stats,
+        }
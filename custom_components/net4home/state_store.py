@@ -0,0 +1,165 @@
+"""Central live state store for all net4home bus objects."""
+import time
+from array import array
+from typing import Iterable, Optional
+
+# One slot per object address (objadr is 16 bit)
+OBJADR_COUNT = 0x10000
+
+HVAC_MODES = ("off", "heat", "cool", "heat_cool")
+
+# column name -> (array typecode, known bit, scale)
+# Temperatures are stored in tenths of a degree
+COLUMNS = {
+    "binary": ("B", 0x0001, 1),        # on/off (closed for covers and contacts)
+    "level": ("B", 0x0002, 1),         # brightness 0-255
+    "hvac_mode": ("B", 0x0004, 1),     # index in HVAC_MODES
+    "temperature": ("h", 0x0008, 10),
+    "targettemp": ("h", 0x0010, 10),
+    "presetday": ("h", 0x0020, 10),
+    "presetnight": ("h", 0x0040, 10),
+    "humidity": ("H", 0x0080, 1),
+    "illuminance": ("H", 0x0100, 1),
+}
+
+# Keys of the dispatcher payload dicts -> column
+PAYLOAD_KEYS = {
+    "is_on": "binary",
+    "brightness": "level",
+    "hvac_mode": "hvac_mode",
+    "targettemp": "targettemp",
+    "presetday": "presetday",
+    "presetnight": "presetnight",
+    "temperature": "temperature",
+    "humidity": "humidity",
+    "illuminance": "illuminance",
+}
+
+_LIMITS = {"B": (0, 0xFF), "h": (-0x8000, 0x7FFF), "H": (0, 0xFFFF)}
+
+
+class Net4HomeStateStore:
+    """Struct-of-arrays store: one typed array per state column, indexed by objadr.
+
+    Updates are O(1) array writes; the set of used addresses keeps bulk
+    snapshots and queries proportional to the number of known objects.
+    """
+
+    def __init__(self):
+        """Allocate the columns."""
+        self._columns = {
+            name: array(typecode, bytes(OBJADR_COUNT * array(typecode).itemsize))
+            for name, (typecode, _, _) in COLUMNS.items()
+        }
+        self._known = array("H", bytes(OBJADR_COUNT * 2))
+        # Wall clock seconds of the last update
+        self._updated = array("I", bytes(OBJADR_COUNT * 4))
+        self._used: set[int] = set()
+
+    def set(self, objadr: int, column: str, value) -> None:
+        """Store one value of an object."""
+        typecode, bit, scale = COLUMNS[column]
+        if column == "hvac_mode":
+            value = HVAC_MODES.index(value) if value in HVAC_MODES else 0
+        low, high = _LIMITS[typecode]
+        self._columns[column][objadr] = min(high, max(low, int(round(value * scale))))
+        self._known[objadr] |= bit
+        self._updated[objadr] = int(time.time())
+        self._used.add(objadr)
+
+    def update_from_payload(self, objadr: int, payload) -> None:
+        """Store a dispatcher payload (bool/int for binary objects, dict otherwise)."""
+        if isinstance(payload, dict):
+            for key, value in payload.items():
+                column = PAYLOAD_KEYS.get(key)
+                if column is not None and value is not None:
+                    self.set(objadr, column, value)
+        elif isinstance(payload, (bool, int)):
+            self.set(objadr, "binary", 1 if payload else 0)
+
+    def get_value(self, objadr: int, column: str):
+        """Return one value of an object (None if unknown)."""
+        typecode, bit, scale = COLUMNS[column]
+        if not self._known[objadr] & bit:
+            return None
+        value = self._columns[column][objadr]
+        if column == "hvac_mode":
+            return HVAC_MODES[value] if value < len(HVAC_MODES) else None
+        if column == "binary":
+            return bool(value)
+        return value / scale if scale != 1 else value
+
+    def get(self, objadr: int) -> Optional[dict]:
+        """Return all known values of an object."""
+        known = self._known[objadr]
+        if not known:
+            return None
+        state = {
+            column: self.get_value(objadr, column)
+            for column, (_, bit, _) in COLUMNS.items()
+            if known & bit
+        }
+        state["updated"] = self._updated[objadr]
+        return state
+
+    def snapshot(self, addresses: Optional[Iterable[int]] = None) -> dict[int, dict]:
+        """Return the state of all (or the given) known objects."""
+        if addresses is None:
+            addresses = sorted(self._used)
+        result = {}
+        for objadr in addresses:
+            state = self.get(objadr)
+            if state is not None:
+                result[objadr] = state
+        return result
+
+    def query(self, column: str, value) -> list[int]:
+        """Return the addresses whose column equals value (e.g. all lights on)."""
+        return sorted(
+            objadr for objadr in self._used
+            if self.get_value(objadr, column) == value
+        )
+
+    def last_update(self, objadr: int) -> Optional[int]:
+        """Return the time (epoch seconds) of the last update of an object."""
+        return self._updated[objadr] if self._known[objadr] else None
+
+    def stale(self, max_age: float, addresses: Optional[Iterable[int]] = None) -> list[int]:
+        """Return the addresses not updated within max_age seconds."""
+        limit = time.time() - max_age
+        if addresses is None:
+            addresses = self._used
+        return sorted(
+            objadr for objadr in addresses
+            if not self._known[objadr] or self._updated[objadr] < limit
+        )
+
+    def forget(self, objadr: int) -> None:
+        """Mark an object as unknown."""
+        self._known[objadr] = 0
+        self._updated[objadr] = 0
+        self._used.discard(objadr)
+
+    def clear(self) -> None:
+        """Mark all objects as unknown."""
+        for objadr in self._used:
+            self._known[objadr] = 0
+            self._updated[objadr] = 0
+        self._used.clear()
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def stats(self) -> dict:
+        """Return size information for diagnostics."""
+        column_counts = {
+            column: sum(1 for objadr in self._used if self._known[objadr] & bit)
+            for column, (_, bit, _) in COLUMNS.items()
+        }
+        memory = sum(col.itemsize * len(col) for col in self._columns.values())
+        memory += self._known.itemsize * len(self._known) + self._updated.itemsize * len(self._updated)
+        return {
+            "objects": len(self._used),
+            "columns": column_counts,
+            "memory_bytes": memory,
+        }
@@ -22,7 +22,7 @@ async def async_setup_entry(
     api: Net4HomeApi = hass.data[DOMAIN][entry.entry_id]
     
     _LOGGER.info(f"[Switch] Setup called with {len(api.devices)} devices in API")
-    switch_devices = [d for d in api.devices.values() if d.device_type == "switch"]
+    switch_devices = api.devices_of_type("switch")
     _LOGGER.info(f"[Switch] Found {len(switch_devices)} switch devices: {[d.device_id for d in switch_devices]}")
 
     entities = [
@@ -118,6 +118,7 @@ class Net4HomeSwitch(SwitchEntity):
             "model": self.device.model,
             "via_device": self.device.via_device or "",
             "send_state_changes": self.send_state_changes,  
+            "unconfirmed": self.api.confirmations.is_unconfirmed(self.device.device_id),
         }
         
     async def async_added_to_hass(self):
@@ -131,6 +132,11 @@ class Net4HomeSwitch(SwitchEntity):
             )
         )
 
+        # Restore last known state from snapshot (re-read from the bus later)
+        last_state = self.api.get_last_state(self.device.device_id)
+        if last_state is not None:
+            self._handle_update(last_state)
+
     @callback
     def _handle_update(self, is_on: bool):
         """Handle update from dispatcher."""
@@ -0,0 +1,163 @@
+"""Transports between Net4HomeApi and a bus connector (TCP, in-memory, file).
+
+A transport opens a link and returns a (reader, writer) pair with the
+asyncio stream interface the api uses: reader.read(n), writer.write(),
+drain(), close(), is_closing(), wait_closed() and writer.transport.abort().
+Only asyncio is needed, so the in-memory and file transports can drive the
+real listener in-process (benchmarks, simulator, replay) without a connector.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Chunk size of the file transport, the listener reads up to 4096 bytes as well
+REPLAY_CHUNK_SIZE = 4096
+
+
+class Net4HomeTransport(ABC):
+    """Open links to a bus connector."""
+
+    @abstractmethod
+    async def async_open(self, host: str, port: int):
+        """Open a link and return (reader, writer)."""
+
+
+class Net4HomeTcpTransport(Net4HomeTransport):
+    """TCP connection to a real bus connector (default)."""
+
+    async def async_open(self, host: str, port: int):
+        return await asyncio.open_connection(host, port)
+
+
+class _MemoryWriter:
+    """Stream writer replacement that hands written bytes to a callback."""
+
+    def __init__(self, on_write, on_close):
+        self._on_write = on_write
+        self._on_close = on_close
+        self._closing = False
+        # abort() is reached via writer.transport like with asyncio streams
+        self.transport = self
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> None:
+        if self._closing:
+            raise ConnectionResetError("In-memory link is closed")
+        self.bytes_written += len(data)
+        self._on_write(bytes(data))
+
+    async def drain(self) -> None:
+        if self._closing:
+            raise ConnectionResetError("In-memory link is closed")
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        if not self._closing:
+            self._closing = True
+            self._on_close()
+
+    def abort(self) -> None:
+        self.close()
+
+    async def wait_closed(self) -> None:
+        return None
+
+    def get_extra_info(self, name, default=None):
+        return default
+
+
+class Net4HomeLoopbackPeer:
+    """Connector side of an in-memory link.
+
+    feed() delivers bytes to the api's reader, async_read() returns the
+    chunks the api wrote (only if keep_writes is set).
+    """
+
+    def __init__(self, keep_writes: bool = True):
+        """Initialize both ends of the link."""
+        self.reader = asyncio.StreamReader()
+        self.writer = _MemoryWriter(self._on_write, self._on_close)
+        self.keep_writes = keep_writes
+        self._written: asyncio.Queue = asyncio.Queue()
+        self.closed = asyncio.Event()
+
+    def _on_write(self, data: bytes) -> None:
+        if self.keep_writes:
+            self._written.put_nowait(data)
+
+    def _on_close(self) -> None:
+        if not self.reader.at_eof():
+            self.reader.feed_eof()
+        self.closed.set()
+
+    def feed(self, data: bytes) -> None:
+        """Deliver bytes to the api."""
+        self.reader.feed_data(data)
+
+    def close(self) -> None:
+        """Close the link from the connector side (the api reads EOF)."""
+        self.writer.close()
+
+    async def async_read(self) -> bytes:
+        """Return the next chunk written by the api."""
+        return await self._written.get()
+
+
+class Net4HomeLoopbackTransport(Net4HomeTransport):
+    """In-memory link; every async_open() creates a new peer."""
+
+    def __init__(self, keep_writes: bool = True):
+        """Initialize the transport."""
+        self.keep_writes = keep_writes
+        self.peer: Optional[Net4HomeLoopbackPeer] = None
+        self._opened = asyncio.Event()
+
+    async def async_open(self, host: str, port: int):
+        self.peer = Net4HomeLoopbackPeer(self.keep_writes)
+        self._opened.set()
+        return self.peer.reader, self.peer.writer
+
+    async def async_wait_peer(self) -> Net4HomeLoopbackPeer:
+        """Wait until the api has opened the link and return its peer."""
+        await self._opened.wait()
+        return self.peer
+
+
+class Net4HomeFileTransport(Net4HomeTransport):
+    """Feed a file with the raw received byte stream to the api, writes are discarded.
+
+    The file is delivered in REPLAY_CHUNK_SIZE chunks as fast as the api
+    reads it, `done` is set at the end. The link stays open afterwards, a
+    closed link would make the api reconnect and replay the file again.
+    """
+
+    def __init__(self, path, keep_open: bool = True):
+        """Initialize the transport."""
+        self.path = Path(path)
+        self.keep_open = keep_open
+        self.peer: Optional[Net4HomeLoopbackPeer] = None
+        self.done = asyncio.Event()
+
+    async def async_open(self, host: str, port: int):
+        self.peer = Net4HomeLoopbackPeer(keep_writes=False)
+        asyncio.create_task(self._async_feed(self.peer))
+        return self.peer.reader, self.peer.writer
+
+    async def _async_feed(self, peer: Net4HomeLoopbackPeer) -> None:
+        data = await asyncio.get_running_loop().run_in_executor(None, self.path.read_bytes)
+        _LOGGER.debug(f"Replaying {len(data)} bytes from {self.path}")
+        for pos in range(0, len(data), REPLAY_CHUNK_SIZE):
+            if peer.writer.is_closing():
+                break
+            peer.feed(data[pos:pos + REPLAY_CHUNK_SIZE])
+            # Let the listener process the chunk (StreamReader buffers without limit)
+            await asyncio.sleep(0)
+        self.done.set()
+        if not self.keep_open:
+            peer.close()